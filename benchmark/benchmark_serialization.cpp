@@ -0,0 +1,304 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+
+// Measure the time needed to serialize and deserialize a message. The same source is build with the code generated with
+// and without the table_driven option, see run_benchmark.sh. Both the virtual functions of the buffer interfaces and the
+// template functions called with the buffer classes are measured. The serialization of messages nested four to six 
+// levels deep is measured as well, together with the time needed to request the serialized size of an unchanged message
+// and to copy and move a message with large repeated fields.
+
+#include <WriteBufferFixedSize.h>
+#include <ReadBufferFixedSize.h>
+
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <utility>
+
+// EAMS message definitions
+#include <benchmark.h>
+
+namespace
+{
+  constexpr uint32_t DEFAULT_ITERATIONS = 1000000;
+
+  constexpr uint32_t BUFFER_SIZE = Benchmark::Telemetry::MAX_SERIALIZED_SIZE;
+
+  constexpr uint32_t NESTED_BUFFER_SIZE = Benchmark::Level1::MAX_SERIALIZED_SIZE;
+
+  void fill(Benchmark::Telemetry& msg)
+  {
+    msg.set_sequence(123456U);
+    msg.set_timestamp(1700000000000U);
+    msg.set_temperature(-40);
+    msg.set_armed(true);
+    msg.set_mode(Benchmark::Mode::AUTO);
+    msg.mutable_position().set_x(1.0F);
+    msg.mutable_position().set_y(2.0F);
+    msg.mutable_position().set_z(3.0F);
+    msg.mutable_velocity().set_x(-0.5F);
+    msg.mutable_velocity().set_z(9.81F);
+    msg.set_latitude(52.64);
+    msg.set_longitude(5.06);
+    msg.set_status(0xA5A5A5A5U);
+    msg.mutable_name() = "sensor-01";
+    for(int32_t i = 0; i < 16; ++i)
+    {
+      msg.add_samples(i * 1000);
+    }
+    msg.set_error(0U);
+  }
+
+  // Set the fields of a single level in the nested messages.
+  template<class LEVEL_TYPE>
+  void fill_level(LEVEL_TYPE& msg, const uint32_t level)
+  {
+    msg.set_id(level);
+    msg.mutable_position().set_x(1.0F * level);
+    msg.mutable_position().set_y(2.0F * level);
+    msg.mutable_position().set_z(3.0F * level);
+  }
+
+  void fill(Benchmark::Level1& msg)
+  {
+    fill_level(msg, 1U);
+    fill_level(msg.mutable_child(), 2U);
+    fill_level(msg.mutable_child().mutable_child(), 3U);
+    fill_level(msg.mutable_child().mutable_child().mutable_child(), 4U);
+    fill_level(msg.mutable_child().mutable_child().mutable_child().mutable_child(), 5U);
+    auto& level6 = msg.mutable_child().mutable_child().mutable_child().mutable_child().mutable_child();
+    level6.set_id(6U);
+    for(int32_t i = 0; i < 8; ++i)
+    {
+      level6.add_samples(i * 1000);
+    }
+  }
+
+  void fill(Benchmark::Samples& msg)
+  {
+    for(uint32_t i = 0; i < 64; ++i)
+    {
+      Benchmark::Vector point;
+      point.set_x(1.0F * i);
+      point.set_y(2.0F * i);
+      point.set_z(3.0F * i);
+      msg.add_points(point);
+    }
+    for(int32_t i = 0; i < 256; ++i)
+    {
+      msg.add_values(i * 1000);
+    }
+  }
+
+  // Return the number of nanoseconds per iteration since start.
+  double elapsed_ns(const std::chrono::steady_clock::time_point& start, const uint32_t iterations)
+  {
+    const std::chrono::duration<double, std::nano> elapsed = std::chrono::steady_clock::now() - start;
+    return elapsed.count() / iterations;
+  }
+
+  // Serialize the message in a loop. BUFFER_TYPE is either the buffer interface or the buffer class itself.
+  template<class MSG_TYPE, class BUFFER_TYPE>
+  bool serialize(const MSG_TYPE& msg, BUFFER_TYPE& buffer, const uint32_t iterations, double& time_ns)
+  {
+    bool result = true;
+    const auto start = std::chrono::steady_clock::now();
+    for(uint32_t i = 0; (i < iterations) && result; ++i)
+    {
+      buffer.clear();
+      result = ::EmbeddedProto::Error::NO_ERRORS == msg.serialize(buffer);
+    }
+    time_ns = elapsed_ns(start, iterations);
+    return result;
+  }
+
+  // Deserialize the data in the write buffer in a loop, using the buffer interface or the buffer class itself.
+  template<class BUFFER_TYPE>
+  bool deserialize(Benchmark::Telemetry& msg, ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE>& data,
+                   ::EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE>& read_buffer, const uint32_t iterations, 
+                   double& time_ns)
+  {
+    BUFFER_TYPE& buffer = read_buffer;
+    bool result = true;
+    const auto start = std::chrono::steady_clock::now();
+    for(uint32_t i = 0; (i < iterations) && result; ++i)
+    {
+      read_buffer.clear();
+      memcpy(read_buffer.get_data(), data.get_data(), data.get_size());
+      read_buffer.set_bytes_written(data.get_size());
+      msg.clear();
+      result = ::EmbeddedProto::Error::NO_ERRORS == msg.deserialize(buffer);
+    }
+    time_ns = elapsed_ns(start, iterations);
+    return result;
+  }
+
+  // Request the serialized size of an unchanged message in a loop, as is done to size a transport frame.
+  bool size(const ::EmbeddedProto::MessageInterface& msg, const uint32_t expected, const uint32_t iterations, 
+            double& time_ns)
+  {
+    uint32_t total = 0;
+    const auto start = std::chrono::steady_clock::now();
+    for(uint32_t i = 0; i < iterations; ++i)
+    {
+      total += msg.serialized_size();
+    }
+    time_ns = elapsed_ns(start, iterations);
+    return (expected * iterations) == total;
+  }
+
+  // Assign the source to another message in a loop, by copying or by moving it. The id of the source is changed each 
+  // iteration.
+  bool assign(Benchmark::Samples& source, const bool move, const uint32_t iterations, double& time_ns)
+  {
+    Benchmark::Samples destination;
+    bool result = true;
+    const auto start = std::chrono::steady_clock::now();
+    for(uint32_t i = 0; (i < iterations) && result; ++i)
+    {
+      source.set_id(i);
+      if(move)
+      {
+        destination = std::move(source);
+      }
+      else
+      {
+        destination = source;
+      }
+      result = (i == destination.get_id()) && (256U == destination.get_values().get_length());
+    }
+    time_ns = elapsed_ns(start, iterations);
+    return result;
+  }
+
+  // Serialize a nested message both through the buffer interface and with the buffer class and print the results.
+  template<class MSG_TYPE>
+  bool serialize_nested(const MSG_TYPE& msg, const uint32_t depth, const uint32_t iterations)
+  {
+    ::EmbeddedProto::WriteBufferFixedSize<NESTED_BUFFER_SIZE> buffer;
+    ::EmbeddedProto::WriteBufferInterface& interface = buffer;
+    double serialize_ns = 0.0;
+    double serialize_direct_ns = 0.0;
+    const bool result = serialize(msg, interface, iterations, serialize_ns) 
+                        && serialize(msg, buffer, iterations, serialize_direct_ns);
+    if(result)
+    {
+      printf("nested %u deep: %.1f ns (buffer interface), %.1f ns (buffer class), %u bytes\n", depth, serialize_ns, 
+             serialize_direct_ns, buffer.get_size());
+    }
+    return result;
+  }
+}
+
+int main(int argc, char* argv[])
+{
+  const uint32_t iterations = (1 < argc) ? static_cast<uint32_t>(strtoul(argv[1], nullptr, 10)) 
+                                         : DEFAULT_ITERATIONS;
+
+  Benchmark::Telemetry msg;
+  fill(msg);
+
+  // Through the virtual functions of the buffer interfaces.
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> write_buffer;
+  ::EmbeddedProto::WriteBufferInterface& write_interface = write_buffer;
+  double serialize_ns = 0.0;
+  if(!serialize(msg, write_interface, iterations, serialize_ns))
+  {
+    printf("Serialization failed.\n");
+    return 1;
+  }
+
+  Benchmark::Telemetry result;
+  ::EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> read_buffer;
+  double deserialize_ns = 0.0;
+  if(!deserialize<::EmbeddedProto::ReadBufferInterface>(result, write_buffer, read_buffer, iterations, deserialize_ns))
+  {
+    printf("Deserialization failed.\n");
+    return 1;
+  }
+
+  // Directly using the buffer classes.
+  double serialize_direct_ns = 0.0;
+  double deserialize_direct_ns = 0.0;
+  if(!serialize(msg, write_buffer, iterations, serialize_direct_ns) 
+     || !deserialize<::EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE>>(result, write_buffer, read_buffer, iterations, 
+                                                                        deserialize_direct_ns))
+  {
+    printf("Serialization using the buffer classes failed.\n");
+    return 1;
+  }
+
+  if(result.get_sequence() != msg.get_sequence())
+  {
+    printf("The deserialized message differs.\n");
+    return 1;
+  }
+
+  printf("message size:  %u bytes\n", write_buffer.get_size());
+  printf("serialize:     %.1f ns (buffer interface), %.1f ns (buffer class)\n", serialize_ns, serialize_direct_ns);
+  printf("deserialize:   %.1f ns (buffer interface), %.1f ns (buffer class)\n", deserialize_ns, deserialize_direct_ns);
+
+  // Serialize the nested messages starting at different levels.
+  Benchmark::Level1 nested;
+  fill(nested);
+  if(!serialize_nested(nested.get_child().get_child(), 4U, iterations)
+     || !serialize_nested(nested.get_child(), 5U, iterations)
+     || !serialize_nested(nested, 6U, iterations))
+  {
+    printf("Serialization of the nested messages failed.\n");
+    return 1;
+  }
+
+  ::EmbeddedProto::WriteBufferFixedSize<NESTED_BUFFER_SIZE> nested_buffer;
+  double size_ns = 0.0;
+  double size_nested_ns = 0.0;
+  if((::EmbeddedProto::Error::NO_ERRORS != nested.serialize(nested_buffer))
+     || !size(msg, write_buffer.get_size(), iterations, size_ns) 
+     || !size(nested, nested_buffer.get_size(), iterations, size_nested_ns))
+  {
+    printf("The serialized size differs.\n");
+    return 1;
+  }
+  printf("serialized size: %.1f ns (Telemetry), %.1f ns (nested 6 deep)\n", size_ns, size_nested_ns);
+
+  Benchmark::Samples samples;
+  fill(samples);
+  double copy_ns = 0.0;
+  double move_ns = 0.0;
+  if(!assign(samples, false, iterations, copy_ns) || !assign(samples, true, iterations, move_ns))
+  {
+    printf("Assigning the samples failed.\n");
+    return 1;
+  }
+  printf("assign samples: %.1f ns (copy), %.1f ns (move)\n", copy_ns, move_ns);
+  return 0;
+}
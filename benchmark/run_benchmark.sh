@@ -0,0 +1,71 @@
+#!/usr/bin/env bash
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or 
+# modify it under the terms of the GNU General Public License as published 
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+# Compare the code generated with and without the table_driven and cache_serialized_size options. Run this script from
+# the root of the repository, after the setup of Embedded Proto:
+#   ./benchmark/run_benchmark.sh [ITERATIONS]
+#
+# For each mode the size of the code generated for the messages and of the Embedded Proto sources is reported,
+# together with the time needed to serialize and deserialize the message in benchmark.proto, both through the virtual
+# functions of the buffer interfaces and directly with the buffer classes. The serialization of messages nested four to
+# six levels deep is measured as well, together with the time needed to request the serialized size of an unchanged
+# message and to copy and move a message with large repeated fields. Set CXX and CXXFLAGS to compare the code size with
+# another compiler, for example a cross compiler for the target. In that case set SKIP_RUN=1 as the benchmark can not
+# be run on this machine.
+
+# Fail on first non-zero return code
+set -euo pipefail
+
+CXX=${CXX:-g++}
+CXXFLAGS=${CXXFLAGS:--std=c++17 -O2}
+ITERATIONS=${1:-1000000}
+OUT=./build/benchmark
+
+for MODE in unrolled table_driven cache_serialized_size; do
+  mkdir -p $OUT/$MODE
+  # The source file holds the serialize and deserialize functions of the messages.
+  OPTIONS=split_source
+  if [ "unrolled" != "$MODE" ]; then
+    OPTIONS=split_source,$MODE
+  fi
+  protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./benchmark -I./generator --eams_opt=$OPTIONS --eams_out=$OUT/$MODE ./benchmark/benchmark.proto
+
+  $CXX $CXXFLAGS -I./src -I$OUT/$MODE -c $OUT/$MODE/benchmark.cpp -o $OUT/$MODE/messages.o
+  $CXX $CXXFLAGS -I./src -c ./src/MessageInterface.cpp -o $OUT/$MODE/MessageInterface.o
+  $CXX $CXXFLAGS -I./src -I$OUT/$MODE ./benchmark/benchmark_serialization.cpp $OUT/$MODE/benchmark.cpp ./src/*.cpp \
+    -o $OUT/$MODE/benchmark_serialization
+
+  echo "== $MODE"
+  size $OUT/$MODE/messages.o $OUT/$MODE/MessageInterface.o
+  if [ -z "${SKIP_RUN:-}" ]; then
+    $OUT/$MODE/benchmark_serialization $ITERATIONS
+  fi
+done
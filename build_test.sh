@@ -35,16 +35,22 @@ set -exuo pipefail
 # Generate sources using the EAMS plugin.
 mkdir -p ./build/EAMS
 protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/simple_types.proto
-protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/nested_message.proto
+# Some files are generated with split_source to test the member functions defined in the generated source files.
+protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_opt=split_source --eams_out=./build/EAMS ./test/proto/nested_message.proto
 protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/repeated_fields.proto
-protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/oneof_fields.proto
+protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_opt=split_source --eams_out=./build/EAMS ./test/proto/oneof_fields.proto
 protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/include_other_files.proto
 # Delibertly do not manually generate file_to_include.proto and subfolder/file_to_include_from_subfolder.proto 
 # to test the automatic generation of files from including them in include_other_files.proto.
 protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto -I./generator --eams_out=./build/EAMS ./test/proto/string_bytes.proto
 protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/empty_message.proto
-protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_out=./build/EAMS ./test/proto/optional_fields.proto
+protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto --eams_opt=split_source --eams_out=./build/EAMS ./test/proto/optional_fields.proto
 protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto -I./generator --eams_out=./build/EAMS ./test/proto/field_options.proto
+protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto -I./generator --eams_out=./build/EAMS ./test/proto/max_serialized_size.proto
+# Serialized by the shared loop using a table of the fields instead of code generated for each field.
+protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto -I./generator --eams_opt=table_driven --eams_out=./build/EAMS ./test/proto/table_driven.proto
+# Messages storing their serialized size until they are changed.
+protoc --plugin=protoc-gen-eams=protoc-gen-eams -I./test/proto -I./generator --eams_opt=split_source,cache_serialized_size --eams_out=./build/EAMS ./test/proto/cache_serialized_size.proto
 
 # For validation and testing generate the same message using python
 mkdir -p ./build/python
@@ -60,6 +66,9 @@ protoc -I./test/proto --python_out=./build/python ./test/proto/empty_file_to_inc
 protoc -I./test/proto -I./generator --python_out=./build/python ./test/proto/string_bytes.proto
 protoc -I./test/proto --python_out=./build/python ./test/proto/optional_fields.proto
 protoc -I./test/proto -I./generator --python_out=./build/python ./test/proto/field_options.proto
+protoc -I./test/proto -I./generator --python_out=./build/python ./test/proto/max_serialized_size.proto
+protoc -I./test/proto -I./generator --python_out=./build/python ./test/proto/table_driven.proto
+protoc -I./test/proto -I./generator --python_out=./build/python ./test/proto/cache_serialized_size.proto
 
 # Build the tests
 cmake -DCMAKE_BUILD_TYPE=Debug -B./build/test
@@ -0,0 +1,299 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+# This module holds the generator daemon and the protoc plugin forwarding requests to it. Starting python and importing
+# the generator takes several hundreds of milliseconds for each protoc call. The daemon does this only once. It listens
+# on a unix socket and generates code for the requests of all protoc calls, also when they run in parallel.
+#
+# The forwarder is the entry point of protoc-gen-eams. It only imports modules from the python standard library. When
+# no daemon is running, or when the daemon runs an other version of the generator, the code is generated in the
+# protoc-gen-eams process itself.
+#
+# The messages on the socket all start with their length as a four byte big endian unsigned integer. The forwarder
+# sends a json header with the working directory of protoc followed by the serialized CodeGeneratorRequest. The daemon
+# answers with a single status byte followed by the serialized CodeGeneratorResponse.
+
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+
+
+# The environment variable which can be used to set the path of the socket.
+SOCKET_ENVIRONMENT_VARIABLE = "EMBEDDED_PROTO_SOCKET"
+
+# The status send by the daemon before the response.
+STATUS_OK = b"\x00"
+# The daemon does not serve the request, it should be generated by the forwarder itself.
+STATUS_DECLINED = b"\x01"
+
+LENGTH_FORMAT = ">I"
+LENGTH_SIZE = struct.calcsize(LENGTH_FORMAT)
+
+
+# -----------------------------------------------------------------------------
+
+def get_default_socket_path():
+    if SOCKET_ENVIRONMENT_VARIABLE in os.environ:
+        return os.environ[SOCKET_ENVIRONMENT_VARIABLE]
+    # One daemon per user, in a folder which only the user can access.
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "embedded_proto.sock")
+    user_id = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), "embedded_proto_" + str(user_id), "daemon.sock")
+
+
+def is_private_directory(path):
+    # Only the user or root may change the folder holding the socket. Folders like the temporary folder, which are
+    # writable by everyone but have the sticky bit set, are accepted as others can not replace the files in them.
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    writable_by_others = 0 != (info.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+    sticky = 0 != (info.st_mode & stat.S_ISVTX)
+    return (info.st_uid in (os.getuid(), 0)) and ((not writable_by_others) or sticky)
+
+
+def is_own_socket(path):
+    # Another user could create the socket before the daemon is started and answer with code of their own. Only a
+    # socket created by the same user, in a folder other users can not change, is trusted.
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return (stat.S_ISSOCK(info.st_mode) and (os.getuid() == info.st_uid) and
+            is_private_directory(os.path.dirname(os.path.abspath(path))))
+
+
+# -----------------------------------------------------------------------------
+
+def encode_message(data):
+    return struct.pack(LENGTH_FORMAT, len(data)) + data
+
+
+def receive_exactly(connection, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("The connection was closed before the full message was received.")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def receive_message(connection):
+    (size,) = struct.unpack(LENGTH_FORMAT, receive_exactly(connection, LENGTH_SIZE))
+    return receive_exactly(connection, size)
+
+
+# -----------------------------------------------------------------------------
+
+def forward_request(data, socket_path=None):
+    # Send the serialized CodeGeneratorRequest to the daemon and return the serialized response. None is returned when
+    # there is no daemon or when it declined the request.
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    socket_path = socket_path or get_default_socket_path()
+    if not is_own_socket(socket_path):
+        return None
+
+    header = json.dumps({"cwd": os.getcwd()}).encode("utf-8")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(socket_path)
+            connection.sendall(encode_message(header) + encode_message(data))
+            status = receive_exactly(connection, 1)
+            if STATUS_OK != status:
+                return None
+            return receive_message(connection)
+    except OSError:
+        # No daemon is running or it stopped while handling the request.
+        return None
+
+
+# -----------------------------------------------------------------------------
+
+def main_forwarder():
+    # The entry point of protoc-gen-eams. The debug and timing options write files in the working directory of protoc,
+    # these are always handled in process.
+    data = sys.stdin.buffer.read()
+
+    output = None
+    if ('--debug' not in sys.argv) and ('--timings' not in sys.argv):
+        output = forward_request(data)
+
+    if output is None:
+        from EmbeddedProto.main import run_plugin
+        output = run_plugin(data)
+
+    sys.stdout.buffer.write(output)
+
+
+# -----------------------------------------------------------------------------
+
+def init_daemon_worker():
+    # Import the generator and load the templates before the first request arrives.
+    import EmbeddedProto.main
+    from EmbeddedProto.TemplateEnvironment import get_shared_environment
+    get_shared_environment()
+
+
+def generate_in_worker(cwd, data):
+    # Generate the code for a request in a worker process. Relative paths in the options, like the cache folder, are
+    # relative to the working directory of protoc.
+    from EmbeddedProto.main import run_plugin
+    os.chdir(cwd)
+    return run_plugin(data)
+
+
+# -----------------------------------------------------------------------------
+
+class Daemon:
+    def __init__(self, socket_path, workers):
+        from EmbeddedProto.GenerationCache import generator_checksum
+        self.socket_path = socket_path
+        self.workers = workers
+        self.executor = None
+
+        # The checksum of the generator when the daemon was started. When the generator is updated while the daemon is
+        # running, requests are declined so they are generated by the new version.
+        self.generator_checksum = generator_checksum()
+
+    def is_outdated(self):
+        from EmbeddedProto.GenerationCache import generator_checksum
+        return generator_checksum() != self.generator_checksum
+
+    async def handle_connection(self, reader, writer):
+        import asyncio
+        try:
+            header = json.loads(await self.read_message(reader))
+            data = await self.read_message(reader)
+
+            response = STATUS_DECLINED
+            if not self.is_outdated():
+                loop = asyncio.get_running_loop()
+                try:
+                    output = await loop.run_in_executor(self.executor, generate_in_worker, header["cwd"], data)
+                    response = STATUS_OK + encode_message(output)
+                except Exception:
+                    # Generation errors are reported in the response. Anything else, like a request which can not be
+                    # parsed, is left to the forwarder which reports it as it would without the daemon.
+                    pass
+            writer.write(response)
+            await writer.drain()
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            # The forwarder went away or send an invalid message, it will fall back on generating the code itself.
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def read_message(reader):
+        (size,) = struct.unpack(LENGTH_FORMAT, await reader.readexactly(LENGTH_SIZE))
+        return await reader.readexactly(size)
+
+    def remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(self.socket_path)
+            except OSError:
+                # Left behind by a daemon which did not stop properly.
+                os.remove(self.socket_path)
+                return
+        raise Exception("An other daemon is already listening on " + self.socket_path)
+
+    async def serve(self):
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        socket_directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(socket_directory, mode=0o700, exist_ok=True)
+        if not is_private_directory(socket_directory):
+            raise Exception("Other users can change the folder of the socket " + socket_directory)
+
+        self.remove_stale_socket()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_daemon_worker)
+        try:
+            # Only the user running the daemon is allowed to send requests. The socket is created with these
+            # permissions, there is no moment at which others can connect.
+            previous_umask = os.umask(0o077)
+            try:
+                server = await asyncio.start_unix_server(self.handle_connection, path=self.socket_path)
+            finally:
+                os.umask(previous_umask)
+            print("Embedded Proto daemon listening on " + self.socket_path + " with " + str(self.workers) +
+                  " workers.", flush=True)
+            # Stop the server on a SIGTERM in the same way as on a KeyboardInterrupt.
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+# -----------------------------------------------------------------------------
+
+def main_daemon(argv=None):
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Run the Embedded Proto generator as a daemon serving protoc-gen-eams.")
+    parser.add_argument("--socket", default=get_default_socket_path(),
+                        help="The path of the unix socket, by default the " + SOCKET_ENVIRONMENT_VARIABLE +
+                             " environment variable is used or a file in XDG_RUNTIME_DIR or in a folder of the"
+                             " user in the temporary folder.")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="The number of requests handled at the same time, by default one per cpu.")
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Embedded Proto ERROR - The daemon requires unix socket support.", file=sys.stderr)
+        return 1
+
+    try:
+        asyncio.run(Daemon(args.socket, max(1, args.workers)).serve())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print("Embedded Proto ERROR - " + str(e), file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,78 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+import hashlib
+import json
+
+
+# -----------------------------------------------------------------------------
+
+# The import relations between the proto files in a request. A generated header depends on its own file descriptor and
+# the descriptors of all the files it imports, directly or indirectly. The input digest is a hash over all of them and
+# changes when any of them changes.
+class DependencyGraph:
+    def __init__(self, proto_files):
+        self.descriptors = {proto_file.name: proto_file for proto_file in proto_files}
+
+        # Hashes of the serialized file descriptors, stored by file name.
+        self.descriptor_digests = {}
+
+        # The names of all files imported directly or indirectly, stored by file name.
+        self.transitive_dependencies = {}
+
+    def get_descriptor_digest(self, name):
+        if name not in self.descriptor_digests:
+            serialized = self.descriptors[name].SerializeToString(deterministic=True)
+            self.descriptor_digests[name] = hashlib.sha256(serialized).hexdigest()
+        return self.descriptor_digests[name]
+
+    # Return the sorted names of all files imported by the given file directly or indirectly.
+    def get_dependencies(self, name):
+        if name not in self.transitive_dependencies:
+            dependencies = set()
+            to_visit = list(self.descriptors[name].dependency)
+            while to_visit:
+                dependency = to_visit.pop()
+                if (dependency not in dependencies) and (dependency in self.descriptors):
+                    dependencies.add(dependency)
+                    to_visit.extend(self.descriptors[dependency].dependency)
+            self.transitive_dependencies[name] = sorted(dependencies)
+        return self.transitive_dependencies[name]
+
+    # A hash over everything which determines the content of the header of the given file: the descriptors of the file
+    # and its dependencies, the plugin parameters influencing the generated code and the checksum of the generator.
+    def get_input_digest(self, name, parameters, generator_checksum):
+        sha = hashlib.sha256(generator_checksum.encode("utf-8"))
+        sha.update(json.dumps(parameters, sort_keys=True).encode("utf-8"))
+        sha.update(self.get_descriptor_digest(name).encode("utf-8"))
+        for dependency in self.get_dependencies(name):
+            sha.update(dependency.encode("utf-8"))
+            sha.update(self.get_descriptor_digest(dependency).encode("utf-8"))
+        return sha.hexdigest()
@@ -30,12 +30,32 @@
 
 from google.protobuf.descriptor_pb2 import FieldDescriptorProto
 from . import embedded_proto_options_pb2
-import copy
+from .Freezable import Freezable, frozen_value
+
+
+# Return the bytes of the given value encoded as a varint.
+def encode_varint(value):
+    result = []
+    while value > 0x7F:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return result
+
+
+# The number of bytes required to serialize the given value as a varint.
+def varint_size(value):
+    return len(encode_varint(value))
 
 
 # This class is the base class for any kind of field used in protobuf messages.
-class Field:
+class Field(Freezable):
+    __slots__ = ("descriptor", "parent", "optional", "oneof", "name", "variable_name", "variable_id_name", "variable_id",
+                 "template_file", "of_type_enum")
+
     def __init__(self, proto_descriptor, parent_msg, template_filename, oneof=None):
+        super().__init__()
+
         # A reference to the FieldDescriptorProto object which defines this field.
         self.descriptor = proto_descriptor
 
@@ -67,8 +87,7 @@ class Field:
         # If this field has the same type as the parent we got a recursive inclusion. We can not solve the template
         # parameters in this case. This field is thus replaced by a dummy with a warning. Toposort is used to find more
         # complex recursive inclusions which we can not solve like this.
-        parent_msg_type = "." + parent_msg.scope.get_scope_str().replace("::", ".")
-        if proto_descriptor.type_name == parent_msg_type:
+        if proto_descriptor.type_name == parent_msg.get_proto_type():
             result = FieldErrorRecursive(proto_descriptor, parent_msg, oneof)
         # Now continue constructing the normal fields.
         elif (FieldDescriptorProto.LABEL_REPEATED == proto_descriptor.label) and not already_nested:
@@ -94,12 +113,17 @@ class Field:
     def get_short_type(self):
         return ""
 
+    # The name of the value in Field::FieldTypes for this field, used in the field table of table driven messages.
+    def get_field_type(self):
+        return ""
+
     def get_default_value(self):
         return ""
 
     def get_name(self):
         return self.name
 
+    @frozen_value
     def get_variable_name(self):
         var_name = ""
         if self.oneof:
@@ -116,12 +140,56 @@ class Field:
         # For the field that do not have any templates return an empty list.
         return []
 
-    def match_field_with_definitions(self, all_types_definitions):
+    def match_field_with_definitions(self, symbol_table):
         pass
 
     def register_template_parameters(self):
         return True
 
+    # Returns the message definition used by this field, None if this field is not of a message type.
+    def get_message_definition(self):
+        return None
+
+    # The wire types as defined by protobuf, used to make the tag.
+    wire_type_to_int = {"VARINT": 0, "FIXED64": 1, "LENGTH_DELIMITED": 2, "FIXED32": 5}
+
+    # The tag of this field encoded as a varint. The generated code serializes these bytes at once instead of encoding
+    # the tag each time.
+    @frozen_value
+    def get_tag_bytes(self):
+        return encode_varint((self.variable_id << 3) | self.wire_type_to_int[self.get_wire_type_str()])
+
+    # The C++ type holding the encoded tag of this field.
+    @frozen_value
+    def get_tag_type(self):
+        return "::EmbeddedProto::TagBytes<" + ", ".join("0x%02X" % byte for byte in self.get_tag_bytes()) + ">"
+
+    # The number of bytes required for the tag of this field.
+    def get_tag_size(self):
+        return varint_size(self.variable_id << 3)
+
+    # Returns the maximum number of bytes the value of this field takes when serialized, without the tag but including
+    # the length of length delimited fields. None is returned when this is unknown, for example when the length of the
+    # field is set by a template parameter.
+    def get_max_value_size(self):
+        return None
+
+    # Returns the maximum number of bytes this field takes when serialized, including the tag.
+    @frozen_value
+    def get_max_serialized_size(self):
+        value_size = self.get_max_value_size()
+        if value_size is None:
+            return None
+        return self.get_tag_size() + value_size
+
+    # Returns true when the value of this field always takes the same number of bytes when serialized.
+    def is_fixed_size(self):
+        return False
+
+    # Returns true when the C++ type of this field is trivially copyable, it can be copied as a block of memory.
+    def is_trivially_copyable(self):
+        return False
+
     # Returns true if in oneof.init the new& function needs to be call to initialize already allocated memory.
     def oneof_allocation_required(self):
         return type(self) is not FieldEnum
@@ -133,6 +201,7 @@ class Field:
         return self.oneof.get_which_oneof()
 
     # Get the scope relevant compared to the scope this field is used in.
+    @frozen_value
     def get_reduced_scope(self):
         parent_scope = self.parent.scope.get()
         def_scope = self.definition.scope.get()
@@ -145,9 +214,12 @@ class Field:
         reduced_scope = def_scope[start_index:]
         return reduced_scope
 
-    def render(self, filename, jinja_environment):
+    # Render the given template for this field. When cache_serialized_size is set, the functions changing the field also
+    # mark the serialized size stored by the message as unknown.
+    def render(self, filename, jinja_environment, cache_serialized_size=False):
         template = jinja_environment.get_template(filename)
-        rendered_str = template.render(field=self, environment=jinja_environment)
+        rendered_str = template.render(field=self, environment=jinja_environment,
+                                       cache_serialized_size=cache_serialized_size)
         return rendered_str
 
 # -----------------------------------------------------------------------------
@@ -155,6 +227,8 @@ class Field:
 
 # This class is used to define any type of basic field.
 class FieldBasic(Field):
+    __slots__ = ()
+
     # A dictionary to convert the wire type into a default value.
     type_to_default_value = {FieldDescriptorProto.TYPE_DOUBLE:   "0.0",
                              FieldDescriptorProto.TYPE_FLOAT:    "0.0",
@@ -215,26 +289,60 @@ class FieldBasic(Field):
                          FieldDescriptorProto.TYPE_FLOAT:    "FIXED32",
                          FieldDescriptorProto.TYPE_SFIXED32: "FIXED32"}
 
+    # The maximum number of bytes of the serialized value. The signed 32 bit varints are serialized as unsigned 32 bit
+    # integers and thus take at most five bytes.
+    type_to_max_value_size = {FieldDescriptorProto.TYPE_DOUBLE:   8,
+                              FieldDescriptorProto.TYPE_FLOAT:    4,
+                              FieldDescriptorProto.TYPE_INT64:    10,
+                              FieldDescriptorProto.TYPE_UINT64:   10,
+                              FieldDescriptorProto.TYPE_INT32:    5,
+                              FieldDescriptorProto.TYPE_FIXED64:  8,
+                              FieldDescriptorProto.TYPE_FIXED32:  4,
+                              FieldDescriptorProto.TYPE_BOOL:     1,
+                              FieldDescriptorProto.TYPE_UINT32:   5,
+                              FieldDescriptorProto.TYPE_SFIXED32: 4,
+                              FieldDescriptorProto.TYPE_SFIXED64: 8,
+                              FieldDescriptorProto.TYPE_SINT32:   5,
+                              FieldDescriptorProto.TYPE_SINT64:   10}
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, "FieldBasic.h", oneof)
 
     def get_wire_type_str(self):
         return self.type_to_wire_type[self.descriptor.type]
 
+    @frozen_value
     def get_type(self):
         return self.type_to_cpp_type[self.descriptor.type]
 
+    @frozen_value
     def get_short_type(self):
         return self.get_type().split("::")[-1]
 
+    # The Field::FieldTypes values have the same names as the C++ types of the basic fields.
+    def get_field_type(self):
+        return self.get_short_type()
+
     def get_cstdint_type(self):
         return self.type_to_cstdint[self.descriptor.type]
 
+    @frozen_value
     def get_default_value(self):
         return self.type_to_default_value[self.descriptor.type]
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldBasic_GetSet.h", jinja_environment=jinja_env)
+    def get_max_value_size(self):
+        return self.type_to_max_value_size[self.descriptor.type]
+
+    # Fixed width numbers and booleans always take the same number of bytes.
+    def is_fixed_size(self):
+        return ("VARINT" != self.get_wire_type_str()) or (FieldDescriptorProto.TYPE_BOOL == self.descriptor.type)
+
+    def is_trivially_copyable(self):
+        return True
+
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldBasic_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
     def render_serialize(self, jinja_env):
         return self.render("FieldBasic_Serialize.h", jinja_environment=jinja_env)
@@ -248,6 +356,8 @@ class FieldBasic(Field):
 
 # A base class for both the String and Bytes type field
 class BaseStringBytes(Field):
+    __slots__ = ("template_param_str", "MaxLength")
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, "FieldString.h", oneof)
 
@@ -278,6 +388,7 @@ class BaseStringBytes(Field):
     def get_wire_type_str(self):
         return "LENGTH_DELIMITED"
 
+    @frozen_value
     def get_template_parameters(self):
         result = []
         # When we do not have a maximum length specified add the length as a template param.
@@ -291,6 +402,11 @@ class BaseStringBytes(Field):
             self.parent.register_child_with_template(self)
         return True
 
+    def get_max_value_size(self):
+        if not self.MaxLength:
+            return None
+        return varint_size(self.MaxLength) + self.MaxLength
+
     def render_serialize(self, jinja_env):
         return self.render("FieldStringBytes_Serialize.h", jinja_environment=jinja_env)
 
@@ -303,9 +419,12 @@ class BaseStringBytes(Field):
 
 # This class defines a string field
 class FieldString(BaseStringBytes):
+    __slots__ = ()
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, oneof)
 
+    @frozen_value
     def get_type(self):
         str_type = "::EmbeddedProto::FieldString<"
         if self.MaxLength:
@@ -314,20 +433,28 @@ class FieldString(BaseStringBytes):
             str_type += self.template_param_str + ">"
         return str_type
 
+    @frozen_value
     def get_short_type(self):
         return "FieldString"
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldString_GetSet.h", jinja_environment=jinja_env)
+    def get_field_type(self):
+        return "string"
+
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldString_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
 # -----------------------------------------------------------------------------
 
 
 # This class defines a bytes array field
 class FieldBytes(BaseStringBytes):
+    __slots__ = ()
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, oneof)
 
+    @frozen_value
     def get_type(self):
         str_type = "::EmbeddedProto::FieldBytes<"
         if self.MaxLength:
@@ -336,17 +463,24 @@ class FieldBytes(BaseStringBytes):
             str_type += self.template_param_str + ">"
         return str_type
 
+    @frozen_value
     def get_short_type(self):
         return "FieldBytes"
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldBytes_GetSet.h", jinja_environment=jinja_env)
+    def get_field_type(self):
+        return "bytes"
+
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldBytes_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
 # -----------------------------------------------------------------------------
 
 
 # This class is used to wrap around any enum used as a field.
 class FieldEnum(Field):
+    __slots__ = ("definition",)
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, "FieldEnum.h", oneof)
 
@@ -356,6 +490,7 @@ class FieldEnum(Field):
     def get_wire_type_str(self):
         return "VARINT"
 
+    @frozen_value
     def get_type_as_defined(self):
         if not self.definition:
             # When the actual definition is unknown use the protobuf type.
@@ -379,30 +514,34 @@ class FieldEnum(Field):
 
         return type_name
 
+    @frozen_value
     def get_type(self):
         return "EmbeddedProto::enumeration<" + self.get_type_as_defined() + ">"
 
+    @frozen_value
     def get_short_type(self):
         return "EmbeddedProto::enumeration<" + self.get_type_as_defined().split("::")[-1] + ">"
 
+    def get_field_type(self):
+        return "enumeration"
+
+    @frozen_value
     def get_default_value(self):
         return "static_cast<" + self.get_type_as_defined() + ">(0)"
 
-    def match_field_with_definitions(self, all_types_definitions):
-        found = False
-        my_type = self.get_type_as_defined()
-        for enum_defs in all_types_definitions["enums"]:
-            other_scope = enum_defs.scope.get_scope_str()
-            if my_type == other_scope:
-                self.definition = enum_defs
-                found = True
-                break
+    # Enum values are serialized as unsigned 32 bit varints.
+    def get_max_value_size(self):
+        return 5
 
-        if not found:
-            raise Exception("Unable to find the definition of this enum: " + self.name)
+    def is_trivially_copyable(self):
+        return True
+
+    def match_field_with_definitions(self, symbol_table):
+        self.definition = symbol_table.get_enum(self.descriptor.type_name, self)
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldEnum_GetSet.h", jinja_environment=jinja_env)
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldEnum_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
     def render_serialize(self, jinja_env):
         return self.render("FieldEnum_Serialize.h", jinja_environment=jinja_env)
@@ -415,6 +554,8 @@ class FieldEnum(Field):
 
 # This class is used to wrap around any type of message used as a field.
 class FieldMessage(Field):
+    __slots__ = ("definition",)
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, "FieldMsg.h", oneof)
 
@@ -424,6 +565,7 @@ class FieldMessage(Field):
     def get_wire_type_str(self):
         return "LENGTH_DELIMITED"
 
+    @frozen_value
     def get_type(self):
         if not self.definition:
             # When the actual definition is unknown use the protobuf type.
@@ -446,33 +588,26 @@ class FieldMessage(Field):
 
         return type_name
 
+    @frozen_value
     def get_short_type(self):
         return self.get_type().split("::")[-1]
 
+    def get_field_type(self):
+        return "message"
+
+    @frozen_value
     def get_default_value(self):
         # Just call the default constructor.
         return ""
 
+    @frozen_value
     def get_template_parameters(self):
-        # Get the template names used by the definition.
-        templates = copy.deepcopy(self.definition.get_templates())
-        # Next add our variable name to make them unique.
-        for tmp in templates:
-            tmp["name"] = self.parent.name + "_" + self.variable_name + tmp["name"]
-        return templates
-
-    def match_field_with_definitions(self, all_types_definitions):
-        found = False
-        my_type = self.get_type()
-        for msg_defs in all_types_definitions["messages"]:
-            other_scope = msg_defs.scope.get_scope_str()
-            if my_type == other_scope:
-                self.definition = msg_defs
-                found = True
-                break
+        # Get the template names used by the definition and add our variable name to make them unique.
+        prefix = self.parent.name + "_" + self.variable_name
+        return [{"name": prefix + tmp["name"], "type": tmp["type"]} for tmp in self.definition.get_templates()]
 
-        if not found:
-            raise Exception("Unable to find the definition of this message: " + self.name)
+    def match_field_with_definitions(self, symbol_table):
+        self.definition = symbol_table.get_message(self.descriptor.type_name, self)
 
     def register_template_parameters(self):
         if self.definition.all_parameters_registered:
@@ -482,12 +617,26 @@ class FieldMessage(Field):
         else:
             return False
 
+    def get_message_definition(self):
+        return self.definition
+
+    def get_max_value_size(self):
+        message_size = self.definition.get_max_serialized_size() if self.definition else None
+        if message_size is None:
+            return None
+        return varint_size(message_size) + message_size
+
+    # A nested message can be copied memberwise when all its own fields can.
+    def is_trivially_copyable(self):
+        return bool(self.definition) and self.definition.has_trivially_copyable_fields()
+
     # Get the whole scope of the definition of this field.
     def get_scope(self):
         return self.definition.scope.get()
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldMsg_GetSet.h", jinja_environment=jinja_env)
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldMsg_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
     def render_serialize(self, jinja_env):
         return self.render("FieldMsg_Serialize.h", jinja_environment=jinja_env)
@@ -500,6 +649,8 @@ class FieldMessage(Field):
 
 # This class wraps around any other type of field which is repeated.
 class FieldRepeated(Field):
+    __slots__ = ("actual_type", "template_param_str", "MaxLength")
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, "FieldRepeated.h", oneof)
 
@@ -517,6 +668,7 @@ class FieldRepeated(Field):
     def get_wire_type_str(self):
         return "LENGTH_DELIMITED"
 
+    @frozen_value
     def get_type(self):
         type_str = "::EmbeddedProto::RepeatedFieldFixedSize<" + self.actual_type.get_type() + ", "
         if self.MaxLength:
@@ -525,6 +677,7 @@ class FieldRepeated(Field):
             type_str += self.template_param_str + ">"
         return type_str
 
+    @frozen_value
     def get_short_type(self):
         type_str = "::EmbeddedProto::RepeatedFieldFixedSize<" + self.actual_type.get_type() + ", "
         if self.MaxLength:
@@ -533,10 +686,15 @@ class FieldRepeated(Field):
             type_str += self.template_param_str + ">"
         return type_str
 
+    def get_field_type(self):
+        return "repeated"
+
     # As this is a repeated field we need a function to get the type we are repeating.
+    @frozen_value
     def get_base_type(self):
         return self.actual_type.get_type()
 
+    @frozen_value
     def get_template_parameters(self):
         result = []
         # When we do not have a maximum length specified add the length as a template param.
@@ -545,8 +703,30 @@ class FieldRepeated(Field):
         result.extend(self.actual_type.get_template_parameters())
         return result
 
-    def match_field_with_definitions(self, all_types_definitions):
-        self.actual_type.match_field_with_definitions(all_types_definitions)
+    def match_field_with_definitions(self, symbol_table):
+        self.actual_type.match_field_with_definitions(symbol_table)
+
+    def freeze(self):
+        super().freeze()
+        self.actual_type.freeze()
+
+    def get_message_definition(self):
+        return self.actual_type.get_message_definition()
+
+    # Basic types and enums are serialized packed, all the values after a single tag and length. The elements of other
+    # types are serialized with their own tag and length.
+    @frozen_value
+    def get_max_serialized_size(self):
+        if not self.MaxLength:
+            return None
+
+        if isinstance(self.actual_type, (FieldBasic, FieldEnum)):
+            data_size = self.MaxLength * self.actual_type.get_max_value_size()
+            result = self.get_tag_size() + varint_size(data_size) + data_size
+        else:
+            element_size = self.actual_type.get_max_serialized_size()
+            result = None if element_size is None else self.MaxLength * element_size
+        return result
 
     def register_template_parameters(self):
         result = True
@@ -565,8 +745,9 @@ class FieldRepeated(Field):
 
         return result
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldRepeated_GetSet.h", jinja_environment=jinja_env)
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldRepeated_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
     def render_serialize(self, jinja_env):
         return self.render("FieldRepeated_Serialize.h", jinja_environment=jinja_env)
@@ -580,16 +761,24 @@ class FieldRepeated(Field):
 
 # This class represents a field we can not include because it causes a recursive inclusion.
 class FieldErrorRecursive(Field):
+    __slots__ = ()
+
     def __init__(self, proto_descriptor, parent_msg, oneof=None):
         super().__init__(proto_descriptor, parent_msg, "FieldRepeated.h", oneof)
 
         self.descriptor.type_name = "FieldErrorRecursive"
 
+    @frozen_value
     def get_type(self):
         return "//"
 
-    def render_get_set(self, jinja_env):
-        return self.render("FieldErrorRecursive_GetSet.h", jinja_environment=jinja_env)
+    # There is no member in the class to copy.
+    def is_trivially_copyable(self):
+        return True
+
+    def render_get_set(self, jinja_env, cache_serialized_size=False):
+        return self.render("FieldErrorRecursive_GetSet.h", jinja_environment=jinja_env,
+                           cache_serialized_size=cache_serialized_size)
 
     def render_serialize(self, jinja_env):
         return ""
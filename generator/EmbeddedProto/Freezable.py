@@ -0,0 +1,66 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+import functools
+
+
+# The base class of the objects in the type model, like scopes, fields and definitions. While the template parameters
+# are registered the names and types of these objects can still change and have to be calculated each time. Once all
+# template parameters are registered the objects are frozen. From then on the values returned by methods marked with
+# frozen_value are calculated once and stored.
+class Freezable:
+    __slots__ = ("frozen_values",)
+
+    def __init__(self):
+        # None when not frozen, after freezing a dictionary with the stored values by method name.
+        self.frozen_values = None
+
+    def freeze(self):
+        if self.frozen_values is None:
+            self.frozen_values = {}
+
+
+# A decorator for methods without parameters of a Freezable object. The result is stored after the object is frozen.
+# The stored value is shared by all callers, it should therefore not be altered.
+def frozen_value(method):
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if self.frozen_values is None:
+            return method(self)
+        try:
+            return self.frozen_values[name]
+        except KeyError:
+            value = method(self)
+            self.frozen_values[name] = value
+            return value
+
+    return wrapper
@@ -0,0 +1,167 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+from .OutputDirectory import get_umask
+from .TemplateEnvironment import templates_checksum
+import hashlib
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where the statistics are updated without a lock.
+    fcntl = None
+
+
+# The default maximum number of files stored in the cache. When more files are stored the least recently used ones
+# are removed.
+DEFAULT_MAX_ENTRIES = 1000
+
+STATISTICS_FILENAME = "statistics.json"
+
+# The file locked while the statistics are updated.
+STATISTICS_LOCK_FILENAME = "statistics.lock"
+
+
+# -----------------------------------------------------------------------------
+
+def generator_checksum():
+    # A checksum over the source code of the generator and its templates. When the generator changes, all previously
+    # cached headers become invalid.
+    sha = hashlib.sha256(templates_checksum().encode("utf-8"))
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for filename in sorted(os.listdir(package_dir)):
+        if filename.endswith(".py"):
+            sha.update(filename.encode("utf-8"))
+            with open(os.path.join(package_dir, filename), "rb") as file:
+                sha.update(file.read())
+    return sha.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+
+# An on disk cache of rendered files. The files generated for a proto file are stored under a key which is a hash over everything which
+# determines its content: the file descriptor, the descriptors of all files it imports directly or indirectly, the
+# plugin parameters and the generator itself.
+class GenerationCache:
+    def __init__(self, cache_dir, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.generator_checksum = generator_checksum()
+
+        # The hits and misses during this run.
+        self.hits = 0
+        self.misses = 0
+
+    # Calculate the key for the header of the given proto file. The dependency graph holds all the file descriptors in
+    # the request. The parameters are the plugin parameters which influence the generated code.
+    def get_key(self, dependency_graph, name, parameters):
+        return dependency_graph.get_input_digest(name, parameters, self.generator_checksum)
+
+    def get_entry_path(self, key, extension):
+        return os.path.join(self.cache_dir, key + extension)
+
+    # Return the cached files for the given key as a dictionary with the content by file extension. None is returned
+    # when not all files with the given extensions are in the cache.
+    def get(self, key, extensions=(".h",)):
+        outputs = {}
+        try:
+            for extension in extensions:
+                path = self.get_entry_path(key, extension)
+                with open(path, "r", encoding="utf-8") as file:
+                    outputs[extension] = file.read()
+                # Update the modification time, it is used to find the least recently used entries.
+                os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return outputs
+
+    # Store the files given as a dictionary with the content by file extension.
+    def put(self, key, outputs):
+        for extension, content in outputs.items():
+            self.write_atomic(self.get_entry_path(key, extension), content)
+
+    # Multiple protoc processes can use the same cache at the same time. Files are therefore written to a temporary file
+    # first which then replaces the actual file. The temporary file is created private, so it gets the mode a normal
+    # open would give, allowing a cache shared between users.
+    def write_atomic(self, path, content):
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                file.write(content)
+            os.chmod(tmp_path, 0o666 & ~get_umask())
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    # Remove the least recently used entries when there are more than the maximum number allowed.
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith((".h", ".cpp")):
+                entries.append((entry.stat().st_mtime, entry.path))
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Another process might have removed it already.
+                    pass
+
+    # Return the hit and miss statistics of all runs using this cache.
+    def get_statistics(self):
+        try:
+            with open(os.path.join(self.cache_dir, STATISTICS_FILENAME), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0}
+
+    # Called at the end of a run to add the statistics of this run to the total and limit the size of the cache. Runs
+    # finishing at the same time take turns in reading and writing the statistics, otherwise their counts get lost.
+    def close(self):
+        with open(os.path.join(self.cache_dir, STATISTICS_LOCK_FILENAME), "a") as lock_file:
+            if fcntl:
+                # The lock is released when the file is closed.
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            statistics = self.get_statistics()
+            statistics["hits"] += self.hits
+            statistics["misses"] += self.misses
+            self.write_atomic(os.path.join(self.cache_dir, STATISTICS_FILENAME), json.dumps(statistics))
+        self.evict()
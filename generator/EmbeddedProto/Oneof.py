@@ -29,10 +29,15 @@
 #
 
 from .Field import Field
+from .Freezable import Freezable, frozen_value
 
 
-class Oneof:
+class Oneof(Freezable):
+    __slots__ = ("descriptor", "parent", "fields")
+
     def __init__(self, oneof_proto_descriptor, index, msg_descriptor, parent_msg):
+        super().__init__()
+
         # A reference to the OneofDescriptorProto object which defines this field.
         self.descriptor = oneof_proto_descriptor
 
@@ -49,18 +54,25 @@ class Oneof:
     def get_name(self):
         return self.descriptor.name
 
+    @frozen_value
     def get_variable_name(self):
         return self.get_name() + "_"
 
+    @frozen_value
     def get_which_oneof(self):
         return "which_" + self.get_name() + "_"
 
     def get_fields(self):
         return self.fields
 
-    def match_field_with_definitions(self, all_types_definitions):
+    def match_field_with_definitions(self, symbol_table):
         for field in self.fields:
-            field.match_field_with_definitions(all_types_definitions)
+            field.match_field_with_definitions(symbol_table)
+
+    def freeze(self):
+        super().freeze()
+        for field in self.fields:
+            field.freeze()
 
     def register_template_parameters(self):
         all_parameters_registered = True
@@ -69,10 +81,19 @@ class Oneof:
         return all_parameters_registered
 
     # Returns true if in oneof.init the new& function needs to be call to initialize already allocated memory.
+    @frozen_value
     def oneof_allocation_required(self):
         result = False
         for field in self.fields:
             result = field.oneof_allocation_required()
             if result:
                 break
-        return result
\ No newline at end of file
+        return result
+
+    # Only one field of the oneof is serialized, the largest one determines the maximum size.
+    @frozen_value
+    def get_max_serialized_size(self):
+        sizes = [field.get_max_serialized_size() for field in self.fields]
+        if None in sizes:
+            return None
+        return max(sizes)
@@ -0,0 +1,178 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+import hashlib
+import json
+import os
+import tempfile
+
+
+MANIFEST_FILENAME = "embedded_proto_manifest.json"
+
+
+# The umask of the process can only be read by setting it, so it is set back directly.
+def get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# -----------------------------------------------------------------------------
+
+# The folder in which the batch generator stores the headers. A header is only written when its content differs from
+# the file already on disk. In this way the modification time of unchanged headers stays the same and build tools like
+# make and ninja do not recompile the source files including them.
+#
+# A manifest in the output folder records which headers where generated, from which proto file, the hash of their
+# content and the digest of the inputs they were generated from. It is used to skip headers of which the inputs did not
+# change and to remove headers of proto files which are no longer part of the build.
+class OutputDirectory:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.previous_manifest = self.read_manifest()
+
+        # The headers written during this run, stored by name relative to the output folder.
+        self.files = {}
+
+        # The number of headers which were written and the number which were already up to date.
+        self.written = 0
+        self.unchanged = 0
+
+        # The headers which were not generated as their inputs did not change.
+        self.skipped = []
+
+    def get_manifest_path(self):
+        return os.path.join(self.output_dir, MANIFEST_FILENAME)
+
+    def read_manifest(self):
+        try:
+            with open(self.get_manifest_path(), "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            return manifest.get("files", {})
+        except (OSError, ValueError):
+            return {}
+
+    # Check if the header was generated in a previous run from the same inputs and was not changed since.
+    def is_up_to_date(self, name, input_digest):
+        entry = self.previous_manifest.get(name)
+        if (not entry) or (entry.get("inputs") != input_digest):
+            return False
+        try:
+            with open(os.path.join(self.output_dir, name), "rb") as file:
+                return hashlib.sha256(file.read()).hexdigest() == entry.get("sha256")
+        except OSError:
+            return False
+
+    # Keep the header generated in a previous run.
+    def skip(self, name):
+        self.files[name] = self.previous_manifest[name]
+        self.skipped.append(name)
+
+    # Write the header with the given name, relative to the output folder, when its content changed. The input digest
+    # identifies the inputs the header was generated from.
+    def write(self, name, content, source, input_digest):
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        self.files[name] = {"source": source, "sha256": digest, "inputs": input_digest}
+
+        path = os.path.join(self.output_dir, name)
+        try:
+            with open(path, "rb") as file:
+                changed = file.read() != data
+        except OSError:
+            changed = True
+
+        if changed:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.write_atomic(path, data)
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    # Write to a temporary file first which then replaces the actual file. A build tool reading the header at the same
+    # time will never see a partially written file. The temporary file is created private, so it gets the mode of the
+    # header it replaces or, for a new header, the mode a normal open would give.
+    @staticmethod
+    def write_atomic(path, data):
+        if os.path.exists(path):
+            mode = os.stat(path).st_mode & 0o7777
+        else:
+            mode = 0o666 & ~get_umask()
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(data)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    # Remove the headers listed in the previous manifest which have not been generated this time. The headers of the
+    # kept sources, proto files which are still in the build but were not requested this run, stay in the manifest.
+    # Returns the names of the removed headers.
+    def remove_stale(self, kept_sources=()):
+        removed = []
+        for name in sorted(self.previous_manifest):
+            if (name not in self.files) and (self.previous_manifest[name].get("source") in kept_sources):
+                self.files[name] = self.previous_manifest[name]
+            elif name not in self.files:
+                try:
+                    os.remove(os.path.join(self.output_dir, name))
+                    removed.append(name)
+                except OSError:
+                    # The user might have removed it already.
+                    pass
+                self.remove_empty_folders(os.path.dirname(name))
+        return removed
+
+    # Remove the sub folders of the output folder, for example from a proto package, which became empty.
+    def remove_empty_folders(self, folder):
+        while folder:
+            try:
+                os.rmdir(os.path.join(self.output_dir, folder))
+            except OSError:
+                # The folder is not empty.
+                break
+            folder = os.path.dirname(folder)
+
+    # Store the manifest of this run. It is only rewritten when it changed, build tools can depend on it as well.
+    def close(self):
+        manifest = json.dumps({"files": self.files}, indent=2, sort_keys=True) + "\n"
+        path = self.get_manifest_path()
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                changed = file.read() != manifest
+        except OSError:
+            changed = True
+        if changed:
+            self.write_atomic(path, manifest.encode("utf-8"))
@@ -29,6 +29,7 @@
 #
 
 from .TypeDefinitions import *
+from .SymbolTable import SymbolTable
 import os
 from toposort import CircularDependencyError, toposort_flatten
 from google.protobuf.descriptor_pb2 import FieldDescriptorProto
@@ -38,7 +39,7 @@ from google.protobuf.descriptor_pb2 import FieldDescriptorProto
 
 def toposort_add_msg(msg, namespace, dependency_data):
 
-    local_definitions = []
+    local_definitions = set()
     local_namespace = namespace + "." + msg.name
 
     dependencies = {namespace}
@@ -46,7 +47,7 @@ def toposort_add_msg(msg, namespace, dependency_data):
     for nested_msg in msg.nested_type:
         dependency_data = toposort_add_msg(nested_msg, local_namespace, dependency_data)
         full_msg_type = local_namespace + "." + nested_msg.name
-        local_definitions.append(full_msg_type)
+        local_definitions.add(full_msg_type)
         for dep in dependency_data[full_msg_type]:
             # Add requirements on other namespaces.
             if not dep.startswith(local_namespace):
@@ -55,7 +56,7 @@ def toposort_add_msg(msg, namespace, dependency_data):
     for nested_enum in msg.enum_type:
         full_enum_type = local_namespace + "." + nested_enum.name
         dependency_data[full_enum_type] = {local_namespace}
-        local_definitions.append(full_enum_type)
+        local_definitions.add(full_enum_type)
 
     for f in msg.field:
         if ((FieldDescriptorProto.TYPE_MESSAGE == f.type) or (FieldDescriptorProto.TYPE_ENUM == f.type)) \
@@ -69,6 +70,23 @@ def toposort_add_msg(msg, namespace, dependency_data):
     return dependency_data
 
 
+# -----------------------------------------------------------------------------
+
+def find_circular_dependencies(dependency_data):
+    # Given the dependencies which toposort was not able to sort, return the names which are part of a circular
+    # dependency. Names on which none of the others depend can not be part of a circle and are removed until none are
+    # left.
+    remaining = {name: dependencies & dependency_data.keys() for name, dependencies in dependency_data.items()}
+    while True:
+        depended_on = set().union(*remaining.values())
+        not_in_circle = [name for name in remaining if name not in depended_on]
+        if not not_in_circle:
+            break
+        for name in not_in_circle:
+            del remaining[name]
+    return sorted(remaining)
+
+
 # -----------------------------------------------------------------------------
 
 class ProtoFile:
@@ -95,6 +113,10 @@ class ProtoFile:
         self.enum_definitions = [EnumDefinition(enum, self.scope) for enum in self.descriptor.enum_type]
         self.msg_definitions = [MessageDefinition(msg, self.scope) for msg in self.descriptor.message_type]
 
+        # All the enums and messages defined in this file by their full protobuf name.
+        self.symbol_table = SymbolTable()
+        self.symbol_table.add_definitions(self.get_all_nested_types())
+
         self.all_parameters_registered = False
 
         # Sort the message definitions such that the dependencies work out.
@@ -109,31 +131,24 @@ class ProtoFile:
         try:
             # Sort the message in the order they should appear in the code.
             message_order = toposort_flatten(dependency_data)
+        except CircularDependencyError as e:
+            raise Exception("There are circular dependencies in the message definitions of " + proto_descriptor.name +
+                            " between: " + ", ".join(find_circular_dependencies(e.data)) + ". Embedded Proto is not "
+                            "able to support this. Please remove these dependencies.")
 
-            # If we are in a namespace this appears in the list and should be removed.
-            my_scope = ""
-            if self.scope and (0 < len(message_order)):
-                my_scope = "." + self.scope.get_scope_str().replace("::", ".")
-                message_order.remove(my_scope)
-
-            # Based on the desired order assign each message definition an index.
-            for index, msg_name in enumerate(message_order):
-                for msg_def in self.msg_definitions:
-                    if msg_def.name == msg_name.replace(my_scope + ".", ''):
-                        msg_def.sorted_index = index
-                        break
-
-            # Next sort the messages based on their index.
-            self.msg_definitions.sort(key=lambda msg: msg.sorted_index)
+        # Based on the desired order assign each message definition an index. The order also includes namespaces and
+        # enums, these are not in the messages of the symbol table.
+        for index, msg_name in enumerate(message_order):
+            msg_def = self.symbol_table.messages.get(msg_name)
+            if msg_def:
+                msg_def.sorted_index = index
 
-            # Sort al the nested message definitions.
-            for msg in self.msg_definitions:
-                msg.sort_nested_msg_definitions(message_order)
+        # Next sort the messages based on their index.
+        self.msg_definitions.sort(key=lambda msg: msg.sorted_index)
 
-        except CircularDependencyError as e:
-            raise Exception("There are possible circular dependencies in the message definitions of "
-                            + proto_descriptor.name + ". Embedded Proto is not able to support this. "
-                            "Please remove these dependencies.")
+        # Sort al the nested message definitions.
+        for msg in self.msg_definitions:
+            msg.sort_nested_msg_definitions()
 
     def get_dependencies(self):
         imported_dependencies = []
@@ -164,22 +179,52 @@ class ProtoFile:
 
         return nested_types
 
-    def match_fields_with_definitions(self, all_types_definitions):
+    def match_fields_with_definitions(self, symbol_table):
         for msg in self.msg_definitions:
-            msg.match_fields_with_definitions(all_types_definitions)
-
-    def register_template_parameters(self):
-        all_parameters_registered = True
+            msg.match_fields_with_definitions(symbol_table)
+
+    # After the template parameters are registered, freeze all definitions in this file. The names and types used
+    # while rendering are then calculated only once.
+    def freeze(self):
+        scope = self.scope
+        while scope:
+            scope.freeze()
+            scope = scope.parent
+
+        for enum_def in self.symbol_table.enums.values():
+            enum_def.freeze()
+        for msg_def in self.symbol_table.messages.values():
+            msg_def.freeze()
+
+    # The messages of which the member functions are defined in the source file when split_source is used. Class
+    # templates are left out, they are defined completely in the header.
+    def get_source_definitions(self):
+        result = []
         for msg in self.msg_definitions:
-            all_parameters_registered = msg.register_template_parameters() and all_parameters_registered
-        return all_parameters_registered
+            result.extend(m for m in msg.get_all_messages() if not m.is_templated())
+        return result
+
+    # The name of a message relative to the namespace of this file, for example "Outer::Inner".
+    def get_class_name(self, msg):
+        return "::".join(msg.scope.get_list_of_scope_str()[len(self.get_namespaces()):])
 
-    def render(self, jinja_environment):
+    def render(self, jinja_environment, options):
         template_file = "Header.h"
         template = jinja_environment.get_template(template_file)
-        file_str = template.render(proto_file=self, environment=jinja_environment)
+        file_str = template.render(proto_file=self, environment=jinja_environment, options=options)
         return file_str
 
+    def render_source(self, jinja_environment, options):
+        template = jinja_environment.get_template("Source.cpp")
+        return template.render(proto_file=self, environment=jinja_environment, options=options)
+
+    # Render all files generated for this proto file. Returns a dictionary with the content by file extension.
+    def render_outputs(self, jinja_environment, options):
+        outputs = {".h": self.render(jinja_environment, options)}
+        if options["split_source"]:
+            outputs[".cpp"] = self.render_source(jinja_environment, options)
+        return outputs
+
     def print_template_data(self, indent):
         print(indent + "File: " + self.filename_without_folder)
         if self.msg_definitions:
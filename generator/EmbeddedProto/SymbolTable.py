@@ -0,0 +1,93 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+from collections import deque
+
+
+# The symbol table holds all enum and message definitions known to the generator. They are stored by their fully
+# qualified protobuf name, for example ".package.Message.NestedEnum", which is the same format protoc uses for the
+# type_name of fields. This allows fields to find their definition without searching through all definitions.
+class SymbolTable:
+    def __init__(self):
+        self.enums = {}
+        self.messages = {}
+
+    # Add the enums and messages in the dictionary as returned by get_all_nested_types().
+    def add_definitions(self, nested_types):
+        for enum_def in nested_types["enums"]:
+            self.enums[enum_def.get_proto_type()] = enum_def
+        for msg_def in nested_types["messages"]:
+            self.messages[msg_def.get_proto_type()] = msg_def
+
+    # Add all the enums and messages defined in the given proto file, including the nested definitions. Each proto file
+    # already holds a symbol table with its own definitions.
+    def add_file(self, proto_file):
+        self.enums.update(proto_file.symbol_table.enums)
+        self.messages.update(proto_file.symbol_table.messages)
+
+    def get_enum(self, type_name, field):
+        try:
+            return self.enums[type_name]
+        except KeyError:
+            raise Exception("Unable to find the definition of the enum \"" + type_name + "\" used by the field \"" +
+                            field.name + "\" in message \"" + field.parent.get_proto_type() + "\".")
+
+    def get_message(self, type_name, field):
+        try:
+            return self.messages[type_name]
+        except KeyError:
+            raise Exception("Unable to find the definition of the message \"" + type_name + "\" used by the field \"" +
+                            field.name + "\" in message \"" + field.parent.get_proto_type() + "\".")
+
+    # Register the template parameters of all messages. A message can only do this after the messages used in its fields
+    # have registered theirs. Therefore a worklist is used which processes each message exactly once, as soon as all the
+    # messages it depends on have been processed.
+    def register_template_parameters(self):
+        dependents = {type_name: [] for type_name in self.messages}
+        n_unresolved_dependencies = {}
+        for type_name, msg_def in self.messages.items():
+            dependencies = {dependency.get_proto_type() for dependency in msg_def.get_message_dependencies()}
+            n_unresolved_dependencies[type_name] = len(dependencies)
+            for dependency in dependencies:
+                dependents[dependency].append(type_name)
+
+        worklist = deque(type_name for type_name, n in n_unresolved_dependencies.items() if 0 == n)
+        while worklist:
+            type_name = worklist.popleft()
+            self.messages[type_name].register_template_parameters()
+            for dependent in dependents[type_name]:
+                n_unresolved_dependencies[dependent] -= 1
+                if 0 == n_unresolved_dependencies[dependent]:
+                    worklist.append(dependent)
+
+        unresolved = [type_name for type_name, n in n_unresolved_dependencies.items() if 0 < n]
+        if unresolved:
+            raise Exception("Messages with repeated, string or byte fields use template parameters to define their "
+                            "length. It was not possible to add all required template parameters because these "
+                            "messages depend on each other: " + ", ".join(unresolved) + ".")
@@ -0,0 +1,119 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+import compileall
+import hashlib
+import os
+import shutil
+import jinja2
+
+
+# The options used to create the Jinja environment. The precompiled templates are compiled using the same options.
+ENVIRONMENT_OPTIONS = {"trim_blocks": True, "lstrip_blocks": True}
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# The folder in which the templates are stored as precompiled python modules. This folder is created when the package
+# is build or installed.
+COMPILED_TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates_compiled")
+
+# The file in the compiled templates folder holding the checksum of the templates it was compiled from.
+CHECKSUM_FILENAME = "templates.sha256"
+
+
+# -----------------------------------------------------------------------------
+
+def templates_checksum():
+    # Calculate a checksum over the source of all templates and the Jinja version. Precompiled templates are only valid
+    # for the sources and the Jinja version they were compiled with.
+    sha = hashlib.sha256(jinja2.__version__.encode("utf-8"))
+    for filename in sorted(os.listdir(TEMPLATES_DIR)):
+        sha.update(filename.encode("utf-8"))
+        with open(os.path.join(TEMPLATES_DIR, filename), "rb") as file:
+            sha.update(file.read())
+    return sha.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+
+def compile_templates(target_dir=COMPILED_TEMPLATES_DIR):
+    # Compile all templates into python modules which can be loaded by the jinja2.ModuleLoader. This saves parsing and
+    # compiling the templates each time the plugin is started. The modules are also compiled into python bytecode.
+    environment = jinja2.Environment(loader=jinja2.FileSystemLoader(TEMPLATES_DIR), **ENVIRONMENT_OPTIONS)
+    shutil.rmtree(target_dir, ignore_errors=True)
+    environment.compile_templates(target_dir, zip=None)
+    compileall.compile_dir(target_dir, quiet=1)
+
+    with open(os.path.join(target_dir, CHECKSUM_FILENAME), "w") as file:
+        file.write(templates_checksum())
+
+
+# -----------------------------------------------------------------------------
+
+def precompiled_templates_valid():
+    try:
+        with open(os.path.join(COMPILED_TEMPLATES_DIR, CHECKSUM_FILENAME), "r") as file:
+            return file.read() == templates_checksum()
+    except OSError:
+        return False
+
+
+# -----------------------------------------------------------------------------
+
+def create_environment():
+    # Use the precompiled templates when they are available and up to date with the template sources. Otherwise fall back
+    # on compiling the templates from source. In that case a bytecode cache is used so the compile step is only done
+    # the first time the plugin runs.
+    if precompiled_templates_valid():
+        loader = jinja2.ModuleLoader(COMPILED_TEMPLATES_DIR)
+        return jinja2.Environment(loader=loader, **ENVIRONMENT_OPTIONS)
+
+    try:
+        bytecode_cache = jinja2.FileSystemBytecodeCache()
+    except RuntimeError:
+        # The cache folder could not be created, continue without a cache.
+        bytecode_cache = None
+
+    loader = jinja2.FileSystemLoader(TEMPLATES_DIR)
+    return jinja2.Environment(loader=loader, bytecode_cache=bytecode_cache, **ENVIRONMENT_OPTIONS)
+
+
+# -----------------------------------------------------------------------------
+
+# The environment shared by all code generated in this process. Jinja keeps the loaded templates in its environment,
+# a long running process like the daemon only loads them once.
+shared_environment = None
+
+
+def get_shared_environment():
+    global shared_environment
+    if shared_environment is None:
+        shared_environment = create_environment()
+    return shared_environment
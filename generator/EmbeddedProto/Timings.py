@@ -0,0 +1,121 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+from contextlib import contextmanager
+import json
+import time
+import tracemalloc
+
+
+# This class records the wall time and peak memory usage of the phases of the generator. It is used to find out where
+# time is spent when generating code for a set of proto files. When disabled, measuring does nothing.
+class Timings:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+        # The results of the main phases of the generator and of rendering the individual files.
+        self.phases = []
+        self.files = []
+
+        # The total time spent rendering each message and each template file. Templates render other templates, the
+        # time of a template thus includes the time of the templates rendered by it.
+        self.messages = {}
+        self.templates = {}
+
+        # The peak memory usage of the measurements currently running. Measurements can be nested, for example a file
+        # is rendered during the render phase.
+        self.peak_stack = []
+
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def measure(self, results, name):
+        if not self.enabled:
+            yield
+            return
+
+        # Store the peak of the outer measurement before resetting it for this one.
+        if self.peak_stack:
+            self.peak_stack[-1] = max(self.peak_stack[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self.peak_stack.append(0)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start
+            peak = max(self.peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+            if self.peak_stack:
+                self.peak_stack[-1] = max(self.peak_stack[-1], peak)
+            results.append({"name": name, "wall_time_s": wall_time, "peak_memory_bytes": peak})
+
+    def phase(self, name):
+        return self.measure(self.phases, name)
+
+    def file(self, name):
+        return self.measure(self.files, name)
+
+    def add_template(self, template_name, wall_time, typedef):
+        total = self.templates.setdefault(template_name, {"count": 0, "wall_time_s": 0.0})
+        total["count"] += 1
+        total["wall_time_s"] += wall_time
+
+        if "TypeDefMsg.h" == template_name:
+            self.messages[typedef.get_proto_type()] = wall_time
+
+    # Make the given Jinja environment report the time spent in each template.
+    def instrument(self, environment):
+        if not self.enabled:
+            return
+
+        timings = self
+
+        class TimedTemplate(environment.template_class):
+            def render(self, *args, **kwargs):
+                start = time.perf_counter()
+                result = super().render(*args, **kwargs)
+                timings.add_template(self.name, time.perf_counter() - start, kwargs.get("typedef"))
+                return result
+
+        environment.template_class = TimedTemplate
+
+    def write(self, filename):
+        report = {"phases": self.phases,
+                  "files": self.files,
+                  "messages": self.messages,
+                  "templates": self.templates}
+        with open(filename, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+# Used when no timings are required.
+NO_TIMINGS = Timings(enabled=False)
@@ -30,13 +30,18 @@
 
 from .Field import Field
 from .Oneof import Oneof
+from .Freezable import Freezable, frozen_value
 import jinja2
 
 
 # This class deal with the scope in which definitions and field are located. It is used to keep track of template
 # parameters required for a given scope.
-class Scope:
+class Scope(Freezable):
+    __slots__ = ("name", "parent", "child_scopes", "fields_with_templates")
+
     def __init__(self, scope_name, parent):
+        super().__init__()
+
         # The name of this scope/namespace
         self.name = scope_name
 
@@ -53,16 +58,17 @@ class Scope:
         self.fields_with_templates = []
 
     # This function is used
+    @frozen_value
     def get_list_of_scope_str(self):
         if self.parent:
-            result = self.parent.get_list_of_scope_str()
-            result.append(self.name)
+            result = self.parent.get_list_of_scope_str() + [self.name]
         else:
             result = [self.name]
         return result
 
     # When searching for the definition of a field this function returns a scope string equal to the type defined by
     # protobuf.
+    @frozen_value
     def get_scope_str(self):
         if self.parent:
             scope_str = self.parent.get_scope_str() + "::" + self.name
@@ -71,10 +77,16 @@ class Scope:
 
         return scope_str
 
+    # Return the fully qualified name of this scope as used by protobuf, for example ".package.Message".
+    @frozen_value
+    def get_proto_scope_str(self):
+        return "." + ".".join(self.get_list_of_scope_str())
+
     def register_template_parameters(self, field):
         self.fields_with_templates.append(field)
 
     # Return the list of template parameters required for this scope alone.
+    @frozen_value
     def get_template_parameters(self):
         result = []
         for field in self.fields_with_templates:
@@ -82,18 +94,22 @@ class Scope:
         return result
 
     # Return a full list of the scope, parent scopes and their templates
+    @frozen_value
     def get(self):
         result = []
         if self.parent:
             result.extend(self.parent.get())
-        result.extend([{"name": self.name, "templates": self.get_template_parameters()}])
+        result.append({"name": self.name, "templates": self.get_template_parameters()})
         return result
 
 # -----------------------------------------------------------------------------
 
 
-class TypeDefinition:
+class TypeDefinition(Freezable):
+    __slots__ = ("descriptor", "name", "scope", "template_file")
+
     def __init__(self, proto_descriptor, parent_scope, template_filename):
+        super().__init__()
         self.descriptor = proto_descriptor
         self.name = proto_descriptor.name
         self.scope = Scope(self.name, parent_scope)
@@ -102,15 +118,25 @@ class TypeDefinition:
     def get_name(self):
         return self.name
 
-    def render(self, jinja_environment):
+    # The fully qualified type name as used by protobuf. This is the key used in the symbol table.
+    def get_proto_type(self):
+        return self.scope.get_proto_scope_str()
+
+    def freeze(self):
+        super().freeze()
+        self.scope.freeze()
+
+    def render(self, jinja_environment, options=None):
         template = jinja_environment.get_template(self.template_file)
-        render_result = template.render(typedef=self, environment=jinja_environment)
+        render_result = template.render(typedef=self, environment=jinja_environment, options=options)
         return render_result
 
 
 # -----------------------------------------------------------------------------
 
 class EnumDefinition(TypeDefinition):
+    __slots__ = ()
+
     def __init__(self, proto_descriptor, parent_scope):
         super().__init__(proto_descriptor, parent_scope, "TypeDefEnum.h")
 
@@ -123,6 +149,9 @@ class EnumDefinition(TypeDefinition):
 # -----------------------------------------------------------------------------
 
 class MessageDefinition(TypeDefinition):
+    __slots__ = ("nested_enum_definitions", "nested_msg_definitions", "field_ids", "optional_fields", "fields", "oneofs",
+                 "all_parameters_registered", "contains_template_parameters", "sorted_index")
+
     def __init__(self, proto_descriptor, parent_scope):
         super().__init__(proto_descriptor, parent_scope, "TypeDefMsg.h")
 
@@ -175,22 +204,14 @@ class MessageDefinition(TypeDefinition):
         # when the dependencies on other messages has been sorted.
         self.sorted_index = 0
 
-    # Sort the nested message defintions based on the dependencies found by the sort algorithms.
-    def sort_nested_msg_definitions(self, message_order):
-        my_scope = "." + self.scope.get_scope_str().replace("::", ".")
-
-        for index, msg_name in enumerate(message_order):
-            for msg_def in self.nested_msg_definitions:
-                if msg_def.name == msg_name.replace(my_scope + ".", ''):
-                    msg_def.sorted_index = index
-                    break
-
-        # Next sort the messages based on their index.
+    # Sort the nested message defintions based on the index assigned to them by the ProtoFile using the order found by
+    # the sort algorithm.
+    def sort_nested_msg_definitions(self):
         self.nested_msg_definitions.sort(key=lambda msg: msg.sorted_index)
 
         # Sort al the nested message definitions in the nested message definitions.
         for nested_msg in self.nested_msg_definitions:
-            nested_msg.sort_nested_msg_definitions(message_order)
+            nested_msg.sort_nested_msg_definitions()
 
     # Obtain a dictionary with references to all nested enums and messages
     def get_all_nested_types(self):
@@ -204,27 +225,39 @@ class MessageDefinition(TypeDefinition):
 
         return nested_types
 
-    def match_fields_with_definitions(self, all_types_definitions):
+    def match_fields_with_definitions(self, symbol_table):
         # Resolve the types of the nested messages.
         for msg in self.nested_msg_definitions:
-            msg.match_fields_with_definitions(all_types_definitions)
+            msg.match_fields_with_definitions(symbol_table)
 
         # Resolve the types of the fields defined in this message.
         for field in self.fields:
-            field.match_field_with_definitions(all_types_definitions)
+            field.match_field_with_definitions(symbol_table)
 
         for oneof in self.oneofs:
-            oneof.match_field_with_definitions(all_types_definitions)
+            oneof.match_field_with_definitions(symbol_table)
 
-    # TODO This function will fail to return True if this definitions contains it self as a nested field.
+    # Return the message definitions used by the fields of this message. Their template parameters have to be registered
+    # before the ones of this message.
+    def get_message_dependencies(self):
+        dependencies = []
+        for field in self.fields:
+            definition = field.get_message_definition()
+            if definition:
+                dependencies.append(definition)
+
+        for oneof in self.oneofs:
+            for field in oneof.get_fields():
+                definition = field.get_message_definition()
+                if definition:
+                    dependencies.append(definition)
+
+        return dependencies
+
+    # Register the template parameters of the fields in this message. Nested message definitions are registered
+    # separately by the symbol table, after the messages they depend on.
     def register_template_parameters(self):
         self.all_parameters_registered = True
-        # First resolve the template parameters for all nested message definitions.
-        for nested_msg in self.nested_msg_definitions:
-            self.all_parameters_registered = nested_msg.register_template_parameters() \
-                                             and self.all_parameters_registered
-
-        # Next see if we our self have any fields that have template parameters.
         for field in self.fields:
             self.all_parameters_registered = field.register_template_parameters() and self.all_parameters_registered
 
@@ -233,6 +266,77 @@ class MessageDefinition(TypeDefinition):
 
         return self.all_parameters_registered
 
+    # Freeze the fields of this message once all template parameters are registered. Nested message definitions are
+    # frozen separately.
+    def freeze(self):
+        super().freeze()
+        for field in self.fields:
+            field.freeze()
+        for oneof in self.oneofs:
+            oneof.freeze()
+
+    # A message is a class template when it, or a message it is nested in, has template parameters. The member
+    # functions of class templates can only be defined in the header.
+    @frozen_value
+    def is_templated(self):
+        return any(scope["templates"] for scope in self.scope.get())
+
+    # The maximum number of bytes this message takes when serialized. This is known when all string, bytes and repeated
+    # fields in it, and in the messages used by it, have a maximum length set in the options. Otherwise None is
+    # returned.
+    @frozen_value
+    def get_max_serialized_size(self):
+        sizes = [field.get_max_serialized_size() for field in self.fields]
+        sizes.extend(oneof.get_max_serialized_size() for oneof in self.oneofs)
+        if None in sizes:
+            return None
+        result = sum(sizes)
+        # The size has to fit in the uint32_t constant.
+        return result if result <= 0xFFFFFFFF else None
+
+    # Return true when the message only holds fields which always take the same number of bytes when set, like fixed32,
+    # double and bool fields. The serialized size of such a message is calculated directly from the fields which are
+    # set instead of by serializing the message into a MessageSizeCalculator.
+    @frozen_value
+    def has_fixed_size_fields(self):
+        fields = self.get_all_fields()
+        return bool(fields) and all(field.is_fixed_size() for field in fields)
+
+    # Return true when all fields of this message are trivially copyable, like numbers, enums and messages holding only
+    # those. Such messages use the copy and move operations of the compiler, copying the members at once instead of
+    # setting each field. Messages with a oneof are excluded as the field in the union has to be constructed first.
+    @frozen_value
+    def has_trivially_copyable_fields(self):
+        return (not self.oneofs) and all(field.is_trivially_copyable() for field in self.fields)
+
+    # The fields which deserialize expects in the order in which they are serialized. The tag read from the buffer is
+    # compared with the tag of the next expected field before the general loop over the tags is used.
+    @frozen_value
+    def get_expected_fields(self):
+        return [field for field in self.fields if field.get_wire_type_str()]
+
+    # Return true when this message can be serialized using a table describing its fields, as is done with the
+    # table_driven option. The fields in a oneof share their memory and recursive fields are left out of the class, the
+    # messages containing them use the generated code for each field.
+    @frozen_value
+    def has_field_table(self):
+        return bool(self.fields) and (not self.oneofs) and all(field.get_wire_type_str() for field in self.fields)
+
+    # Return the fields of this message, including the ones in a oneof.
+    @frozen_value
+    def get_all_fields(self):
+        result = list(self.fields)
+        for oneof in self.oneofs:
+            result.extend(oneof.get_fields())
+        return result
+
+    # Return this message and all messages nested in it, in the order in which they are defined.
+    def get_all_messages(self):
+        result = [self]
+        for msg in self.nested_msg_definitions:
+            result.extend(msg.get_all_messages())
+        return result
+
     def register_child_with_template(self, child):
         self.scope.register_template_parameters(child)
         self.contains_template_parameters = True
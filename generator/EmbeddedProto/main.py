@@ -28,28 +28,64 @@
 #   the Netherlands
 #
 
+import argparse
 import io
+import os
 import sys
 from EmbeddedProto.ProtoFile import ProtoFile
+from EmbeddedProto.Daemon import main_daemon
+from EmbeddedProto.DependencyGraph import DependencyGraph
+from EmbeddedProto.GenerationCache import GenerationCache, DEFAULT_MAX_ENTRIES, generator_checksum
+from EmbeddedProto.OutputDirectory import OutputDirectory
+from EmbeddedProto.SymbolTable import SymbolTable
+from EmbeddedProto.TemplateEnvironment import create_environment, get_shared_environment
+from EmbeddedProto.Timings import Timings, NO_TIMINGS
 from google.protobuf.compiler import plugin_pb2 as plugin
+from google.protobuf.descriptor_pb2 import FileDescriptorProto, FileDescriptorSet
+from concurrent.futures import ProcessPoolExecutor
 import jinja2
-from importlib.resources import path as resource_path
+
+
+# Plugin parameters which configure how the code is generated. They do not influence the generated code itself.
+RUNTIME_PARAMETERS = ("cache_dir", "cache_size", "jobs")
+
+
+# -----------------------------------------------------------------------------
+
+def parse_parameters(parameter_str):
+    # Protoc passes the options given with --eams_opt=... or --eams_out=...:dir as a single comma separated string.
+    # Options are either a flag like "only_requested_files" or a key value pair like "key=value". Return them as a
+    # dictionary where flags have the value True. The values "true" and "false" are converted into booleans.
+    parameters = {}
+    for parameter in parameter_str.split(","):
+        parameter = parameter.strip()
+        if not parameter:
+            continue
+        if "=" in parameter:
+            key, value = parameter.split("=", 1)
+            value = value.strip()
+            if value.lower() in ("true", "false"):
+                value = "true" == value.lower()
+            parameters[key.strip()] = value
+        else:
+            parameters[parameter] = True
+    return parameters
 
 
 # -----------------------------------------------------------------------------
 
 
-def generate_code(request, respones):
-    # Create definitions for al proto files in the request except for our own options file which is not required in cpp
-    # code. First also ignore the google descriptor file, only add it later if it is required by the user.
-    file_definitions = []
+def select_proto_files(request):
+    # Select the file descriptors of all proto files in the request except for our own options file which is not
+    # required in cpp code. First also ignore the google descriptor file, only add it later if it is required by the user.
+    proto_files = []
     google_descriptor_file = None
     add_google_descriptor_file = False
     for proto_file in request.proto_file:
         if ("embedded_proto_options.proto" not in proto_file.name) and \
            ("google/protobuf/descriptor.proto" not in proto_file.name):
-            file_definitions.append(ProtoFile(proto_file))
-            if "google/protobuf/descriptor.proto" in file_definitions[-1].descriptor.dependency:
+            proto_files.append(proto_file)
+            if "google/protobuf/descriptor.proto" in proto_file.dependency:
                 add_google_descriptor_file = True
 
         # If we come by the descriptor just store it so we can easily use it when needed.
@@ -60,74 +96,213 @@ def generate_code(request, respones):
     # defined proto files.
     if add_google_descriptor_file and google_descriptor_file:
         # Insert it at the front so the header file will include it before the classes requiring it.
-        file_definitions.insert(0, ProtoFile(google_descriptor_file))
+        proto_files.insert(0, google_descriptor_file)
+
+    return proto_files
+
+
+# -----------------------------------------------------------------------------
+
+def select_files_to_render(request, proto_files, parameters):
+    # By default a header is rendered for every file in the request, including all (transitive) imports. When
+    # only_requested_files is set, only the files protoc asked for are rendered. The imported files are still used
+    # to resolve types and template parameters.
+    if parameters.get("only_requested_files", False):
+        return [proto_file for proto_file in proto_files if proto_file.name in request.file_to_generate]
+    return proto_files
+
+
+# -----------------------------------------------------------------------------
+
+def get_output_parameters(parameters):
+    # The parameters which influence the generated code.
+    return {key: value for key, value in parameters.items() if key not in RUNTIME_PARAMETERS}
+
+
+# -----------------------------------------------------------------------------
+
+def build_file_definitions(proto_files, timings=NO_TIMINGS):
+    # Create definitions for all the given proto files and resolve the types and template parameters used in them.
+    with timings.phase("construct ProtoFile and toposort"):
+        file_definitions = [ProtoFile(proto_file) for proto_file in proto_files]
 
     # Obtain all definitions made in all the files to properly link definitions with fields using them. This to properly
     # create template parameters.
-    all_types_definitions = {"enums": [], "messages": []}
-    for fd in file_definitions:
-        nt = fd.get_all_nested_types()
-        all_types_definitions["enums"].extend(nt["enums"])
-        all_types_definitions["messages"].extend(nt["messages"])
+    with timings.phase("build symbol table"):
+        symbol_table = SymbolTable()
+        for fd in file_definitions:
+            symbol_table.add_file(fd)
 
     # Match all fields with their respective type definition.
-    for fd in file_definitions:
-        fd.match_fields_with_definitions(all_types_definitions)
+    with timings.phase("match_fields_with_definitions"):
+        for fd in file_definitions:
+            fd.match_fields_with_definitions(symbol_table)
 
     # Add template parameters to the fields that need them.
-    all_parameters_registered = True
-    for _ in range(3):
+    with timings.phase("register_template_parameters"):
+        symbol_table.register_template_parameters()
+
+    # From here on the definitions do not change anymore.
+    with timings.phase("freeze"):
         for fd in file_definitions:
-            all_parameters_registered = fd.register_template_parameters() and all_parameters_registered
-        if all_parameters_registered:
-            break
+            fd.freeze()
 
-    if not all_parameters_registered:
-        raise Exception("Messages with repeated, string or byte fields use template parameters to define their length."
-                        "For some reason it was not to add all required template parameters.")
+    return file_definitions
 
-    with resource_path("EmbeddedProto", "templates") as filepath:
-        template_loader = jinja2.FileSystemLoader(searchpath=filepath)
-        template_env = jinja2.Environment(loader=template_loader, trim_blocks=True, lstrip_blocks=True)
 
-    for fd in file_definitions:
-        file_str = fd.render(template_env)
-        if file_str:
-            f = respones.file.add()
-            f.name = fd.filename_with_folder + ".h"
-            f.content = file_str
-        else:
-            break
+# -----------------------------------------------------------------------------
+
+# The state of a worker process used to render files in parallel. Each worker builds the file definitions once, when it
+# renders its first file.
+worker_serialized_proto_files = []
+worker_code_options = None
+worker_file_definitions = None
+worker_template_env = None
+
+
+def init_render_worker(serialized_proto_files, code_options):
+    global worker_serialized_proto_files, worker_code_options
+    worker_serialized_proto_files = serialized_proto_files
+    worker_code_options = code_options
+
+
+def render_in_worker(name):
+    global worker_file_definitions, worker_template_env
+    if worker_file_definitions is None:
+        proto_files = [FileDescriptorProto.FromString(data) for data in worker_serialized_proto_files]
+        worker_file_definitions = {fd.descriptor.name: fd for fd in build_file_definitions(proto_files)}
+        worker_template_env = get_shared_environment()
+    return worker_file_definitions[name].render_outputs(worker_template_env, worker_code_options)
 
 
 # -----------------------------------------------------------------------------
 
-def main_plugin():
-    # The main function when running the scrip as a protoc plugin. It will read in the protoc data from the stdin and
-    # write back the output to stdout.
+def render_files(proto_files, names_to_render, code_options, jobs=1, timings=NO_TIMINGS):
+    # Render the files generated for the proto files named in names_to_render. All proto_files are used to resolve the
+    # types. The code options select how the code is generated, see get_code_options. Returns a dictionary by proto file
+    # name, with for each the rendered content by file extension.
+    names = [proto_file.name for proto_file in proto_files if proto_file.name in names_to_render]
+    rendered = {}
+
+    # When timings are recorded, files are always rendered in this process to be able to measure them.
+    if (1 < jobs) and (1 < len(names)) and not timings.enabled:
+        # Render the files in multiple processes. The descriptors are serialized before the file definitions are made
+        # as creating them can alter the descriptors. Map returns the results in order so the output does not depend on
+        # which worker finishes first.
+        serialized_proto_files = [proto_file.SerializeToString() for proto_file in proto_files]
+        with ProcessPoolExecutor(max_workers=min(jobs, len(names)), initializer=init_render_worker,
+                                 initargs=(serialized_proto_files, code_options)) as executor:
+            for name, outputs in zip(names, executor.map(render_in_worker, names)):
+                rendered[name] = outputs
+    else:
+        file_definitions = build_file_definitions(proto_files, timings)
+        with timings.phase("create template environment"):
+            if timings.enabled:
+                # Instrumenting changes the environment, use a new one.
+                template_env = create_environment()
+                timings.instrument(template_env)
+            else:
+                template_env = get_shared_environment()
 
-    # Create the response object
-    response = plugin.CodeGeneratorResponse()
-    response.supported_features = plugin.CodeGeneratorResponse.FEATURE_PROTO3_OPTIONAL
+        with timings.phase("render"):
+            for fd in file_definitions:
+                if fd.descriptor.name in names_to_render:
+                    with timings.file(fd.descriptor.name):
+                        rendered[fd.descriptor.name] = fd.render_outputs(template_env, code_options)
 
-    # Read request message from stdin
-    data = io.open(sys.stdin.fileno(), "rb").read()
-    request = plugin.CodeGeneratorRequest.FromString(data)
+    return rendered
 
-    # If desired output debug data.
-    if '--debug' in sys.argv:
-        # Write the requests to a file for easy debugging.
-        with open("./debug_embedded_proto.bin", 'wb') as file:
-            file.write(request.SerializeToString())
 
-        from google.protobuf.json_format import MessageToJson
+# -----------------------------------------------------------------------------
 
-        with open("./debug_embedded_proto.json", 'w') as file:
-            file.write(MessageToJson(request))
+def get_code_options(parameters):
+    # The parameters which select how the code for the messages is generated. They are passed on to the templates.
+    # split_source:  Define the member functions of messages without template parameters in a source file.
+    # table_driven:  Serialize and deserialize messages using a table describing their fields and a loop shared by all
+    #                messages instead of generating the code for each field. This results in smaller code.
+    # cache_serialized_size: Store the serialized size of messages until they are changed, instead of serializing them
+    #                each time the size is requested.
+    return {"split_source": bool(parameters.get("split_source", False)),
+            "table_driven": bool(parameters.get("table_driven", False)),
+            "cache_serialized_size": bool(parameters.get("cache_serialized_size", False))}
+
+
+# -----------------------------------------------------------------------------
+
+def get_output_extensions(parameters):
+    # By default only a header is generated for each proto file. With split_source the member functions of messages
+    # without template parameters are defined in a source file.
+    if parameters.get("split_source", False):
+        return [".h", ".cpp"]
+    return [".h"]
+
+
+# -----------------------------------------------------------------------------
+
+def get_number_of_jobs(parameters):
+    # The number of processes used to render files. When set to "auto" one process per cpu is used.
+    jobs = parameters.get("jobs", 1)
+    if "auto" == jobs:
+        return os.cpu_count() or 1
+    return max(1, int(jobs))
+
+
+# -----------------------------------------------------------------------------
+
+def generate_code(request, respones, timings=NO_TIMINGS):
+    parameters = parse_parameters(request.parameter)
+
+    proto_files = select_proto_files(request)
+    files_to_render = select_files_to_render(request, proto_files, parameters)
+    extensions = get_output_extensions(parameters)
+
+    # When a cache folder is given, first try to obtain the generated files from the cache.
+    cache = None
+    cache_keys = {}
+    rendered = {}
+    if "cache_dir" in parameters:
+        cache = GenerationCache(parameters["cache_dir"], int(parameters.get("cache_size", DEFAULT_MAX_ENTRIES)))
+        dependency_graph = DependencyGraph(request.proto_file)
+        output_parameters = get_output_parameters(parameters)
+        for proto_file in files_to_render:
+            cache_keys[proto_file.name] = cache.get_key(dependency_graph, proto_file.name, output_parameters)
+            outputs = cache.get(cache_keys[proto_file.name], extensions)
+            if outputs is not None:
+                rendered[proto_file.name] = outputs
+
+    # Only build the type definitions and render when not all files where found in the cache.
+    missing = {proto_file.name for proto_file in files_to_render if proto_file.name not in rendered}
+    if missing:
+        newly_rendered = render_files(proto_files, missing, get_code_options(parameters),
+                                      get_number_of_jobs(parameters), timings)
+        if cache:
+            for name, outputs in newly_rendered.items():
+                cache.put(cache_keys[name], outputs)
+        rendered.update(newly_rendered)
+
+    if cache:
+        cache.close()
+
+    for proto_file in files_to_render:
+        outputs = rendered[proto_file.name]
+        if outputs[".h"]:
+            for extension in extensions:
+                f = respones.file.add()
+                f.name = os.path.splitext(proto_file.name)[0] + extension
+                f.content = outputs[extension]
+        else:
+            break
+
+
+# -----------------------------------------------------------------------------
+
+def generate_response(request, timings=NO_TIMINGS):
+    # Generate the code for the given request and return the response for protoc. Errors are reported in the response.
+    response = plugin.CodeGeneratorResponse()
+    response.supported_features = plugin.CodeGeneratorResponse.FEATURE_PROTO3_OPTIONAL
 
-    # Generate code
     try:
-        generate_code(request, response)
+        generate_code(request, response, timings)
     except jinja2.UndefinedError as e:
         response.error = "Embedded Proto ERROR - Template Undefined Error exception: " + str(e)
     except jinja2.TemplateRuntimeError as e:
@@ -141,10 +316,49 @@ def main_plugin():
     except Exception as e:
         response.error = "Embedded Proto ERROR - " + str(e)
 
+    return response
+
+
+# -----------------------------------------------------------------------------
+
+def run_plugin(data):
+    # Generate the code for a serialized CodeGeneratorRequest as received from protoc and return the serialized
+    # response.
+
+    # If desired record the time and memory used by the generator.
+    timings = Timings(enabled='--timings' in sys.argv)
+
+    with timings.phase("parse descriptors"):
+        request = plugin.CodeGeneratorRequest.FromString(data)
+
+    # If desired output debug data.
+    if '--debug' in sys.argv:
+        # Write the requests to a file for easy debugging.
+        with open("./debug_embedded_proto.bin", 'wb') as file:
+            file.write(request.SerializeToString())
+
+        from google.protobuf.json_format import MessageToJson
+
+        with open("./debug_embedded_proto.json", 'w') as file:
+            file.write(MessageToJson(request))
+
+    # Generate code
+    response = generate_response(request, timings)
+
+    if timings.enabled:
+        timings.write("./debug_embedded_proto_timings.json")
+
     # Serialize response message
-    output = response.SerializeToString()
+    return response.SerializeToString()
+
+
+# -----------------------------------------------------------------------------
 
-    # Write to stdout
+def main_plugin():
+    # The main function when running the scrip as a protoc plugin. It will read in the protoc data from the stdin and
+    # write back the output to stdout.
+    data = io.open(sys.stdin.fileno(), "rb").read()
+    output = run_plugin(data)
     io.open(sys.stdout.fileno(), "wb").write(output)
 
 
@@ -155,28 +369,17 @@ def main_cli():
     # will read in a binary file stored the previous time main_plugin() is ran.
 
     with open("debug_embedded_proto.bin", 'rb') as file:
-        # Create the response object
-        response = plugin.CodeGeneratorResponse()
-        response.supported_features = plugin.CodeGeneratorResponse.FEATURE_PROTO3_OPTIONAL
+        timings = Timings(enabled='--timings' in sys.argv)
 
         data = file.read()
-        request = plugin.CodeGeneratorRequest.FromString(data)
+        with timings.phase("parse descriptors"):
+            request = plugin.CodeGeneratorRequest.FromString(data)
 
         # Generate code
-        try:
-            generate_code(request, response)
-        except jinja2.UndefinedError as e:
-            response.error = "Embedded Proto ERROR - Template Undefined Error exception: " + str(e)
-        except jinja2.TemplateRuntimeError as e:
-            response.error = "Embedded Proto ERROR - Template Runtime Error exception: " + str(e)
-        except jinja2.TemplateAssertionError as e:
-            response.error = "Embedded Proto ERROR - TemplateAssertionError exception: " + str(e)
-        except jinja2.TemplateSyntaxError as e:
-            response.error = "Embedded Proto ERROR - TemplateSyntaxError exception: " + str(e)
-        except jinja2.TemplateError as e:
-            response.error = "Embedded Proto ERROR - TemplateError exception: " + str(e)
-        except Exception as e:
-            response.error = "Embedded Proto ERROR - " + str(e)
+        response = generate_response(request, timings)
+
+        if timings.enabled:
+            timings.write("./debug_embedded_proto_timings.json")
 
         # For debugging purposes print the result to the console.
         for response_file in response.file:
@@ -186,11 +389,136 @@ def main_cli():
         if response.error:
             print(response.error)
 
+# -----------------------------------------------------------------------------
+
+def build_request_from_descriptor_set(descriptor_set, parameter="", files_to_generate=None):
+    # Create the request protoc would send to the plugin from a file descriptor set made with protoc --descriptor_set_out
+    # and --include_imports. By default code is generated for all files in the set, when files_to_generate are given
+    # only for those.
+    request = plugin.CodeGeneratorRequest()
+    request.proto_file.extend(descriptor_set.file)
+    request.parameter = parameter
+
+    names = [proto_file.name for proto_file in descriptor_set.file]
+    for proto_file in descriptor_set.file:
+        for dependency in proto_file.dependency:
+            if dependency not in names:
+                raise Exception("The file " + dependency + " imported by " + proto_file.name + " is not in the "
+                                "descriptor set. Create the descriptor set with protoc --include_imports.")
+
+    if files_to_generate:
+        for name in files_to_generate:
+            if name not in names:
+                raise Exception("The file " + name + " is not in the descriptor set.")
+        request.file_to_generate.extend(files_to_generate)
+        parameters = parse_parameters(parameter)
+        if not parameters.get("only_requested_files", False):
+            request.parameter = ",".join(filter(None, [parameter, "only_requested_files"]))
+    else:
+        request.file_to_generate.extend(names)
+
+    return request
+
+
+# -----------------------------------------------------------------------------
+
+def main_batch(argv=None):
+    # Generate the headers for all files in a file descriptor set in one run, instead of starting protoc and the plugin
+    # for every proto file. Headers of which the proto file and its imports did not change since the previous run are
+    # skipped. Other headers are only written when their content changed.
+    parser = argparse.ArgumentParser(description="Generate Embedded Proto headers for a file descriptor set created "
+                                                 "with: protoc --include_imports --descriptor_set_out=FILE")
+    parser.add_argument("descriptor_set", help="The file descriptor set.")
+    parser.add_argument("-o", "--out", required=True, help="The folder in which the headers are stored.")
+    parser.add_argument("--opt", default="", help="A comma separated list of options, the same as for --eams_opt.")
+    parser.add_argument("--force", action="store_true", help="Generate all headers, also when their inputs did not "
+                                                             "change.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List the headers which were skipped.")
+    parser.add_argument("--timings", action="store_true",
+                        help="Store the time and memory used in ./debug_embedded_proto_timings.json.")
+    parser.add_argument("files", nargs="*", help="Only generate the headers for these proto files.")
+    args = parser.parse_intermixed_args(argv)
+
+    timings = Timings(enabled=args.timings)
+
+    with open(args.descriptor_set, "rb") as file:
+        data = file.read()
+    with timings.phase("parse descriptors"):
+        descriptor_set = FileDescriptorSet.FromString(data)
+
+    try:
+        request = build_request_from_descriptor_set(descriptor_set, args.opt, args.files)
+    except Exception as e:
+        print("Embedded Proto ERROR - " + str(e), file=sys.stderr)
+        return 1
+
+    # Find the headers of which the inputs changed since the previous run.
+    output = OutputDirectory(args.out)
+    parameters = parse_parameters(request.parameter)
+    dependency_graph = DependencyGraph(request.proto_file)
+    output_parameters = get_output_parameters(parameters)
+    checksum = generator_checksum()
+    extensions = get_output_extensions(parameters)
+    input_digests = {}
+    files_changed = []
+    # The proto files in the set for which no header was requested, for example when only some files are given.
+    kept_sources = {proto_file.name for proto_file in request.proto_file}
+    for proto_file in select_files_to_render(request, select_proto_files(request), parameters):
+        kept_sources.discard(proto_file.name)
+        input_digest = dependency_graph.get_input_digest(proto_file.name, output_parameters, checksum)
+        output_names = [os.path.splitext(proto_file.name)[0] + extension for extension in extensions]
+        for name in output_names:
+            input_digests[name] = input_digest
+        if (not args.force) and all(output.is_up_to_date(name, input_digest) for name in output_names):
+            for name in output_names:
+                output.skip(name)
+        else:
+            files_changed.append(proto_file.name)
+
+    if files_changed:
+        # Only render the changed files, all files in the set are still used to resolve the types.
+        del request.file_to_generate[:]
+        request.file_to_generate.extend(files_changed)
+        if not parameters.get("only_requested_files", False):
+            request.parameter = ",".join(filter(None, [request.parameter, "only_requested_files"]))
+
+        response = generate_response(request, timings)
+
+        if timings.enabled:
+            timings.write("./debug_embedded_proto_timings.json")
+
+        if response.error:
+            print(response.error, file=sys.stderr)
+            return 1
+
+        sources = {os.path.splitext(proto_file.name)[0]: proto_file.name for proto_file in request.proto_file}
+        for response_file in response.file:
+            output.write(response_file.name, response_file.content,
+                         sources.get(os.path.splitext(response_file.name)[0], ""),
+                         input_digests.get(response_file.name, ""))
+
+    removed = output.remove_stale(kept_sources)
+    output.close()
+
+    if args.verbose:
+        for name in output.skipped:
+            print("Skipped " + name)
+    print("Embedded Proto: " + str(output.written) + " headers written, " + str(output.unchanged) + " unchanged, " +
+          str(len(output.skipped)) + " skipped, " + str(len(removed)) + " removed.")
+    return 0
+
+
 # -----------------------------------------------------------------------------
 def main():
     # Check if we are running as a plugin under protoc
     if '--protoc-plugin' in sys.argv:
         main_plugin()
+    elif '--batch' in sys.argv:
+        sys.argv.remove('--batch')
+        sys.exit(main_batch())
+    elif '--daemon' in sys.argv:
+        sys.argv.remove('--daemon')
+        sys.exit(main_daemon())
     else:
         main_cli()
 
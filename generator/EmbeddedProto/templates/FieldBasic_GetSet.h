@@ -35,6 +35,9 @@ inline bool has_{{field.get_name()}}() const
 }
 inline void clear_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} == {{field.get_which_oneof()}})
   {
     {{field.get_which_oneof()}} = FieldNumber::NOT_SET;
@@ -43,6 +46,9 @@ inline void clear_{{field.get_name()}}()
 }
 inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -51,6 +57,9 @@ inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}& value)
 }
 inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}&& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -64,29 +73,41 @@ inline bool has_{{field.get_name()}}() const
 }
 inline void clear_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] &= ~(presence::mask(presence::fields::{{field.get_name().upper()}}));
   {{field.get_variable_name()}}.clear();
 }
 inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] |= presence::mask(presence::fields::{{field.get_name().upper()}});
   {{field.get_variable_name()}} = value;
 }
 inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}&& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] |= presence::mask(presence::fields::{{field.get_name().upper()}});
   {{field.get_variable_name()}} = value;
 }
 inline {{field.get_cstdint_type()}}& mutable_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] |= presence::mask(presence::fields::{{field.get_name().upper()}});
   return {{field.get_variable_name()}}.get();
 }
 {% else %}
-inline void clear_{{field.get_name()}}() { {{field.get_variable_name()}}.clear(); }
-inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}& value) { {{field.get_variable_name()}} = value; }
-inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}&& value) { {{field.get_variable_name()}} = value; }
-inline {{field.get_cstdint_type()}}& mutable_{{field.get_name()}}() { return {{field.get_variable_name()}}.get(); }
+inline void clear_{{field.get_name()}}() { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.clear(); }
+inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}& value) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}} = value; }
+inline void set_{{field.get_name()}}(const {{field.get_cstdint_type()}}&& value) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}} = value; }
+inline {{field.get_cstdint_type()}}& mutable_{{field.get_name()}}() { {{ "invalidate_serialized_size(); " if cache_serialized_size }}return {{field.get_variable_name()}}.get(); }
 {% endif %}
 inline const {{field.get_cstdint_type()}}& get_{{field.get_name()}}() const { return {{field.get_variable_name()}}.get(); }
 inline {{field.get_cstdint_type()}} {{field.get_name()}}() const { return {{field.get_variable_name()}}.get(); }
\ No newline at end of file
@@ -35,6 +35,9 @@ inline bool has_{{field.get_name()}}() const
 }
 inline void clear_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} == {{field.get_which_oneof()}})
   {
     {{field.get_which_oneof()}} = FieldNumber::NOT_SET;
@@ -43,6 +46,9 @@ inline void clear_{{field.get_name()}}()
 }
 inline {{field.get_type()}}& mutable_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -51,6 +57,9 @@ inline {{field.get_type()}}& mutable_{{field.get_name()}}()
 }
 inline void set_{{field.get_name()}}(const {{field.get_type()}}& rhs)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -64,23 +73,32 @@ inline bool has_{{field.get_name()}}() const
 }
 inline void clear_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] &= ~(presence::mask(presence::fields::{{field.get_name().upper()}}));
   {{field.get_variable_name()}}.clear();
 }
 inline {{field.get_type()}}& mutable_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] |= presence::mask(presence::fields::{{field.get_name().upper()}});
   return {{field.get_variable_name()}};
 }
 inline void set_{{field.get_name()}}(const {{field.get_type()}}& rhs)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   presence_[presence::index(presence::fields::{{field.get_name().upper()}})] |= presence::mask(presence::fields::{{field.get_name().upper()}});
   {{field.get_variable_name()}}.set(rhs);
 }
 {% else %}
-inline void clear_{{field.get_name()}}() { {{field.get_variable_name()}}.clear(); }
-inline {{field.get_type()}}& mutable_{{field.get_name()}}() { return {{field.get_variable_name()}}; }
-inline void set_{{field.get_name()}}(const {{field.get_type()}}& rhs) { {{field.get_variable_name()}}.set(rhs); }
+inline void clear_{{field.get_name()}}() { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.clear(); }
+inline {{field.get_type()}}& mutable_{{field.get_name()}}() { {{ "invalidate_serialized_size(); " if cache_serialized_size }}return {{field.get_variable_name()}}; }
+inline void set_{{field.get_name()}}(const {{field.get_type()}}& rhs) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.set(rhs); }
 {% endif %}
 inline const {{field.get_type()}}& get_{{field.get_name()}}() const { return {{field.get_variable_name()}}; }
 inline const uint8_t* {{field.get_name()}}() const { return {{field.get_variable_name()}}.get_const(); }
\ No newline at end of file
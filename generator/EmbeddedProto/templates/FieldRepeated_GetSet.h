@@ -35,6 +35,9 @@ inline bool has_{{field.get_name()}}() const
 }
 inline void clear_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} == {{field.get_which_oneof()}})
   {
     {{field.get_which_oneof}} = FieldNumber::NOT_SET;
@@ -43,6 +46,9 @@ inline void clear_{{field.get_name()}}()
 }
 inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_type()}}& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -51,6 +57,9 @@ inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_type()}}&
 }
 inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_type()}}&& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -59,6 +68,9 @@ inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_type()}}&
 }
 inline void set_{{field.get_name()}}(const {{field.repeated_type}}& values)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -67,6 +79,9 @@ inline void set_{{field.get_name()}}(const {{field.repeated_type}}& values)
 }
 inline void add_{{field.get_name()}}(const {{field.get_type()}}& value)
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -75,6 +90,9 @@ inline void add_{{field.get_name()}}(const {{field.get_type()}}& value)
 }
 inline {{field.repeated_type}}& mutable_{{field.get_name()}}()
 {
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
   if(FieldNumber::{{field.get_variable_id_name()}} != {{field.get_which_oneof()}})
   {
     init_{{field.get_oneof_name()}}(FieldNumber::{{field.get_variable_id_name()}});
@@ -83,13 +101,13 @@ inline {{field.repeated_type}}& mutable_{{field.get_name()}}()
 }
 {% else %}
 inline const {{field.get_base_type()}}& {{field.get_name()}}(uint32_t index) const { return {{field.get_variable_name()}}[index]; }
-inline void clear_{{field.get_name()}}() { {{field.get_variable_name()}}.clear(); }
-inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_base_type()}}& value) { {{field.get_variable_name()}}.set(index, value); }
-inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_base_type()}}&& value) { {{field.get_variable_name()}}.set(index, value); }
-inline void set_{{field.get_name()}}(const {{field.get_type()}}& values) { {{field.get_variable_name()}} = values; }
-inline void add_{{field.get_name()}}(const {{field.get_base_type()}}& value) { {{field.get_variable_name()}}.add(value); }
-inline {{field.get_type()}}& mutable_{{field.get_name()}}() { return {{field.get_variable_name()}}; }
-inline {{field.get_base_type()}}& mutable_{{field.get_name()}}(uint32_t index) { return {{field.get_variable_name()}}[index]; }
+inline void clear_{{field.get_name()}}() { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.clear(); }
+inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_base_type()}}& value) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.set(index, value); }
+inline void set_{{field.get_name()}}(uint32_t index, const {{field.get_base_type()}}&& value) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.set(index, value); }
+inline void set_{{field.get_name()}}(const {{field.get_type()}}& values) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}} = values; }
+inline void add_{{field.get_name()}}(const {{field.get_base_type()}}& value) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}{{field.get_variable_name()}}.add(value); }
+inline {{field.get_type()}}& mutable_{{field.get_name()}}() { {{ "invalidate_serialized_size(); " if cache_serialized_size }}return {{field.get_variable_name()}}; }
+inline {{field.get_base_type()}}& mutable_{{field.get_name()}}(uint32_t index) { {{ "invalidate_serialized_size(); " if cache_serialized_size }}return {{field.get_variable_name()}}[index]; }
 {% endif %}
 inline const {{field.get_type()}}& get_{{field.get_name()}}() const { return {{field.get_variable_name()}}; }
 inline const {{field.get_type()}}& {{field.get_name()}}() const { return {{field.get_variable_name()}}; }
@@ -29,5 +29,5 @@ Postal address:
 #}
 if(::EmbeddedProto::Error::NO_ERRORS == return_value)
 {
-  return_value = {{field.get_variable_name()}}.serialize_with_id(static_cast<uint32_t>(FieldNumber::{{field.get_variable_id_name()}}), buffer, {{ "true" if (field.optional or (field.oneof is not none))  else "false" }});
+  return_value = {{field.get_variable_name()}}.serialize_with_tag(FieldTag::{{field.get_variable_id_name()}}::DATA, FieldTag::{{field.get_variable_id_name()}}::SIZE, buffer, {{ "true" if (field.optional or (field.oneof is not none))  else "false" }});
 }
\ No newline at end of file
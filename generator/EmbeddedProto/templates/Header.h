@@ -48,6 +48,7 @@
 #include <Errors.h>
 #include <Defines.h>
 #include <limits>
+#include <utility>
 
 {% endif %}
 {% if proto_file.get_dependencies() is defined %}
@@ -66,7 +67,7 @@ namespace {{ namespace }} {
 
 {% endfor %}
 {% for msg in proto_file.msg_definitions %}
-{{ msg.render(environment) }}
+{{ msg.render(environment, options) }}
 
 {% endfor %}
 {% for namespace in proto_file.get_namespaces()|reverse %}
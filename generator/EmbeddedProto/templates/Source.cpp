@@ -0,0 +1,99 @@
+{#
+Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+
+This file is part of Embedded Proto.
+
+Embedded Proto is open source software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, version 3 of the license.
+
+Embedded Proto  is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+
+For commercial and closed source application please visit:
+<https://EmbeddedProto.com/license/>.
+
+Embedded AMS B.V.
+Info:
+  info at EmbeddedProto dot com
+
+Postal address:
+  Atoomweg 2
+  1627 LE, Hoorn
+  the Netherlands
+#}
+{% import 'TypeDefMsg_Methods.h' as Methods %}
+/*
+ *  This file is generated with Embedded Proto, PLEASE DO NOT EDIT!
+ *  source: {{proto_file.descriptor.name}}
+ */
+
+// This file is generated. Please do not edit!
+#include "{{proto_file.filename_with_folder}}.h"
+
+{% for namespace in proto_file.get_namespaces() %}
+namespace {{ namespace }} {
+{% endfor %}
+
+{% for msg in proto_file.get_source_definitions() %}
+{% set class_name = proto_file.get_class_name(msg) %}
+{% set cache_serialized_size = options.cache_serialized_size and not msg.has_fixed_size_fields() %}
+{% if not msg.has_trivially_copyable_fields() %}
+{{ class_name }}::{{ msg.get_name() }}(const {{ msg.get_name() }}& rhs )
+{{ Methods.copy(msg) }}
+
+{{ class_name }}::{{ msg.get_name() }}({{ msg.get_name() }}&& rhs ) noexcept
+{{ Methods.move(msg) }}
+
+{{ class_name }}& {{ class_name }}::operator=(const {{ class_name }}& rhs)
+{{ Methods.assign(msg, cache_serialized_size) }}
+
+{{ class_name }}& {{ class_name }}::operator=({{ class_name }}&& rhs) noexcept
+{{ Methods.move_assign(msg, cache_serialized_size) }}
+
+{% endif %}
+{% if options.table_driven and msg.has_field_table() %}
+::EmbeddedProto::Error {{ class_name }}::serialize(::EmbeddedProto::WriteBufferInterface& buffer) const
+{{ Methods.serialize_table(msg) }}
+
+::EmbeddedProto::Error {{ class_name }}::deserialize(::EmbeddedProto::ReadBufferInterface& buffer)
+{{ Methods.deserialize_table(msg, cache_serialized_size) }}
+{% else %}
+::EmbeddedProto::Error {{ class_name }}::serialize(::EmbeddedProto::WriteBufferInterface& buffer) const
+{{ Methods.serialize_interface() }}
+
+::EmbeddedProto::Error {{ class_name }}::deserialize(::EmbeddedProto::ReadBufferInterface& buffer)
+{{ Methods.deserialize_interface() }}
+{% endif %}
+
+void {{ class_name }}::clear()
+{{ Methods.clear(msg, cache_serialized_size) }}
+{% if msg.has_fixed_size_fields() %}
+
+uint32_t {{ class_name }}::calculate_serialized_size() const
+{{ Methods.calculate_serialized_size(msg) }}
+{% endif %}
+
+#ifndef DISABLE_FIELD_NUMBER_TO_NAME
+
+char const* {{ class_name }}::field_number_to_name(const FieldNumber fieldNumber)
+{{ Methods.field_number_to_name(msg) }}
+
+#endif
+
+#ifdef MSG_TO_STRING
+
+::EmbeddedProto::string_view {{ class_name }}::to_string(::EmbeddedProto::string_view& str, const uint32_t indent_level, char const* name, const bool first_field) const
+{{ Methods.to_string(msg) }}
+
+#endif // End of MSG_TO_STRING
+
+{% endfor %}
+{% for namespace in proto_file.get_namespaces()|reverse %}
+} // End of namespace {{ namespace }}
+{% endfor %}
@@ -28,6 +28,17 @@ Postal address:
   the Netherlands
 #}
 {% import 'TypeOneof.h' as TypeOneof %}
+{% import 'TypeDefMsg_Methods.h' as Methods %}
+{# When split_source is used, the larger member functions of messages without template parameters are only declared
+   here. They are defined in the source file. #}
+{% set in_source = options.split_source and not typedef.is_templated() %}
+{# With table_driven, the fields are serialized by a loop shared by all messages using a table describing them. #}
+{% set table_driven = options.table_driven and typedef.has_field_table() %}
+{# With cache_serialized_size, the serialized size is stored until the message is changed. Messages with only fixed
+   size fields calculate their size from the fields directly and do not need this. #}
+{% set cache_serialized_size = options.cache_serialized_size and not typedef.has_fixed_size_fields() %}
+{# Messages with only trivially copyable fields are copied and moved memberwise by the operations of the compiler. #}
+{% set trivially_copyable = typedef.has_trivially_copyable_fields() %}
 {% for tmpl_param in typedef.get_templates() %}
 {{"template<\n" if loop.first}}    {{tmpl_param['type']}} {{tmpl_param['name']}}{{", " if not loop.last}}{{"\n>" if loop.last}}
 {% endfor %}
@@ -35,49 +46,19 @@ class {{ typedef.get_name() }} final: public ::EmbeddedProto::MessageInterface
 {
   public:
     {{ typedef.get_name() }}() = default;
+    {% if trivially_copyable %}
+    {{ typedef.get_name() }}(const {{typedef.get_name()}}& rhs ) = default;
+    {{ typedef.get_name() }}({{typedef.get_name()}}&& rhs ) noexcept = default;
+    {% elif in_source %}
+    {{ typedef.get_name() }}(const {{typedef.get_name()}}& rhs );
+    {{ typedef.get_name() }}({{typedef.get_name()}}&& rhs ) noexcept;
+    {% else %}
     {{ typedef.get_name() }}(const {{typedef.get_name()}}& rhs )
-    {
-      {% for field in typedef.fields %}
-      {% if typedef.optional_fields is defined and field in typedef.optional_fields %}
-      if(rhs.has_{{field.get_name()}}())
-      {
-        set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      }
-      else
-      {
-        clear_{{ field.get_name() }}();
-      }
-
-      {% else %}
-      set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      {% endif %}
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      {{ TypeOneof.assign(oneof)|indent(6) }}
-      {% endfor %}
-    }
-
-    {{ typedef.get_name() }}(const {{typedef.get_name()}}&& rhs ) noexcept
-    {
-      {% for field in typedef.fields %}
-      {% if typedef.optional_fields is defined and field in typedef.optional_fields %}
-      if(rhs.has_{{field.get_name()}}())
-      {
-        set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      }
-      else
-      {
-        clear_{{ field.get_name() }}();
-      }
+    {{ Methods.copy(typedef)|indent(4) }}
 
-      {% else %}
-      set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      {% endif %}
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      {{ TypeOneof.assign(oneof)|indent(6) }}
-      {% endfor %}
-    }
+    {{ typedef.get_name() }}({{typedef.get_name()}}&& rhs ) noexcept
+    {{ Methods.move(typedef)|indent(4) }}
+    {% endif %}
 
     ~{{ typedef.get_name() }}() override = default;
 
@@ -86,7 +67,7 @@ class {{ typedef.get_name() }} final: public ::EmbeddedProto::MessageInterface
 
     {% endfor %}
     {% for msg in typedef.nested_msg_definitions %}
-    {{ msg.render(environment)|indent(4) }}
+    {{ msg.render(environment, options)|indent(4) }}
 
     {% endfor %}
     enum class FieldNumber : uint32_t
@@ -97,180 +78,105 @@ class {{ typedef.get_name() }} final: public ::EmbeddedProto::MessageInterface
       {% endfor %}
     };
 
+    {% if typedef.get_max_serialized_size() is not none %}
+    // The maximum number of bytes this message takes when serialized.
+    static constexpr uint32_t MAX_SERIALIZED_SIZE = {{typedef.get_max_serialized_size()}};
+
+    {% endif %}
+    {% if trivially_copyable %}
+    {{ typedef.name }}& operator=(const {{ typedef.name }}& rhs) = default;
+    {{ typedef.name }}& operator=({{ typedef.name }}&& rhs) noexcept = default;
+    {% elif in_source %}
+    {{ typedef.name }}& operator=(const {{ typedef.name }}& rhs);
+    {{ typedef.name }}& operator=({{ typedef.name }}&& rhs) noexcept;
+    {% else %}
     {{ typedef.name }}& operator=(const {{ typedef.name }}& rhs)
-    {
-      {% for field in typedef.fields %}
-      {% if typedef.optional_fields is defined and field in typedef.optional_fields %}
-      if(rhs.has_{{field.get_name()}}())
-      {
-        set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      }
-      else
-      {
-        clear_{{ field.get_name() }}();
-      }
-
-      {% else %}
-      set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      {% endif %}
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      {{ TypeOneof.assign(oneof)|indent(6) }}
-      {% endfor %}
-      return *this;
-    }
+    {{ Methods.assign(typedef, cache_serialized_size)|indent(4) }}
 
-    {{ typedef.name }}& operator=(const {{ typedef.name }}&& rhs) noexcept
-    {
-      {% for field in typedef.fields %}
-      {% if typedef.optional_fields is defined and field in typedef.optional_fields %}
-      if(rhs.has_{{field.get_name()}}())
-      {
-        set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      }
-      else
-      {
-        clear_{{ field.get_name() }}();
-      }
-      
-      {% else %}
-      set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
-      {% endif %}
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      {{ TypeOneof.assign(oneof)|indent(6) }}
-      {% endfor %}
-      return *this;
-    }
+    {{ typedef.name }}& operator=({{ typedef.name }}&& rhs) noexcept
+    {{ Methods.move_assign(typedef, cache_serialized_size)|indent(4) }}
+    {% endif %}
 
     {% for field in typedef.fields %}
-    {{ field.render_get_set(environment)|indent(4) }}
+    {{ field.render_get_set(environment, cache_serialized_size)|indent(4) }}
 
     {% endfor %}
     {% for oneof in typedef.oneofs %}
     FieldNumber get_which_{{oneof.get_name()}}() const { return {{oneof.get_which_oneof()}}; }
 
     {% for field in oneof.fields %}
-    {{ field.render_get_set(environment)|indent(4) }}
+    {{ field.render_get_set(environment, cache_serialized_size)|indent(4) }}
 
     {% endfor %}
     {% endfor %}
 
-    ::EmbeddedProto::Error serialize(::EmbeddedProto::WriteBufferInterface& buffer) const override
-    {
-      ::EmbeddedProto::Error return_value = ::EmbeddedProto::Error::NO_ERRORS;
-
-      {% for field in typedef.fields %}
-      {{ field.render_serialize(environment)|indent(6) }}
-
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      switch({{oneof.get_which_oneof()}})
-      {
-        {% for field in oneof.get_fields() %}
-        case FieldNumber::{{field.variable_id_name}}:
-          {{ field.render_serialize(environment)|indent(10) }}
-          break;
-
-        {% endfor %}
-        default:
-          break;
-      }
-
-      {% endfor %}
-      return return_value;
-    };
-
-    ::EmbeddedProto::Error deserialize(::EmbeddedProto::ReadBufferInterface& buffer) override
-    {
-      ::EmbeddedProto::Error return_value = ::EmbeddedProto::Error::NO_ERRORS;
-      ::EmbeddedProto::WireFormatter::WireType wire_type = ::EmbeddedProto::WireFormatter::WireType::VARINT;
-      uint32_t id_number = 0;
-      FieldNumber id_tag = FieldNumber::NOT_SET;
+    {% if not table_driven %}
+    // Serialize and deserialize the message using a given type of buffer. Calling them with a buffer class which is
+    // final, like WriteBufferFixedSize, avoids the virtual function calls of the buffer interface.
+    template<class BUFFER_TYPE>
+    ::EmbeddedProto::Error serialize(BUFFER_TYPE& buffer) const
+    {{ Methods.serialize(typedef, environment)|indent(4) }};
 
-      ::EmbeddedProto::Error tag_value = ::EmbeddedProto::WireFormatter::DeserializeTag(buffer, wire_type, id_number);
-      while((::EmbeddedProto::Error::NO_ERRORS == return_value) && (::EmbeddedProto::Error::NO_ERRORS == tag_value))
-      {
-        id_tag = static_cast<FieldNumber>(id_number);
-        switch(id_tag)
-        {
-          {% for field in typedef.fields %}
-          case FieldNumber::{{field.get_variable_id_name()}}:
-            {{ field.render_deserialize(environment)|indent(12) }}
-            break;
+    template<class BUFFER_TYPE>
+    ::EmbeddedProto::Error deserialize(BUFFER_TYPE& buffer)
+    {{ Methods.deserialize(typedef, environment, cache_serialized_size)|indent(4) }};
 
-          {% endfor %}
-          {% for oneof in typedef.oneofs %}
-          {% for field in oneof.get_fields() %}
-          case FieldNumber::{{field.get_variable_id_name()}}:
-          {% endfor %}
-            return_value = deserialize_{{oneof.get_name()}}(id_tag, buffer, wire_type);
-            break;
+    {% endif %}
+    {% if in_source %}
+    ::EmbeddedProto::Error serialize(::EmbeddedProto::WriteBufferInterface& buffer) const override;
 
-          {% endfor %}
-          case FieldNumber::NOT_SET:
-            return_value = ::EmbeddedProto::Error::INVALID_FIELD_ID;
-            break;
+    ::EmbeddedProto::Error deserialize(::EmbeddedProto::ReadBufferInterface& buffer) override;
 
-          default:
-            return_value = skip_unknown_field(buffer, wire_type);
-            break;
-        }
+    void clear() override;
+    {% if typedef.has_fixed_size_fields() %}
 
-        if(::EmbeddedProto::Error::NO_ERRORS == return_value)
-        {
-          // Read the next tag.
-          tag_value = ::EmbeddedProto::WireFormatter::DeserializeTag(buffer, wire_type, id_number);
-        }
-      }
+    uint32_t calculate_serialized_size() const override;
+    {% endif %}
+    {% else %}
+    {% if table_driven %}
+    ::EmbeddedProto::Error serialize(::EmbeddedProto::WriteBufferInterface& buffer) const override
+    {{ Methods.serialize_table(typedef)|indent(4) }}
 
-      // When an error was detect while reading the tag but no other errors where found, set it in the return value.
-      if((::EmbeddedProto::Error::NO_ERRORS == return_value)
-         && (::EmbeddedProto::Error::NO_ERRORS != tag_value)
-         && (::EmbeddedProto::Error::END_OF_BUFFER != tag_value)) // The end of the buffer is not an array in this case.
-      {
-        return_value = tag_value;
-      }
+    ::EmbeddedProto::Error deserialize(::EmbeddedProto::ReadBufferInterface& buffer) override
+    {{ Methods.deserialize_table(typedef, cache_serialized_size)|indent(4) }}
+    {% else %}
+    ::EmbeddedProto::Error serialize(::EmbeddedProto::WriteBufferInterface& buffer) const override
+    {{ Methods.serialize_interface()|indent(4) }}
 
-      return return_value;
-    };
+    ::EmbeddedProto::Error deserialize(::EmbeddedProto::ReadBufferInterface& buffer) override
+    {{ Methods.deserialize_interface()|indent(4) }}
+    {% endif %}
 
     void clear() override
+    {{ Methods.clear(typedef, cache_serialized_size)|indent(4) }}
+    {% if typedef.has_fixed_size_fields() %}
+
+    uint32_t calculate_serialized_size() const override
+    {{ Methods.calculate_serialized_size(typedef)|indent(4) }}
+    {% endif %}
+    {% endif %}
+    {% if cache_serialized_size %}
+
+    // The size is calculated by serializing the message once and stored until the message is changed. The length in
+    // front of a nested message is always calculated again, see calculate_serialized_size().
+    uint32_t serialized_size() const override
     {
-      {% for field in typedef.fields %}
-      clear_{{field.get_name()}}();
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      clear_{{oneof.get_name()}}();
-      {% endfor %}
-
+      if(SERIALIZED_SIZE_UNKNOWN == serialized_size_cache_)
+      {
+        serialized_size_cache_ = calculate_serialized_size();
+      }
+      return serialized_size_cache_;
     }
+    {% endif %}
 
 #ifndef DISABLE_FIELD_NUMBER_TO_NAME 
 
+    {% if in_source %}
+    static char const* field_number_to_name(const FieldNumber fieldNumber);
+    {% else %}
     static char const* field_number_to_name(const FieldNumber fieldNumber)
-    {
-      char const* name = nullptr;
-      switch(fieldNumber)
-      {
-        {% for field in typedef.fields %}
-        case FieldNumber::{{field.get_variable_id_name()}}:
-          name = {{field.get_name()|upper}}_NAME;
-          break;
-        {% endfor %}
-        {% for oneof in typedef.oneofs %}
-        {% for field in oneof.fields %}
-        case FieldNumber::{{field.get_variable_id_name()}}:
-          name = {{field.get_name()|upper}}_NAME;
-          break;
-        {% endfor %}
-        {% endfor %}
-        default:
-          name = "Invalid FieldNumber";
-          break;
-      }
-      return name;
-    }
+    {{ Methods.field_number_to_name(typedef)|indent(4) }}
+    {% endif %}
 
 #endif
 
@@ -281,82 +187,43 @@ class {{ typedef.get_name() }} final: public ::EmbeddedProto::MessageInterface
       return this->to_string(str, 0, nullptr, true);
     }
 
+    {% if in_source %}
+    ::EmbeddedProto::string_view to_string(::EmbeddedProto::string_view& str, const uint32_t indent_level, char const* name, const bool first_field) const override;
+    {% else %}
     ::EmbeddedProto::string_view to_string(::EmbeddedProto::string_view& str, const uint32_t indent_level, char const* name, const bool first_field) const override
-    {
-      ::EmbeddedProto::string_view left_chars = str;
-      int32_t n_chars_used = 0;
+    {{ Methods.to_string(typedef)|indent(4) }}
+    {% endif %}
 
-      if(!first_field)
-      {
-        // Add a comma behind the previous field.
-        n_chars_used = snprintf(left_chars.data, left_chars.size, ",\n");
-        if(0 < n_chars_used)
-        {
-          // Update the character pointer and characters left in the array.
-          left_chars.data += n_chars_used;
-          left_chars.size -= n_chars_used;
-        }
-      }
+#endif // End of MSG_TO_STRING
 
-      if(nullptr != name)
-      {
-        if( 0 == indent_level)
-        {
-          n_chars_used = snprintf(left_chars.data, left_chars.size, "\"%s\": {\n", name);
-        }
-        else
-        {
-          n_chars_used = snprintf(left_chars.data, left_chars.size, "%*s\"%s\": {\n", indent_level, " ", name);
-        }
-      }
-      else
-      {
-        if( 0 == indent_level)
-        {
-          n_chars_used = snprintf(left_chars.data, left_chars.size, "{\n");
-        }
-        else
-        {
-          n_chars_used = snprintf(left_chars.data, left_chars.size, "%*s{\n", indent_level, " ");
-        }
-      }
-      
-      if(0 < n_chars_used)
-      {
-        left_chars.data += n_chars_used;
-        left_chars.size -= n_chars_used;
-      }
+  private:
 
-      {% for field in typedef.fields %}
-      {%if "FieldErrorRecursive" != field.descriptor.type_name %}{# Test if this is an FieldErrorRecursive #}
-      left_chars = {{field.get_variable_name()}}.to_string(left_chars, indent_level + 2, {{field.get_name()|upper}}_NAME, {{ loop.first|lower }});
-      {% endif %}
-      {% endfor %}
-      {% for oneof in typedef.oneofs %}
-      left_chars = to_string_{{oneof.get_name()}}(left_chars, indent_level + 2, {{((typedef.fields|length == 0) and loop.first)|lower }});
-      {% endfor %}  
-      if( 0 == indent_level) 
-      {
-        n_chars_used = snprintf(left_chars.data, left_chars.size, "\n}");
-      }
-      else 
-      {
-        n_chars_used = snprintf(left_chars.data, left_chars.size, "\n%*s}", indent_level, " ");
-      }
+      {% if table_driven %}
+      // The fields of this message as used to serialize and deserialize it.
+      static const ::EmbeddedProto::FieldTableEntry* field_table()
+      {{ Methods.field_table(typedef)|indent(6) }}
 
-      if(0 < n_chars_used)
+      {% elif typedef.get_all_fields() %}
+      // The tags of the fields, encoded as varints by the generator. They are pushed into the buffer at once.
+      struct FieldTag
       {
-        left_chars.data += n_chars_used;
-        left_chars.size -= n_chars_used;
-      }
+        {% for field in typedef.get_all_fields() if field.get_wire_type_str() %}
+        using {{field.get_variable_id_name()}} = {{field.get_tag_type()}};
+        {% endfor %}
+      };
 
-      return left_chars;
-    }
+      {% endif %}
+      {% if cache_serialized_size %}
+      // The value of serialized_size_cache_ when the size has to be calculated again.
+      static constexpr uint32_t SERIALIZED_SIZE_UNKNOWN = std::numeric_limits<uint32_t>::max();
 
-#endif // End of MSG_TO_STRING
+      // The size of the message when serialized, stored by serialized_size().
+      mutable uint32_t serialized_size_cache_ = SERIALIZED_SIZE_UNKNOWN;
 
-  private:
+      // Called by all functions changing the message.
+      void invalidate_serialized_size() { serialized_size_cache_ = SERIALIZED_SIZE_UNKNOWN; }
 
+      {% endif %}
       {% if typedef.optional_fields is defined and typedef.optional_fields|length > 0 %}
       // Define constants for tracking the presence of fields.
       // Use a struct to scope the variables from user fields as namespaces are not allowed within classes.
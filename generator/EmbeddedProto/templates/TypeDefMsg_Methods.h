@@ -0,0 +1,442 @@
+{#
+Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+
+This file is part of Embedded Proto.
+
+Embedded Proto is open source software: you can redistribute it and/or
+modify it under the terms of the GNU General Public License as published
+by the Free Software Foundation, version 3 of the license.
+
+Embedded Proto  is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+
+For commercial and closed source application please visit:
+<https://EmbeddedProto.com/license/>.
+
+Embedded AMS B.V.
+Info:
+  info at EmbeddedProto dot com
+
+Postal address:
+  Atoomweg 2
+  1627 LE, Hoorn
+  the Netherlands
+#}
+{# The bodies of the larger member functions of a message. They are rendered inside the class in the header or, for
+   messages without template parameters when split_source is used, in the source file. #}
+{% import 'TypeOneof.h' as TypeOneof %}
+{% macro copy(typedef) %}
+{
+  {% for field in typedef.fields %}
+  {% if typedef.optional_fields is defined and field in typedef.optional_fields %}
+  if(rhs.has_{{field.get_name()}}())
+  {
+    set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
+  }
+  else
+  {
+    clear_{{ field.get_name() }}();
+  }
+
+  {% else %}
+  set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
+  {% endif %}
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  {{ TypeOneof.assign(oneof)|indent(2) }}
+  {% endfor %}
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro assign(typedef, cache_serialized_size=False) %}
+{
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
+  {% for field in typedef.fields %}
+  {% if typedef.optional_fields is defined and field in typedef.optional_fields %}
+  if(rhs.has_{{field.get_name()}}())
+  {
+    set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
+  }
+  else
+  {
+    clear_{{ field.get_name() }}();
+  }
+
+  {% else %}
+  set_{{ field.get_name() }}(rhs.get_{{ field.get_name() }}());
+  {% endif %}
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  {{ TypeOneof.assign(oneof)|indent(2) }}
+  {% endfor %}
+  return *this;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro move(typedef) %}
+{
+  {% if typedef.optional_fields is defined and typedef.optional_fields|length > 0 %}
+  for(uint32_t i = 0; i < presence::SIZE; ++i)
+  {
+    presence_[i] = rhs.presence_[i];
+  }
+
+  {% endif %}
+  {# Fields without a wire type are left out of the class, like recursive ones. #}
+  {% for field in typedef.fields if field.get_wire_type_str() %}
+  {{ field.get_variable_name() }} = std::move(rhs.{{ field.get_variable_name() }});
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  {{ TypeOneof.move(oneof)|indent(2) }}
+  {% endfor %}
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro move_assign(typedef, cache_serialized_size=False) %}
+{
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
+  {% if typedef.optional_fields is defined and typedef.optional_fields|length > 0 %}
+  for(uint32_t i = 0; i < presence::SIZE; ++i)
+  {
+    presence_[i] = rhs.presence_[i];
+  }
+
+  {% endif %}
+  {# Fields without a wire type are left out of the class, like recursive ones. #}
+  {% for field in typedef.fields if field.get_wire_type_str() %}
+  {{ field.get_variable_name() }} = std::move(rhs.{{ field.get_variable_name() }});
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  {{ TypeOneof.move(oneof)|indent(2) }}
+  {% endfor %}
+  return *this;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro serialize(typedef, environment) %}
+{
+  ::EmbeddedProto::Error return_value = ::EmbeddedProto::Error::NO_ERRORS;
+
+  {% for field in typedef.fields %}
+  {{ field.render_serialize(environment)|indent(2) }}
+
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  switch({{oneof.get_which_oneof()}})
+  {
+    {% for field in oneof.get_fields() %}
+    case FieldNumber::{{field.variable_id_name}}:
+      {{ field.render_serialize(environment)|indent(6) }}
+      break;
+
+    {% endfor %}
+    default:
+      break;
+  }
+
+  {% endfor %}
+  return return_value;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro deserialize(typedef, environment, cache_serialized_size=False) %}
+{
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
+  ::EmbeddedProto::Error return_value = ::EmbeddedProto::Error::NO_ERRORS;
+  ::EmbeddedProto::WireFormatter::WireType wire_type = ::EmbeddedProto::WireFormatter::WireType::VARINT;
+  uint32_t id_number = 0;
+  FieldNumber id_tag = FieldNumber::NOT_SET;
+
+  {% if typedef.get_expected_fields() %}
+  // Fields usually arrive in the order in which they are serialized. The tag read from the buffer is first compared
+  // with the tag of the next expected field. The loop below handles the fields not found in this way.
+  uint32_t tag = 0;
+  ::EmbeddedProto::Error tag_value = ::EmbeddedProto::WireFormatter::DeserializeVarint(buffer, tag);
+  {% for field in typedef.get_expected_fields() %}
+  {{ "while" if "repeated" == field.get_field_type() else "if" }}((::EmbeddedProto::Error::NO_ERRORS == return_value) && (::EmbeddedProto::Error::NO_ERRORS == tag_value)
+     && (::EmbeddedProto::WireFormatter::MakeTag(static_cast<uint32_t>(FieldNumber::{{field.get_variable_id_name()}}), ::EmbeddedProto::WireFormatter::WireType::{{field.get_wire_type_str()}}) == tag))
+  {
+    wire_type = ::EmbeddedProto::WireFormatter::WireType::{{field.get_wire_type_str()}};
+    {{ field.render_deserialize(environment)|indent(4) }}
+    if(::EmbeddedProto::Error::NO_ERRORS == return_value)
+    {
+      tag_value = ::EmbeddedProto::WireFormatter::DeserializeVarint(buffer, tag);
+    }
+  }
+
+  {% endfor %}
+  if(::EmbeddedProto::Error::NO_ERRORS == tag_value)
+  {
+    tag_value = ::EmbeddedProto::WireFormatter::DecodeTag(tag, wire_type, id_number);
+  }
+  {% else %}
+  ::EmbeddedProto::Error tag_value = ::EmbeddedProto::WireFormatter::DeserializeTag(buffer, wire_type, id_number);
+  {% endif %}
+  while((::EmbeddedProto::Error::NO_ERRORS == return_value) && (::EmbeddedProto::Error::NO_ERRORS == tag_value))
+  {
+    id_tag = static_cast<FieldNumber>(id_number);
+    switch(id_tag)
+    {
+      {% for field in typedef.fields %}
+      case FieldNumber::{{field.get_variable_id_name()}}:
+        {{ field.render_deserialize(environment)|indent(8) }}
+        break;
+
+      {% endfor %}
+      {% for oneof in typedef.oneofs %}
+      {% for field in oneof.get_fields() %}
+      case FieldNumber::{{field.get_variable_id_name()}}:
+      {% endfor %}
+        return_value = deserialize_{{oneof.get_name()}}(id_tag, buffer, wire_type);
+        break;
+
+      {% endfor %}
+      case FieldNumber::NOT_SET:
+        return_value = ::EmbeddedProto::Error::INVALID_FIELD_ID;
+        break;
+
+      default:
+        return_value = skip_unknown_field(buffer, wire_type);
+        break;
+    }
+
+    if(::EmbeddedProto::Error::NO_ERRORS == return_value)
+    {
+      // Read the next tag.
+      tag_value = ::EmbeddedProto::WireFormatter::DeserializeTag(buffer, wire_type, id_number);
+    }
+  }
+
+  // When an error was detect while reading the tag but no other errors where found, set it in the return value.
+  if((::EmbeddedProto::Error::NO_ERRORS == return_value)
+     && (::EmbeddedProto::Error::NO_ERRORS != tag_value)
+     && (::EmbeddedProto::Error::END_OF_BUFFER != tag_value)) // The end of the buffer is not an array in this case.
+  {
+    return_value = tag_value;
+  }
+
+  return return_value;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{# The virtual functions of the message use the template functions with the buffer interface as type. #}
+{% macro serialize_interface() %}
+{
+  return serialize<::EmbeddedProto::WriteBufferInterface>(buffer);
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro deserialize_interface() %}
+{
+  return deserialize<::EmbeddedProto::ReadBufferInterface>(buffer);
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{# With the table_driven option, messages are serialized and deserialized by a loop in MessageInterface using the table
+   of their fields. #}
+{% macro serialize_table(typedef) %}
+{
+  return serialize_table(field_table(), {{typedef.fields|length}}, {{ "presence_" if typedef.optional_fields else "nullptr" }}, buffer);
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro deserialize_table(typedef, cache_serialized_size=False) %}
+{
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
+  return deserialize_table(field_table(), {{typedef.fields|length}}, {{ "presence_" if typedef.optional_fields else "nullptr" }}, buffer);
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{# The entries are in the order in which the fields are serialized. offsetof is used on the message class which is not a
+   standard layout type. This is supported by the compilers but they warn about it. #}
+{% macro field_table(typedef) %}
+{
+#if defined(__GNUC__)
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Winvalid-offsetof"
+#endif
+  static constexpr ::EmbeddedProto::FieldTableEntry TABLE[] = {
+    {% for field in typedef.fields %}
+    { {{field.variable_id}}, static_cast<uint32_t>(offsetof({{typedef.get_name()}}, {{field.get_variable_name()}})), {{ "static_cast<uint16_t>(presence::fields::" ~ field.get_name().upper() ~ ")" if field.optional else "::EmbeddedProto::FieldTableEntry::NO_PRESENCE" }},
+      ::EmbeddedProto::Field::FieldTypes::{{field.get_field_type()}}, {{field.get_tag_bytes()|length}}, { {% for byte in field.get_tag_bytes() %}{{ "0x%02X"|format(byte) }}{{ ", " if not loop.last }}{% endfor %} } }{{ "," if not loop.last }}
+    {% endfor %}
+  };
+#if defined(__GNUC__)
+#pragma GCC diagnostic pop
+#endif
+  return TABLE;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro clear(typedef, cache_serialized_size=False) %}
+{
+  {% if cache_serialized_size %}
+  invalidate_serialized_size();
+  {% endif %}
+  {% for field in typedef.fields %}
+  clear_{{field.get_name()}}();
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  clear_{{oneof.get_name()}}();
+  {% endfor %}
+
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{# Only used for messages of which all fields always take the same number of bytes. The size is the sum of the fields
+   which would be serialized, using the same conditions as in serialize. #}
+{% macro calculate_serialized_size(typedef) %}
+{
+  uint32_t size = 0;
+  {% for field in typedef.get_all_fields() %}
+  {% if (field.optional or (field.oneof is not none)) %}
+  if(has_{{field.get_name()}}())
+  {% else %}
+  if({{field.get_default_value()}} != {{field.get_variable_name()}}.get())
+  {% endif %}
+  {
+    size += {{field.get_max_serialized_size()}};
+  }
+  {% endfor %}
+  return size;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro field_number_to_name(typedef) %}
+{
+  char const* name = nullptr;
+  switch(fieldNumber)
+  {
+    {% for field in typedef.fields %}
+    case FieldNumber::{{field.get_variable_id_name()}}:
+      name = {{field.get_name()|upper}}_NAME;
+      break;
+    {% endfor %}
+    {% for oneof in typedef.oneofs %}
+    {% for field in oneof.fields %}
+    case FieldNumber::{{field.get_variable_id_name()}}:
+      name = {{field.get_name()|upper}}_NAME;
+      break;
+    {% endfor %}
+    {% endfor %}
+    default:
+      name = "Invalid FieldNumber";
+      break;
+  }
+  return name;
+}
+{%- endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
+{% macro to_string(typedef) %}
+{
+  ::EmbeddedProto::string_view left_chars = str;
+  int32_t n_chars_used = 0;
+
+  if(!first_field)
+  {
+    // Add a comma behind the previous field.
+    n_chars_used = snprintf(left_chars.data, left_chars.size, ",\n");
+    if(0 < n_chars_used)
+    {
+      // Update the character pointer and characters left in the array.
+      left_chars.data += n_chars_used;
+      left_chars.size -= n_chars_used;
+    }
+  }
+
+  if(nullptr != name)
+  {
+    if( 0 == indent_level)
+    {
+      n_chars_used = snprintf(left_chars.data, left_chars.size, "\"%s\": {\n", name);
+    }
+    else
+    {
+      n_chars_used = snprintf(left_chars.data, left_chars.size, "%*s\"%s\": {\n", indent_level, " ", name);
+    }
+  }
+  else
+  {
+    if( 0 == indent_level)
+    {
+      n_chars_used = snprintf(left_chars.data, left_chars.size, "{\n");
+    }
+    else
+    {
+      n_chars_used = snprintf(left_chars.data, left_chars.size, "%*s{\n", indent_level, " ");
+    }
+  }
+
+  if(0 < n_chars_used)
+  {
+    left_chars.data += n_chars_used;
+    left_chars.size -= n_chars_used;
+  }
+
+  {% for field in typedef.fields %}
+  {%if "FieldErrorRecursive" != field.descriptor.type_name %}{# Test if this is an FieldErrorRecursive #}
+  left_chars = {{field.get_variable_name()}}.to_string(left_chars, indent_level + 2, {{field.get_name()|upper}}_NAME, {{ loop.first|lower }});
+  {% endif %}
+  {% endfor %}
+  {% for oneof in typedef.oneofs %}
+  left_chars = to_string_{{oneof.get_name()}}(left_chars, indent_level + 2, {{((typedef.fields|length == 0) and loop.first)|lower }});
+  {% endfor %}  
+  if( 0 == indent_level) 
+  {
+    n_chars_used = snprintf(left_chars.data, left_chars.size, "\n}");
+  }
+  else 
+  {
+    n_chars_used = snprintf(left_chars.data, left_chars.size, "\n%*s}", indent_level, " ");
+  }
+
+  if(0 < n_chars_used)
+  {
+    left_chars.data += n_chars_used;
+    left_chars.size -= n_chars_used;
+  }
+
+  return left_chars;
+}
+{%- endmacro %}
@@ -49,6 +49,32 @@ switch(rhs.get_which_{{_oneof.get_name()}}())
 {# #}
 {# ------------------------------------------------------------------------------------------------------------------ #}
 {# #}
+{% macro move(_oneof) %}
+if(rhs.get_which_{{_oneof.get_name()}}() != {{_oneof.get_which_oneof()}})
+{
+  // First delete the old object in the oneof.
+  clear_{{_oneof.get_name()}}();
+}
+
+switch(rhs.get_which_{{_oneof.get_name()}}())
+{
+  {% for field in _oneof.get_fields() %}
+  case FieldNumber::{{field.get_variable_id_name()}}:
+    {% if field.get_message_definition() %}
+    mutable_{{field.get_name()}}() = std::move(rhs.{{field.get_variable_name()}});
+    {% else %}
+    set_{{field.get_name()}}(rhs.get_{{field.name}}());
+    {% endif %}
+    break;
+
+  {% endfor %}
+  default:
+    break;
+}
+{% endmacro %}
+{# #}
+{# ------------------------------------------------------------------------------------------------------------------ #}
+{# #}
 {% macro init(_oneof) %}
 void init_{{_oneof.get_name()}}(const FieldNumber field_id)
 {
@@ -0,0 +1,306 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+# This script measures how the time and memory used by the generator scale with the size of the proto files. It builds
+# synthetic CodeGeneratorRequest messages in memory and passes them directly to generate_code, protoc is not used.
+#
+# For each scenario one schema parameter is increased step by step. The slope of the log-log curve of time and memory
+# against that parameter is the scaling exponent: 1.0 is linear, 2.0 is quadratic. The exponents are compared with the
+# ones stored in baseline.json. The script fails when an exponent is larger than the baseline plus a tolerance. As only
+# exponents are compared, the baseline does not depend on the speed of the machine it was made on.
+#
+# Usage:
+#   python benchmark_generator.py                    Run all scenarios and compare them with the baseline.
+#   python benchmark_generator.py --update-baseline  Run all scenarios and store the results as the new baseline.
+#   python benchmark_generator.py -s templates       Only run the given scenario(s).
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+# Use the generator in this repository, also when it is not installed.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from EmbeddedProto.main import generate_code
+from EmbeddedProto import embedded_proto_options_pb2
+from google.protobuf.compiler import plugin_pb2 as plugin
+from google.protobuf.descriptor_pb2 import FieldDescriptorProto
+
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# The scalar types used for the basic fields in the synthetic messages.
+SCALAR_TYPES = [FieldDescriptorProto.TYPE_INT32, FieldDescriptorProto.TYPE_UINT64, FieldDescriptorProto.TYPE_FLOAT,
+                FieldDescriptorProto.TYPE_DOUBLE, FieldDescriptorProto.TYPE_SINT32, FieldDescriptorProto.TYPE_BOOL,
+                FieldDescriptorProto.TYPE_FIXED32, FieldDescriptorProto.TYPE_SFIXED64]
+
+MAX_LENGTH = 16
+
+
+# -----------------------------------------------------------------------------
+
+class Schema:
+    # The parameters of a synthetic schema.
+    def __init__(self, n_files=1, n_messages=10, depth=0, n_fields=4, n_oneofs=0, n_strings=1, n_repeated=1,
+                 max_length=True):
+        # The number of files, each file imports the previous one and uses a message from it.
+        self.n_files = n_files
+        # The number of top level messages in each file.
+        self.n_messages = n_messages
+        # The number of messages nested in each other in each top level message.
+        self.depth = depth
+        # The number of scalar fields in each message.
+        self.n_fields = n_fields
+        # The number of oneofs in each message, each with two fields.
+        self.n_oneofs = n_oneofs
+        # The number of string and bytes fields in each message.
+        self.n_strings = n_strings
+        # The number of repeated fields in each message.
+        self.n_repeated = n_repeated
+        # Set the maxLength option on string, bytes and repeated fields. If not they require template parameters.
+        self.max_length = max_length
+
+
+def add_field(msg, name, field_type, label=FieldDescriptorProto.LABEL_OPTIONAL, type_name=None, max_length=None,
+              oneof_index=None):
+    field = msg.field.add()
+    field.name = name
+    field.number = len(msg.field)
+    field.type = field_type
+    field.label = label
+    field.json_name = name
+    if type_name:
+        field.type_name = type_name
+    if max_length:
+        field.options.Extensions[embedded_proto_options_pb2.options].maxLength = max_length
+    if oneof_index is not None:
+        field.oneof_index = oneof_index
+    return field
+
+
+def fill_message(msg, schema, referenced_types):
+    max_length = MAX_LENGTH if schema.max_length else None
+
+    for i in range(schema.n_fields):
+        add_field(msg, "value_" + str(i), SCALAR_TYPES[i % len(SCALAR_TYPES)])
+
+    for i in range(schema.n_strings):
+        add_field(msg, "text_" + str(i), FieldDescriptorProto.TYPE_STRING, max_length=max_length)
+        add_field(msg, "data_" + str(i), FieldDescriptorProto.TYPE_BYTES, max_length=max_length)
+
+    for i in range(schema.n_repeated):
+        add_field(msg, "array_" + str(i), FieldDescriptorProto.TYPE_INT32, label=FieldDescriptorProto.LABEL_REPEATED,
+                  max_length=max_length)
+
+    for i in range(schema.n_oneofs):
+        oneof = msg.oneof_decl.add()
+        oneof.name = "choice_" + str(i)
+        index = len(msg.oneof_decl) - 1
+        add_field(msg, "choice_" + str(i) + "_number", FieldDescriptorProto.TYPE_UINT32, oneof_index=index)
+        add_field(msg, "choice_" + str(i) + "_text", FieldDescriptorProto.TYPE_STRING, max_length=max_length,
+                  oneof_index=index)
+
+    for i, type_name in enumerate(referenced_types):
+        add_field(msg, "msg_" + str(i), FieldDescriptorProto.TYPE_MESSAGE, type_name=type_name)
+
+
+def build_request(schema):
+    # Build a request similar to the one protoc would send to the plugin for the given schema. The first message in each
+    # file does not use other messages. All other messages use the first message of their own file and that of the
+    # previous file. This keeps the number of template parameters per message constant when the schema grows.
+    request = plugin.CodeGeneratorRequest()
+    for file_index in range(schema.n_files):
+        proto_file = request.proto_file.add()
+        proto_file.name = "file" + str(file_index) + ".proto"
+        proto_file.package = "bench.file" + str(file_index)
+        proto_file.syntax = "proto3"
+
+        leaf_type = "." + proto_file.package + ".Msg0"
+        referenced_types = [leaf_type]
+        if file_index:
+            proto_file.dependency.append("file" + str(file_index - 1) + ".proto")
+            referenced_types.append(".bench.file" + str(file_index - 1) + ".Msg0")
+
+        for msg_index in range(schema.n_messages):
+            msg = proto_file.message_type.add()
+            msg.name = "Msg" + str(msg_index)
+            fill_message(msg, schema, referenced_types if msg_index else [])
+
+            # Add a chain of nested messages, each used as a field in the message around it.
+            parent = msg
+            parent_type = "." + proto_file.package + "." + msg.name
+            for depth in range(schema.depth):
+                nested = parent.nested_type.add()
+                nested.name = "Nested" + str(depth)
+                fill_message(nested, schema, [])
+                nested_type = parent_type + "." + nested.name
+                add_field(parent, "nested_" + str(depth), FieldDescriptorProto.TYPE_MESSAGE, type_name=nested_type)
+                parent = nested
+                parent_type = nested_type
+
+        request.file_to_generate.append(proto_file.name)
+
+    return request
+
+
+# -----------------------------------------------------------------------------
+
+# Each scenario increases one parameter of the schema, the others stay the same.
+SCENARIOS = {
+    "messages": ([25, 50, 100, 200], lambda n: Schema(n_messages=n)),
+    "templates": ([25, 50, 100, 200], lambda n: Schema(n_messages=n, max_length=False)),
+    "fields": ([4, 8, 16, 32], lambda n: Schema(n_messages=20, n_fields=n)),
+    "oneofs": ([1, 2, 4, 8], lambda n: Schema(n_messages=20, n_oneofs=n)),
+    "nesting": ([2, 4, 8, 16], lambda n: Schema(n_messages=5, depth=n)),
+    "imports": ([2, 4, 8, 16], lambda n: Schema(n_files=n, n_messages=10)),
+}
+
+
+def measure(schema, repeat):
+    # Return the best time out of a number of runs and the peak memory usage of generating code for the schema.
+    times = []
+    for _ in range(repeat):
+        request = build_request(schema)
+        response = plugin.CodeGeneratorResponse()
+        start = time.perf_counter()
+        generate_code(request, response)
+        times.append(time.perf_counter() - start)
+        if response.error:
+            raise Exception(response.error)
+
+    # Memory is measured in a separate run as tracing slows down the generator.
+    request = build_request(schema)
+    tracemalloc.start()
+    generate_code(request, plugin.CodeGeneratorResponse())
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return min(times), peak_memory
+
+
+def scaling_exponent(sizes, values):
+    # The least squares slope of log(value) against log(size).
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in values]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def run_scenario(name, repeat):
+    sizes, make_schema = SCENARIOS[name]
+    times = []
+    memory = []
+    print("Scenario: " + name)
+    print("  {:>8} {:>12} {:>14}".format("size", "time [ms]", "peak mem [kB]"))
+    for size in sizes:
+        best_time, peak_memory = measure(make_schema(size), repeat)
+        times.append(best_time)
+        memory.append(peak_memory)
+        print("  {:>8} {:>12.1f} {:>14.1f}".format(size, best_time * 1000, peak_memory / 1024))
+
+    result = {"sizes": sizes,
+              "time_s": times,
+              "peak_memory_bytes": memory,
+              "time_exponent": scaling_exponent(sizes, times),
+              "memory_exponent": scaling_exponent(sizes, memory)}
+    print("  scaling exponent time: {:.2f}, memory: {:.2f}".format(result["time_exponent"],
+                                                                  result["memory_exponent"]))
+    return result
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    # Return a list with a description of each exponent that got worse compared to the baseline.
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ("time_exponent", "memory_exponent"):
+            if result[key] > baseline[name][key] + tolerance:
+                regressions.append("{}: {} {:.2f} exceeds baseline {:.2f} + {:.2f}".format(
+                    name, key, result[key], baseline[name][key], tolerance))
+    return regressions
+
+
+# -----------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how the Embedded Proto generator scales with schema size.")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS.keys()),
+                        help="Only run the given scenario, can be used multiple times.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="The number of runs per size, the best is used.")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.3,
+                        help="How much an exponent may exceed the baseline before it is a regression.")
+    parser.add_argument("-o", "--output", help="Write the results as json to this file.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    args = parser.parse_args()
+
+    results = {}
+    for name in (args.scenario or SCENARIOS.keys()):
+        results[name] = run_scenario(name, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(BASELINE_FILENAME):
+            with open(BASELINE_FILENAME, "r") as file:
+                baseline = json.load(file)
+        for name, result in results.items():
+            baseline[name] = {"time_exponent": round(result["time_exponent"], 2),
+                              "memory_exponent": round(result["memory_exponent"], 2)}
+        with open(BASELINE_FILENAME, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print("Baseline updated.")
+        return
+
+    with open(BASELINE_FILENAME, "r") as file:
+        baseline = json.load(file)
+
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("Scaling regressions found:")
+        for regression in regressions:
+            print("  " + regression)
+        sys.exit(1)
+    print("No scaling regressions found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,7 @@ from setuptools.command.editable_wheel import editable_wheel
 from setuptools.command.sdist import sdist
 from setuptools import setup
 import subprocess
+import sys
 import os
 
 
@@ -52,15 +53,24 @@ def build_proto():
     subprocess.run(command, check=True)
 
 
+def build_templates():
+    # Precompile the Jinja templates into python modules to speed up starting the plugin.
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from EmbeddedProto.TemplateEnvironment import compile_templates
+    compile_templates()
+
+
 class Build(build):
     def run(self):
         build_proto()
+        build_templates()
         super().run()
 
 
 class EditableWheel(editable_wheel):
     def run(self):
         build_proto()
+        build_templates()
         super().run()
 
 
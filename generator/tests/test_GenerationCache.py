@@ -0,0 +1,67 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+# Run from the generator folder with: python -m unittest discover tests
+
+from EmbeddedProto.GenerationCache import GenerationCache
+import os
+import tempfile
+import unittest
+
+
+# -----------------------------------------------------------------------------
+
+class TestGenerationCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache = GenerationCache(self.folder.name, 10)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_put_and_get(self):
+        self.cache.put("key", {".h": "content"})
+
+        self.assertEqual({".h": "content"}, self.cache.get("key"))
+        self.assertIsNone(self.cache.get("other"))
+
+    def test_entry_mode_follows_umask(self):
+        umask = os.umask(0o022)
+        try:
+            self.cache.put("key", {".h": "content"})
+        finally:
+            os.umask(umask)
+
+        mode = os.stat(self.cache.get_entry_path("key", ".h")).st_mode & 0o777
+        self.assertEqual(0o644, mode)
+
+
+if __name__ == "__main__":
+    unittest.main()
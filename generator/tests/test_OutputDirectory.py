@@ -0,0 +1,114 @@
+#
+# Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+#
+# This file is part of Embedded Proto.
+#
+# Embedded Proto is open source software: you can redistribute it and/or
+# modify it under the terms of the GNU General Public License as published
+# by the Free Software Foundation, version 3 of the license.
+#
+# Embedded Proto  is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+#
+# For commercial and closed source application please visit:
+# <https://EmbeddedProto.com/license/>.
+#
+# Embedded AMS B.V.
+# Info:
+#   info at EmbeddedProto dot com
+#
+# Postal address:
+#   Atoomweg 2
+#   1627 LE, Hoorn
+#   the Netherlands
+#
+
+# Run from the generator folder with: python -m unittest discover tests
+
+from EmbeddedProto.main import main_batch
+from EmbeddedProto.OutputDirectory import MANIFEST_FILENAME
+from google.protobuf.descriptor_pb2 import FieldDescriptorProto, FileDescriptorProto, FileDescriptorSet
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+
+# Create a proto file with a single message holding one field.
+def make_proto_file(name, message_name):
+    proto_file = FileDescriptorProto(name=name, syntax="proto3")
+    message = proto_file.message_type.add(name=message_name)
+    message.field.add(name="value", number=1, type=FieldDescriptorProto.TYPE_UINT32,
+                      label=FieldDescriptorProto.LABEL_OPTIONAL)
+    return proto_file
+
+
+class TestBatchOutput(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.folder.name, "out")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_descriptor_set(self, proto_files):
+        path = os.path.join(self.folder.name, "protos.pb")
+        with open(path, "wb") as file:
+            file.write(FileDescriptorSet(file=proto_files).SerializeToString())
+        return path
+
+    def run_batch(self, argv):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(0, main_batch(argv))
+
+    def read_manifest(self):
+        with open(os.path.join(self.out, MANIFEST_FILENAME), "r", encoding="utf-8") as file:
+            return json.load(file)["files"]
+
+    def test_subset_keeps_other_headers(self):
+        descriptor_set = self.write_descriptor_set([make_proto_file("a.proto", "A"), make_proto_file("b.proto", "B")])
+        self.run_batch([descriptor_set, "-o", self.out])
+        self.run_batch([descriptor_set, "-o", self.out, "a.proto"])
+
+        self.assertTrue(os.path.exists(os.path.join(self.out, "a.h")))
+        self.assertTrue(os.path.exists(os.path.join(self.out, "b.h")))
+        self.assertEqual(["a.h", "b.h"], sorted(self.read_manifest()))
+
+    def test_removed_proto_file(self):
+        self.run_batch([self.write_descriptor_set([make_proto_file("a.proto", "A"), make_proto_file("b.proto", "B")]),
+                        "-o", self.out])
+        self.run_batch([self.write_descriptor_set([make_proto_file("a.proto", "A")]), "-o", self.out])
+
+        self.assertTrue(os.path.exists(os.path.join(self.out, "a.h")))
+        self.assertFalse(os.path.exists(os.path.join(self.out, "b.h")))
+        self.assertEqual(["a.h"], sorted(self.read_manifest()))
+
+    def get_mode(self, name):
+        return os.stat(os.path.join(self.out, name)).st_mode & 0o777
+
+    def test_new_header_mode_follows_umask(self):
+        umask = os.umask(0o022)
+        try:
+            self.run_batch([self.write_descriptor_set([make_proto_file("a.proto", "A")]), "-o", self.out])
+        finally:
+            os.umask(umask)
+
+        self.assertEqual(0o644, self.get_mode("a.h"))
+
+    def test_rewritten_header_keeps_mode(self):
+        self.run_batch([self.write_descriptor_set([make_proto_file("a.proto", "A")]), "-o", self.out])
+        os.chmod(os.path.join(self.out, "a.h"), 0o640)
+        self.run_batch([self.write_descriptor_set([make_proto_file("a.proto", "C")]), "-o", self.out])
+
+        self.assertEqual(0o640, self.get_mode("a.h"))
+
+
+if __name__ == "__main__":
+    unittest.main()
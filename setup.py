@@ -57,6 +57,7 @@ def clean_folder():
     shutil.rmtree("./venv", ignore_errors=True)
     shutil.rmtree("./build", ignore_errors=True)
     shutil.rmtree("./generator/EmbeddedProto.egg-info", ignore_errors=True)
+    shutil.rmtree("./generator/EmbeddedProto/templates_compiled", ignore_errors=True)
     try:
         os.remove("./generator/EmbeddedProto/embedded_proto_options_pb2.py")
     except FileNotFoundError:
@@ -73,6 +73,35 @@ namespace EmbeddedProto
 #endif
 
 
+  //! Is the target little endian, in that case fixed width values are stored in memory as they are on the wire.
+  /*!
+      The byte order is detected using the macros defined by GCC and Clang. For other compilers define
+      EMBEDDED_PROTO_LITTLE_ENDIAN as 1 for little endian targets to enable copying fixed width values directly to 
+      and from the buffers. Without it the portable, byte by byte, implementation is used.
+  */
+#ifndef EMBEDDED_PROTO_LITTLE_ENDIAN
+  #if defined(__BYTE_ORDER__) && defined(__ORDER_LITTLE_ENDIAN__) && (__BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__)
+    #define EMBEDDED_PROTO_LITTLE_ENDIAN 1
+  #else
+    #define EMBEDDED_PROTO_LITTLE_ENDIAN 0
+  #endif
+#endif
+
+  static constexpr bool IS_LITTLE_ENDIAN = (1 == EMBEDDED_PROTO_LITTLE_ENDIAN);
+
+  //! Keep a function out of line such that the functions calling it remain small enough to be inlined.
+  /*!
+      This is used for the less common, longer paths of small functions which are called often. For 
+      compilers other than GCC and Clang the compiler decides.
+  */
+#ifndef EMBEDDED_PROTO_NOINLINE
+  #if defined(__GNUC__) || defined(__clang__)
+    #define EMBEDDED_PROTO_NOINLINE __attribute__((noinline))
+  #else
+    #define EMBEDDED_PROTO_NOINLINE
+  #endif
+#endif
+
   //! An simple struct holding both a pointer to an array and the size of that array.
   template<class T>
   struct array_view {
@@ -173,6 +173,15 @@ namespace EmbeddedProto
 
 
         Error serialize_with_id(uint32_t field_number, WriteBufferInterface& buffer, const bool optional) const override 
+        {
+          uint8_t tag[WireFormatter::MAX_TAG_SIZE];
+          const uint32_t tag_size = WireFormatter::EncodeTag(field_number, 
+                                                             WireFormatter::WireType::LENGTH_DELIMITED, tag);
+          return serialize_with_tag(tag, tag_size, buffer, optional);
+        }
+
+        Error serialize_with_tag(const uint8_t* tag, const uint32_t tag_size, WriteBufferInterface& buffer, 
+                                 const bool optional) const override 
         {
           Error return_value = Error::NO_ERRORS;
 
@@ -181,9 +190,7 @@ namespace EmbeddedProto
             const auto n_bytes_available = buffer.get_available_size();
             if(current_length_ <= n_bytes_available)
             {
-              uint32_t tag = WireFormatter::MakeTag(field_number, 
-                                                    WireFormatter::WireType::LENGTH_DELIMITED);
-              return_value = WireFormatter::SerializeVarint(tag, buffer);
+              return_value = WireFormatter::SerializeTag(tag, tag_size, buffer);
               if(Error::NO_ERRORS == return_value) 
               {
                 return_value = WireFormatter::SerializeVarint(current_length_, buffer);
@@ -225,6 +232,16 @@ namespace EmbeddedProto
             {
               clear();
 
+              // Copy the characters at once when the buffer exposes its memory.
+              const array_view<const uint8_t> bytes = buffer.get_readable_bytes();
+              if((nullptr != bytes.data) && (0 < bytes.size))
+              {
+                current_length_ = std::min(availiable, bytes.size);
+                memcpy(data_.data(), bytes.data, current_length_);
+                buffer.advance(current_length_);
+              }
+
+              // Obtain the remaining characters one by one.
               uint8_t byte = 0;
               while((current_length_ < availiable) && buffer.pop(byte)) 
               {
@@ -0,0 +1,77 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+
+#ifndef _FIELD_TABLE_H_
+#define _FIELD_TABLE_H_
+
+#include "Fields.h"
+#include "WireFormatter.h"
+
+#include <cstdint>
+#include <cstddef>
+
+
+namespace EmbeddedProto
+{
+
+  //! Describes a single field of a message for the table driven serialization.
+  /*!
+      When code is generated with the table_driven option, each message holds a constant array of these entries, one 
+      for each field. The message is serialized and deserialized by a loop shared by all messages, see 
+      MessageInterface::serialize_table() and MessageInterface::deserialize_table(). The entries are in the order in 
+      which the fields are serialized.
+  */
+  struct FieldTableEntry
+  {
+    //! The value of presence for fields of which the presence is not tracked.
+    static constexpr uint16_t NO_PRESENCE = 0xFFFF;
+
+    //! The field number as defined in the proto file.
+    uint32_t number;
+
+    //! The offset in bytes of the field variable from the start of the message object.
+    uint32_t offset;
+
+    //! The bit in the presence array of the message which is set when an optional field is present. 
+    uint16_t presence;
+
+    //! The type of the field, used to select how the field is serialized.
+    Field::FieldTypes type;
+
+    //! The number of bytes in the encoded tag.
+    uint8_t tag_size;
+
+    //! The tag of the field encoded as a varint by the generator, holding both the field number and wire type.
+    uint8_t tag[WireFormatter::MAX_TAG_SIZE];
+  };
+
+} // End of namespace EmbeddedProto
+
+#endif // _FIELD_TABLE_H_
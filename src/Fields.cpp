@@ -34,6 +34,11 @@
 namespace EmbeddedProto 
 {
   uint32_t Field::serialized_size() const
+  {
+    return this->calculate_serialized_size();
+  }
+
+  uint32_t Field::calculate_serialized_size() const
   {
     ::EmbeddedProto::MessageSizeCalculator calcBuffer;
     this->serialize(calcBuffer);
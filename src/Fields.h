@@ -50,7 +50,7 @@ namespace EmbeddedProto
   class Field 
   {
     public:
-      enum class FieldTypes
+      enum class FieldTypes : uint8_t
       {
         int32,
         int64, 
@@ -78,6 +78,17 @@ namespace EmbeddedProto
 
       virtual Error serialize_with_id(uint32_t field_number, WriteBufferInterface& buffer, const bool optional) const = 0;
 
+      //! Serialize this field using a tag which has already been encoded.
+      /*!
+          \param tag The bytes of the encoded tag, for example from TagBytes.
+          \param tag_size The number of bytes in the tag.
+          \param buffer The buffer in which the field is serialized.
+          \param optional Serialize the field even when it holds the default value.
+          \return NO_ERROR if everything went ok.
+      */
+      virtual Error serialize_with_tag(const uint8_t* tag, const uint32_t tag_size, WriteBufferInterface& buffer, 
+                                       const bool optional) const = 0;
+
       virtual Error serialize(WriteBufferInterface& buffer) const = 0;
 
       //! Deserialize this field from the bytes in the given buffer.
@@ -98,9 +109,19 @@ namespace EmbeddedProto
 
       //! Calculate the size of this message when serialized.
       /*!
+          Messages generated with the cache_serialized_size option return a stored size, see 
+          calculate_serialized_size() for the size calculated each time.
           \return The number of bytes this message will require once serialized.
       */
-      uint32_t serialized_size() const;
+      virtual uint32_t serialized_size() const;
+
+      //! Calculate the size of this field when serialized, without using a stored size.
+      /*!
+          This size is written in front of nested messages and has to match the data serialized after it. A stored 
+          size misses the changes made through a reference obtained before the size was stored.
+          \return The number of bytes this field will require once serialized.
+      */
+      virtual uint32_t calculate_serialized_size() const;
 
       //! Reset the field to it's initial value.
       virtual void clear() = 0;
@@ -129,32 +150,46 @@ namespace EmbeddedProto
       FieldTemplate() = default;
       FieldTemplate(const VARIABLE_TYPE& v) : value_(v) { };
       FieldTemplate(const VARIABLE_TYPE&& v) : value_(v) { };
-      FieldTemplate(const CLASS_TYPE& ft) : value_(ft.value_) { };
+      FieldTemplate(const CLASS_TYPE& ft) = default;
+      FieldTemplate(CLASS_TYPE&& ft) noexcept = default;
 
       ~FieldTemplate() = default;
 
-      Error serialize_with_id(uint32_t field_number, WriteBufferInterface& buffer, [[maybe_unused]] const bool optional) const
+      template<class BUFFER_TYPE>
+      Error serialize_with_id(uint32_t field_number, BUFFER_TYPE& buffer, const bool optional) const
+      {
+        uint8_t tag[WireFormatter::MAX_TAG_SIZE];
+        const uint32_t tag_size = WireFormatter::EncodeTag(field_number, WIRETYPE, tag);
+        return serialize_with_tag(tag, tag_size, buffer, optional);
+      }   
+
+      template<class BUFFER_TYPE>
+      Error serialize_with_tag(const uint8_t* tag, const uint32_t tag_size, BUFFER_TYPE& buffer, 
+                               [[maybe_unused]] const bool optional) const
       {
-        Error return_value = WireFormatter::SerializeVarint(WireFormatter::MakeTag(field_number, WIRETYPE), buffer);
+        Error return_value = WireFormatter::SerializeTag(tag, tag_size, buffer);
         if(Error::NO_ERRORS == return_value)
         {
           return_value = serialize(buffer);
         }
         return return_value;
-      }   
+      }
 
-      Error serialize(WriteBufferInterface& buffer) const
+      template<class BUFFER_TYPE>
+      Error serialize(BUFFER_TYPE& buffer) const
       {
         return serialize_<FIELDTYPE>(buffer);
       }
 
-      Error deserialize(ReadBufferInterface& buffer)
+      template<class BUFFER_TYPE>
+      Error deserialize(BUFFER_TYPE& buffer)
       {
         return deserialize_<FIELDTYPE>(buffer);
       }
 
       //! \see Field::deserialize()
-      Error deserialize_check_type(ReadBufferInterface& buffer, 
+      template<class BUFFER_TYPE>
+      Error deserialize_check_type(BUFFER_TYPE& buffer, 
                                    const ::EmbeddedProto::WireFormatter::WireType& wire_type)
       {
         Error return_value = WIRETYPE == wire_type ? Error::NO_ERRORS : Error::INVALID_WIRETYPE;
@@ -181,16 +216,9 @@ namespace EmbeddedProto
         value_ = v;
         return *this;
       }
-      CLASS_TYPE& operator=(const CLASS_TYPE& ft)
-      { 
-        value_ = ft.value_; 
-        return *this; 
-      }
-      CLASS_TYPE& operator=(const CLASS_TYPE&& ft) noexcept
-      { 
-        value_ = ft.value_;
-        return *this;
-      }
+      //! The copy and move operations are left to the compiler, keeping the field trivially copyable.
+      CLASS_TYPE& operator=(const CLASS_TYPE& ft) = default;
+      CLASS_TYPE& operator=(CLASS_TYPE&& ft) noexcept = default;
 
       const VARIABLE_TYPE& get() const { return value_; }
       VARIABLE_TYPE& get() { return value_; }
@@ -231,6 +259,9 @@ namespace EmbeddedProto
         return calcBuffer.get_size();
       }
 
+      //! \see Field::calculate_serialized_size(), the size of a single value is never stored.
+      uint32_t calculate_serialized_size() const { return serialized_size(); }
+
 #ifdef MSG_TO_STRING
 
       //! Write all the data in this field to a human readable string.
@@ -336,77 +367,77 @@ namespace EmbeddedProto
       VARIABLE_TYPE value_;
 
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::int32 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(static_cast<uint32_t>(get()), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::int32 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(static_cast<uint32_t>(get()), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::int64 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(static_cast<uint64_t>(get()), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::int64 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(static_cast<uint64_t>(get()), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::uint32 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::uint32 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::uint64 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::uint64 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sint32 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(WireFormatter::ZigZagEncode(get()), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sint32 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(WireFormatter::ZigZagEncode(get()), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sint64 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(WireFormatter::ZigZagEncode(get()), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sint64 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(WireFormatter::ZigZagEncode(get()), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::boolean == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const 
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::boolean == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const 
       { 
         const uint8_t byte = get() ? 0x01 : 0x00;
         return buffer.push(byte) ? Error::NO_ERRORS : Error::BUFFER_FULL; 
       }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::enumeration == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeVarint(static_cast<uint32_t>(get()), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::enumeration == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeVarint(static_cast<uint32_t>(get()), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::fixed32 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeFixedNoTag(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::fixed32 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeFixedNoTag(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::fixed64 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerializeFixedNoTag(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::fixed64 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerializeFixedNoTag(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sfixed32 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerialzieSFixedNoTag(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sfixed32 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerialzieSFixedNoTag(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sfixed64 == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerialzieSFixedNoTag(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sfixed64 == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerialzieSFixedNoTag(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::floatfixed == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerialzieFloatNoTag(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::floatfixed == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerialzieFloatNoTag(get(), buffer); }
 
-      template<Field::FieldTypes SER_FIELDTYPE, typename std::enable_if<Field::FieldTypes::doublefixed == SER_FIELDTYPE, bool>::type = true>
-      Error serialize_(WriteBufferInterface& buffer) const { return WireFormatter::SerialzieDoubleNoTag(get(), buffer); }
+      template<Field::FieldTypes SER_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::doublefixed == SER_FIELDTYPE, bool>::type = true>
+      Error serialize_(BUFFER_TYPE& buffer) const { return WireFormatter::SerialzieDoubleNoTag(get(), buffer); }
 
 
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::int32 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeInt(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::int32 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeInt(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::int64 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeInt(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::int64 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeInt(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::uint32 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeUInt(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::uint32 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeUInt(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::uint64 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeUInt(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::uint64 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeUInt(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sint32 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeSInt(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sint32 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeSInt(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sint64 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeSInt(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sint64 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeSInt(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::boolean == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeBool(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::boolean == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeBool(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::enumeration == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer)
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::enumeration == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer)
       { 
         uint32_t value = 0;
         const Error return_value = WireFormatter::DeserializeVarint(buffer, value);
@@ -417,23 +448,23 @@ namespace EmbeddedProto
         return return_value;
       }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::fixed32 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeFixed(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::fixed32 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeFixed(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::fixed64 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeFixed(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::fixed64 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeFixed(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sfixed32 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeSFixed(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sfixed32 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeSFixed(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::sfixed64 == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeSFixed(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::sfixed64 == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeSFixed(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::floatfixed == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeFloat(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::floatfixed == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeFloat(buffer, get()); }
 
-      template<Field::FieldTypes DES_FIELDTYPE, typename std::enable_if<Field::FieldTypes::doublefixed == DES_FIELDTYPE, bool>::type = true>
-      Error deserialize_(ReadBufferInterface& buffer) { return WireFormatter::DeserializeDouble(buffer, get()); }
+      template<Field::FieldTypes DES_FIELDTYPE, class BUFFER_TYPE, typename std::enable_if<Field::FieldTypes::doublefixed == DES_FIELDTYPE, bool>::type = true>
+      Error deserialize_(BUFFER_TYPE& buffer) { return WireFormatter::DeserializeDouble(buffer, get()); }
 
   };
 
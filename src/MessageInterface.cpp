@@ -32,37 +32,116 @@
 #include "WireFormatter.h"
 #include "ReadBufferSection.h"
 
+#include <cstring>
+#include <limits>
+
 namespace EmbeddedProto
 {
 
+  namespace
+  {
+    // The number of bits in a single element of the presence array of a message.
+    constexpr uint32_t N_PRESENCE_BITS = std::numeric_limits<uint32_t>::digits;
+
+    bool is_present(const uint32_t* presence, const uint16_t bit)
+    {
+      return 0 != (presence[bit / N_PRESENCE_BITS] & (static_cast<uint32_t>(0x01) << (bit % N_PRESENCE_BITS)));
+    }
+
+    void set_present(uint32_t* presence, const uint16_t bit)
+    {
+      presence[bit / N_PRESENCE_BITS] |= static_cast<uint32_t>(0x01) << (bit % N_PRESENCE_BITS);
+    }
+
+    // Serialize a field of one of the basic types. The field points to the variable in the message which is of the 
+    // given FIELD_TYPE.
+    template<class FIELD_TYPE>
+    Error serialize_basic(const uint8_t* field, const FieldTableEntry& entry, const bool optional, 
+                          WriteBufferInterface& buffer)
+    {
+      Error return_value = Error::NO_ERRORS;
+      const FIELD_TYPE& variable = *reinterpret_cast<const FIELD_TYPE*>(field);
+      // Values equal to the default are not serialized unless the presence of the field is tracked.
+      if(optional || (static_cast<typename FIELD_TYPE::TYPE>(0) != variable.get()))
+      {
+        return_value = variable.serialize_with_tag(entry.tag, entry.tag_size, buffer, optional);
+      }
+      return return_value;
+    }
+
+    template<class FIELD_TYPE>
+    Error deserialize_basic(uint8_t* field, const WireFormatter::WireType& wire_type, ReadBufferInterface& buffer)
+    {
+      return reinterpret_cast<FIELD_TYPE*>(field)->deserialize_check_type(buffer, wire_type);
+    }
+  }
+
+
   Error MessageInterface::MessageInterface::serialize_with_id(uint32_t field_number, 
                                                               ::EmbeddedProto::WriteBufferInterface& buffer,
                                                               const bool optional) const
+  {
+    uint8_t tag[WireFormatter::MAX_TAG_SIZE];
+    const uint32_t tag_size = WireFormatter::EncodeTag(field_number, 
+                                                       WireFormatter::WireType::LENGTH_DELIMITED, tag);
+    return serialize_with_tag(tag, tag_size, buffer, optional);
+  }
+
+
+  Error MessageInterface::serialize_with_tag(const uint8_t* tag, const uint32_t tag_size,
+                                             ::EmbeddedProto::WriteBufferInterface& buffer,
+                                             const bool optional) const
   {
     Error return_value = Error::NO_ERRORS;
+    const auto* base = static_cast<const ::EmbeddedProto::Field*>(this);  
 
-    // See if we have data which should be serialized.
-    const uint32_t size_x = this->serialized_size();
-    if((0 < size_x) || optional)
+    if(nullptr != buffer.get_data())
     {
-      uint32_t tag = WireFormatter::MakeTag(field_number, 
-                              WireFormatter::WireType::LENGTH_DELIMITED);
-      return_value = WireFormatter::SerializeVarint(tag, buffer);
-      
+      // Serialize the message in a single pass and write the length in front of it afterwards.
+      const uint32_t start = buffer.get_size();
+      return_value = WireFormatter::SerializeTagReserveLength(tag, tag_size, buffer);
+      if(Error::NO_ERRORS == return_value)
+      {
+        return_value = base->serialize(buffer);
+      }
+
       if(Error::NO_ERRORS == return_value)
       {
-        return_value = WireFormatter::SerializeVarint(size_x, buffer);
+        return_value = WireFormatter::SerializeReservedLength(start, tag_size, buffer, optional);
+      }
+      else
+      {
+        // Remove what did fit. An empty message is not serialized at all, that always fits.
+        buffer.set_size(start);
+        if(!optional && (0 == this->calculate_serialized_size()))
+        {
+          return_value = Error::NO_ERRORS;
+        }
+      }
+    }
+    else
+    {
+      // See if we have data which should be serialized. The length written has to match the data, a stored size is 
+      // not used.
+      const uint32_t size_x = this->calculate_serialized_size();
+      if((0 < size_x) || optional)
+      {
+        return_value = WireFormatter::SerializeTag(tag, tag_size, buffer);
+        
         if(Error::NO_ERRORS == return_value)
         {
-          // See if there is enough space left in the buffer for the data.
-          if(size_x <= buffer.get_available_size()) 
-          {
-            const auto* base = static_cast<const ::EmbeddedProto::Field*>(this);  
-            return_value = base->serialize(buffer);
-          }
-          else
+          return_value = WireFormatter::SerializeVarint(size_x, buffer);
+          if(Error::NO_ERRORS == return_value)
           {
-            return_value = Error::BUFFER_FULL;
+            // See if there is enough space left in the buffer for the data.
+            if(size_x <= buffer.get_available_size()) 
+            {
+              return_value = base->serialize(buffer);
+            }
+            else
+            {
+              return_value = Error::BUFFER_FULL;
+            }
           }
         }
       }
@@ -154,4 +233,262 @@ namespace EmbeddedProto
     return return_value;
   }
 
+
+  Error MessageInterface::serialize_table(const FieldTableEntry* table, const uint32_t n_entries, 
+                                          const uint32_t* presence,
+                                          ::EmbeddedProto::WriteBufferInterface& buffer) const
+  {
+    Error return_value = Error::NO_ERRORS;
+    for(uint32_t i = 0; (i < n_entries) && (Error::NO_ERRORS == return_value); ++i)
+    {
+      const FieldTableEntry& entry = table[i];
+      const bool optional = FieldTableEntry::NO_PRESENCE != entry.presence;
+      // Optional fields are only serialized when they are set.
+      if(!optional || is_present(presence, entry.presence))
+      {
+        return_value = serialize_table_field(entry, optional, buffer);
+      }
+    }
+    return return_value;
+  }
+
+
+  Error MessageInterface::deserialize_table(const FieldTableEntry* table, const uint32_t n_entries, 
+                                            uint32_t* presence,
+                                            ::EmbeddedProto::ReadBufferInterface& buffer)
+  {
+    Error return_value = Error::NO_ERRORS;
+    ::EmbeddedProto::WireFormatter::WireType wire_type = ::EmbeddedProto::WireFormatter::WireType::VARINT;
+    uint32_t id_number = 0;
+
+    // Fields are usually received in the order of the table. The search for a field therefore starts at the entry of
+    // the previous field. This also finds the elements of an unpacked repeated field at once.
+    uint32_t index = 0;
+
+    Error tag_value = ::EmbeddedProto::WireFormatter::DeserializeTag(buffer, wire_type, id_number);
+    while((Error::NO_ERRORS == return_value) && (Error::NO_ERRORS == tag_value))
+    {
+      if(0 == id_number)
+      {
+        return_value = Error::INVALID_FIELD_ID;
+      }
+      else
+      {
+        uint32_t n_searched = 0;
+        while((n_searched < n_entries) && (id_number != table[index].number))
+        {
+          ++n_searched;
+          index = ((index + 1) < n_entries) ? (index + 1) : 0;
+        }
+
+        if(n_searched < n_entries)
+        {
+          const FieldTableEntry& entry = table[index];
+          if(FieldTableEntry::NO_PRESENCE != entry.presence)
+          {
+            set_present(presence, entry.presence);
+          }
+          return_value = deserialize_table_field(entry, wire_type, buffer);
+        }
+        else
+        {
+          return_value = skip_unknown_field(buffer, wire_type);
+        }
+      }
+
+      if(Error::NO_ERRORS == return_value)
+      {
+        // Read the next tag.
+        tag_value = ::EmbeddedProto::WireFormatter::DeserializeTag(buffer, wire_type, id_number);
+      }
+    }
+
+    // When an error was detect while reading the tag but no other errors where found, set it in the return value.
+    if((Error::NO_ERRORS == return_value)
+       && (Error::NO_ERRORS != tag_value)
+       && (Error::END_OF_BUFFER != tag_value)) // The end of the buffer is not an array in this case.
+    {
+      return_value = tag_value;
+    }
+
+    return return_value;
+  }
+
+
+  Error MessageInterface::serialize_table_field(const FieldTableEntry& entry, const bool optional,
+                                                ::EmbeddedProto::WriteBufferInterface& buffer) const
+  {
+    Error return_value = Error::NO_ERRORS;
+    const uint8_t* field = reinterpret_cast<const uint8_t*>(this) + entry.offset;
+
+    switch(entry.type)
+    {
+      case Field::FieldTypes::int32:
+        return_value = serialize_basic<int32>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::int64:
+        return_value = serialize_basic<int64>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::uint32:
+        return_value = serialize_basic<uint32>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::uint64:
+        return_value = serialize_basic<uint64>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::sint32:
+        return_value = serialize_basic<sint32>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::sint64:
+        return_value = serialize_basic<sint64>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::boolean:
+        return_value = serialize_basic<boolean>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::fixed32:
+        return_value = serialize_basic<fixed32>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::fixed64:
+        return_value = serialize_basic<fixed64>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::sfixed32:
+        return_value = serialize_basic<sfixed32>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::sfixed64:
+        return_value = serialize_basic<sfixed64>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::floatfixed:
+        return_value = serialize_basic<floatfixed>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::doublefixed:
+        return_value = serialize_basic<doublefixed>(field, entry, optional, buffer);
+        break;
+
+      case Field::FieldTypes::enumeration:
+      {
+        // The enumerations generated by Embedded Proto are stored as 32 bit unsigned integers. The value is copied as 
+        // the type of the enum is unknown here.
+        uint32_t value = 0;
+        memcpy(&value, field, sizeof(value));
+        if(optional || (0 != value))
+        {
+          return_value = WireFormatter::SerializeTag(entry.tag, entry.tag_size, buffer);
+          if(Error::NO_ERRORS == return_value)
+          {
+            return_value = WireFormatter::SerializeVarint(value, buffer);
+          }
+        }
+        break;
+      }
+
+      default:
+      {
+        // Strings, bytes, messages and repeated fields derive from Field as their first and only base class. The base 
+        // is thus located at the start of the variable.
+        const auto* variable = reinterpret_cast<const Field*>(field);
+        return_value = variable->serialize_with_tag(entry.tag, entry.tag_size, buffer, optional);
+        break;
+      }
+    }
+    return return_value;
+  }
+
+
+  Error MessageInterface::deserialize_table_field(const FieldTableEntry& entry, 
+                                                  const ::EmbeddedProto::WireFormatter::WireType& wire_type,
+                                                  ::EmbeddedProto::ReadBufferInterface& buffer)
+  {
+    Error return_value = Error::NO_ERRORS;
+    uint8_t* field = reinterpret_cast<uint8_t*>(this) + entry.offset;
+
+    switch(entry.type)
+    {
+      case Field::FieldTypes::int32:
+        return_value = deserialize_basic<int32>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::int64:
+        return_value = deserialize_basic<int64>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::uint32:
+        return_value = deserialize_basic<uint32>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::uint64:
+        return_value = deserialize_basic<uint64>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::sint32:
+        return_value = deserialize_basic<sint32>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::sint64:
+        return_value = deserialize_basic<sint64>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::boolean:
+        return_value = deserialize_basic<boolean>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::fixed32:
+        return_value = deserialize_basic<fixed32>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::fixed64:
+        return_value = deserialize_basic<fixed64>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::sfixed32:
+        return_value = deserialize_basic<sfixed32>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::sfixed64:
+        return_value = deserialize_basic<sfixed64>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::floatfixed:
+        return_value = deserialize_basic<floatfixed>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::doublefixed:
+        return_value = deserialize_basic<doublefixed>(field, wire_type, buffer);
+        break;
+
+      case Field::FieldTypes::enumeration:
+      {
+        return_value = WireFormatter::WireType::VARINT == wire_type ? Error::NO_ERRORS : Error::INVALID_WIRETYPE;
+        if(Error::NO_ERRORS == return_value)
+        {
+          uint32_t value = 0;
+          return_value = WireFormatter::DeserializeVarint(buffer, value);
+          if(Error::NO_ERRORS == return_value)
+          {
+            memcpy(field, &value, sizeof(value));
+          }
+        }
+        break;
+      }
+
+      default:
+      {
+        auto* variable = reinterpret_cast<Field*>(field);
+        return_value = variable->deserialize_check_type(buffer, wire_type);
+        break;
+      }
+    }
+    return return_value;
+  }
+
 } // End of namespace EmbeddedProto
@@ -33,6 +33,7 @@
 
 #include "WireFormatter.h"
 #include "Fields.h"
+#include "FieldTable.h"
 #include "Errors.h"
 
 #include <cstdint>
@@ -54,6 +55,11 @@ class MessageInterface : public ::EmbeddedProto::Field
                             ::EmbeddedProto::WriteBufferInterface& buffer,
                             const bool optional) const final;
 
+    //! \see Field::serialize_with_tag()
+    Error serialize_with_tag(const uint8_t* tag, const uint32_t tag_size, 
+                             ::EmbeddedProto::WriteBufferInterface& buffer,
+                             const bool optional) const final;
+
     //! \see Field::deserialize()
     Error deserialize(::EmbeddedProto::ReadBufferInterface& buffer) override = 0;
 
@@ -82,6 +88,43 @@ class MessageInterface : public ::EmbeddedProto::Field
     Error skip_fixed64(::EmbeddedProto::ReadBufferInterface& buffer) const;
     Error skip_length_delimited(::EmbeddedProto::ReadBufferInterface& buffer) const;
 
+    //! Serialize the fields of this message as described by the given table.
+    /*!
+        This function is used by messages generated with the table_driven option.
+
+        \param table The entries describing the fields of the message, in the order they are serialized.
+        \param n_entries The number of entries in the table.
+        \param presence The presence array of the message or nullptr when the message has no optional fields.
+        \param buffer The buffer in which the message is serialized.
+        \return NO_ERROR if everything went ok.
+    */
+    Error serialize_table(const FieldTableEntry* table, const uint32_t n_entries, const uint32_t* presence,
+                          ::EmbeddedProto::WriteBufferInterface& buffer) const;
+
+    //! Deserialize the fields of this message as described by the given table.
+    /*!
+        This function is used by messages generated with the table_driven option.
+
+        \param table The entries describing the fields of the message.
+        \param n_entries The number of entries in the table.
+        \param presence The presence array of the message or nullptr when the message has no optional fields.
+        \param buffer The buffer from which the message is deserialized.
+        \return NO_ERROR if everything went ok.
+    */
+    Error deserialize_table(const FieldTableEntry* table, const uint32_t n_entries, uint32_t* presence,
+                            ::EmbeddedProto::ReadBufferInterface& buffer);
+
+  private:
+
+    //! Serialize a single field described by an entry of the field table.
+    Error serialize_table_field(const FieldTableEntry& entry, const bool optional,
+                                ::EmbeddedProto::WriteBufferInterface& buffer) const;
+
+    //! Deserialize a single field described by an entry of the field table.
+    Error deserialize_table_field(const FieldTableEntry& entry, 
+                                  const ::EmbeddedProto::WireFormatter::WireType& wire_type,
+                                  ::EmbeddedProto::ReadBufferInterface& buffer);
+
 };
 
 } // End of namespace EmbeddedProto
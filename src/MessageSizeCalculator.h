@@ -43,11 +43,12 @@ namespace EmbeddedProto
   /*!
       To calculate the size of a message given the current data a dummy serialization is performed.
       This class mimics the buffer in which the data is stored. Instead of storing it, only the 
-      size is incremented for the bytes pushed. No actual data is pushed into a buffer.
+      size is incremented for the bytes pushed. No actual data is pushed into a buffer. The class is
+      final such that the size calculation does not use virtual function calls.
 
       \see MessageInterface::serialized_size()  
   */
-  class MessageSizeCalculator : public WriteBufferInterface
+  class MessageSizeCalculator final : public WriteBufferInterface
   {
     public:
       MessageSizeCalculator() = default;
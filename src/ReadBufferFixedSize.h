@@ -33,16 +33,18 @@
 
 #include "ReadBufferInterface.h"
 #include <array>
+#include <cstring>
 
 namespace EmbeddedProto 
 {
 
   //! This template class implements the ReadBufferInterface.
   /*!
-      The template sets the number of bytes which fit in the buffer.
+      The template sets the number of bytes which fit in the buffer. The class is final such that the
+      templated deserialize functions of messages call its functions directly.
   */
   template<uint32_t BUFFER_SIZE>
-  class ReadBufferFixedSize : public ::EmbeddedProto::ReadBufferInterface
+  class ReadBufferFixedSize final : public ::EmbeddedProto::ReadBufferInterface
   {
     public:
       //! The default constructor which initializes everything at zero.
@@ -109,6 +111,24 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      //! \see ::EmbeddedProto::ReadBufferInterface::pop_bytes()
+      bool pop_bytes(uint8_t* bytes, const uint32_t length) override
+      {
+        const bool return_value = write_index_ >= (read_index_ + length);
+        if(return_value)
+        {
+          memcpy(bytes, data_.data() + read_index_, length);
+          read_index_ += length;
+        }
+        return return_value;
+      }
+
+      //! \see ::EmbeddedProto::ReadBufferInterface::get_readable_bytes()
+      array_view<const uint8_t> get_readable_bytes() const override
+      {
+        return {data_.data() + read_index_, write_index_ - read_index_};
+      }
+
       //! Return a pointer to the data array. Use set_bytes_written() when adding data to the array.
       uint8_t* get_data()
       {
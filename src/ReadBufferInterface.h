@@ -31,6 +31,8 @@
 #ifndef _READ_BUFFER_INTERFACE_H_
 #define _READ_BUFFER_INTERFACE_H_
 
+#include "Defines.h"
+
 #include <cstdint>
 
 
@@ -89,6 +91,42 @@ namespace EmbeddedProto
       */
       virtual bool pop(uint8_t& byte) = 0;
 
+      //! Obtain the given number of oldest bytes in the buffer and remove them from the buffer.
+      /*!
+          This function will alter the internal read index.
+
+          The default implementation pops the bytes one at a time. Buffers holding their data in an 
+          array are advised to override this function and copy all bytes at once.
+
+          \param[out] bytes Pointer to an array in which length bytes fit.
+          \param[in] length The number of bytes to obtain.
+          \return True when the buffer held length bytes or more.
+      */
+      virtual bool pop_bytes(uint8_t* bytes, const uint32_t length)
+      {
+        bool result = true;
+        for(uint32_t i = 0; (i < length) && result; ++i)
+        {
+          result = pop(bytes[i]);
+        }
+        return result;
+      }
+
+      //! Obtain direct access to the oldest bytes in the buffer when they are stored contiguously.
+      /*!
+          This function will not alter the buffer read index. Use advance() to remove the bytes used.
+
+          The default implementation returns an empty view. Buffers holding their data in an array 
+          are advised to override this function. Code reading the buffer then no longer has to obtain 
+          the bytes one at a time.
+
+          \return A view on the bytes which can be read directly, empty when not supported.
+      */
+      virtual array_view<const uint8_t> get_readable_bytes() const
+      {
+        return {nullptr, 0};
+      }
+
   };
 
 } // End of namespace EmbeddedProto
@@ -98,4 +98,22 @@ namespace EmbeddedProto
     return result;
   }
 
+  bool ReadBufferSection::pop_bytes(uint8_t* bytes, const uint32_t length)
+  {
+    bool result = length <= size_;
+    if(result)
+    {
+      result = buffer_.pop_bytes(bytes, length);
+      size_ -= length;
+    }
+    return result;
+  }
+
+  array_view<const uint8_t> ReadBufferSection::get_readable_bytes() const
+  {
+    array_view<const uint8_t> bytes = buffer_.get_readable_bytes();
+    bytes.size = std::min(bytes.size, size_);
+    return bytes;
+  }
+
 } // End of namespace EmbeddedProto
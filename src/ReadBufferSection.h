@@ -100,6 +100,16 @@ namespace EmbeddedProto
       */
       bool pop(uint8_t& byte) override;
 
+      //! Decrement the size and pop the next length bytes from the parent buffer.
+      /*!
+        Nothing is obtained if the section holds less than length bytes.
+        \return True when the section held length bytes or more.
+      */
+      bool pop_bytes(uint8_t* bytes, const uint32_t length) override;
+
+      //! Expose the readable bytes of the parent buffer, limited to the size of this section.
+      array_view<const uint8_t> get_readable_bytes() const override;
+
     private:
 
       //! A reference to the buffer containing the actual data.
@@ -67,6 +67,21 @@ namespace EmbeddedProto
           !(std::is_base_of<MessageInterface, DATA_TYPE>::value
             || std::is_base_of<internal::BaseStringBytes, DATA_TYPE>::value);
 
+    //! Definition of a trait to check if DATA_TYPE is NOT a fixed width FieldTemplate.
+    template<typename>
+    struct is_fixed_width_FieldTemplate : std::false_type {};
+
+    //! Definition of a trait to check if DATA_TYPE is a fixed width FieldTemplate holding only the value, like float.
+    template<Field::FieldTypes F, typename V, WireFormatter::WireType W>
+    struct is_fixed_width_FieldTemplate<::EmbeddedProto::FieldTemplate<F,V,W>> 
+      : std::integral_constant<bool, ((WireFormatter::WireType::FIXED32 == W) 
+                                      || (WireFormatter::WireType::FIXED64 == W))
+                                     && (sizeof(::EmbeddedProto::FieldTemplate<F,V,W>) == sizeof(V))> {};
+
+    //! On little endian targets an array of fixed width fields in memory is identical to the packed data on the wire.
+    static constexpr bool REPEATED_FIELD_IS_BULK_COPIED = IS_LITTLE_ENDIAN 
+                                                          && is_fixed_width_FieldTemplate<DATA_TYPE>::value;
+
     public:
 
       RepeatedField() = default;
@@ -153,19 +168,49 @@ namespace EmbeddedProto
 
       //! \see Field::serialize_with_id()
       Error serialize_with_id(uint32_t field_number, WriteBufferInterface& buffer, const bool optional) const final
+      {
+        uint8_t tag[WireFormatter::MAX_TAG_SIZE];
+        const uint32_t tag_size = WireFormatter::EncodeTag(field_number, 
+                                                           WireFormatter::WireType::LENGTH_DELIMITED, tag);
+        return serialize_with_tag(tag, tag_size, buffer, optional);
+      }
+
+      //! \see Field::serialize_with_tag()
+      Error serialize_with_tag(const uint8_t* tag, const uint32_t tag_size, WriteBufferInterface& buffer, 
+                               const bool optional) const final
       {
         Error return_value = Error::NO_ERRORS;
 
-        if(REPEATED_FIELD_IS_PACKED)
+        if(REPEATED_FIELD_IS_PACKED && (nullptr != buffer.get_data()))
+        {
+          // Serialize the elements in a single pass and write the length in front of them afterwards.
+          if((0 < this->get_length()) || optional)
+          {
+            const uint32_t start = buffer.get_size();
+            return_value = WireFormatter::SerializeTagReserveLength(tag, tag_size, buffer);
+            if(Error::NO_ERRORS == return_value)
+            {
+              return_value = serialize_packed(buffer);
+            }
+
+            if(Error::NO_ERRORS == return_value)
+            {
+              return_value = WireFormatter::SerializeReservedLength(start, tag_size, buffer, optional);
+            }
+            else
+            {
+              buffer.set_size(start);
+            }
+          }
+        }
+        else if(REPEATED_FIELD_IS_PACKED)
         {
           // Use the packed way of serialization for base fields.
           // See if there is data to serialize.
           const uint32_t size_x = this->serialized_size_packed();
           if((0 < size_x) || optional)
           {
-            uint32_t tag = WireFormatter::MakeTag(field_number, 
-                                          WireFormatter::WireType::LENGTH_DELIMITED);
-            return_value = WireFormatter::SerializeVarint(tag, buffer);
+            return_value = WireFormatter::SerializeTag(tag, tag_size, buffer);
             if(Error::NO_ERRORS == return_value) 
             {
               return_value = WireFormatter::SerializeVarint(size_x, buffer);
@@ -184,12 +229,22 @@ namespace EmbeddedProto
             }
           }
         }
+        else if(nullptr != buffer.get_data())
+        {
+          // Serialize the elements in a single pass, removing them all again when they do not fit.
+          const uint32_t start = buffer.get_size();
+          return_value = serialize_unpacked(tag, tag_size, buffer);
+          if(Error::NO_ERRORS != return_value)
+          {
+            buffer.set_size(start);
+          }
+        }
         else 
         {
-          const uint32_t size_x = this->serialized_size_unpacked(field_number);
+          const uint32_t size_x = this->serialized_size_unpacked(tag, tag_size);
           if(size_x <= buffer.get_available_size()) 
           {
-            return_value = serialize_unpacked(field_number, buffer);
+            return_value = serialize_unpacked(tag, tag_size, buffer);
           }
           else 
           {
@@ -249,10 +304,10 @@ namespace EmbeddedProto
       /*!
           \return The number of bytes this field will require once serialized.
       */
-      uint32_t serialized_size_unpacked(int32_t field_number) const 
+      uint32_t serialized_size_unpacked(const uint8_t* tag, const uint32_t tag_size) const 
       {
         ::EmbeddedProto::MessageSizeCalculator calcBuffer;
-        serialize_unpacked(field_number, calcBuffer);
+        serialize_unpacked(tag, tag_size, calcBuffer);
         return calcBuffer.get_size();
       }
 
@@ -302,34 +357,74 @@ namespace EmbeddedProto
 
 #endif // End of MSG_TO_STRING
 
+    protected:
+
+      //! Obtain a pointer to the first element when all elements are stored in one contiguous array.
+      /*!
+          This is used to copy arrays of fixed width fields to and from the buffer at once.
+          \return A pointer to the first element or nullptr when the elements are not stored in an array.
+      */
+      virtual DATA_TYPE* get_contiguous_data() { return nullptr; }
+
+      //! \see get_contiguous_data()
+      virtual const DATA_TYPE* get_contiguous_data() const { return nullptr; }
+
     private:
 
       Error serialize_packed(WriteBufferInterface& buffer) const
       {
         Error return_value = Error::NO_ERRORS;
-        for(uint32_t i = 0; (i < this->get_length()) && (Error::NO_ERRORS == return_value); ++i)
+        const DATA_TYPE* data = REPEATED_FIELD_IS_BULK_COPIED ? this->get_contiguous_data() : nullptr;
+        if(nullptr != data)
         {
-          return_value = this->get_const(i).serialize(buffer);
+          // Push the whole array at once.
+          const auto* pVoid = static_cast<const void*>(data);
+          const bool result = buffer.push(static_cast<const uint8_t*>(pVoid), 
+                                          this->get_length() * static_cast<uint32_t>(sizeof(DATA_TYPE)));
+          return_value = result ? Error::NO_ERRORS : Error::BUFFER_FULL;
+        }
+        else 
+        {
+          for(uint32_t i = 0; (i < this->get_length()) && (Error::NO_ERRORS == return_value); ++i)
+          {
+            return_value = this->get_const(i).serialize(buffer);
+          }
         }
         return return_value;
       }
 
-      Error serialize_unpacked(uint32_t field_number, WriteBufferInterface& buffer) const
+      Error serialize_unpacked(const uint8_t* tag, const uint32_t tag_size, WriteBufferInterface& buffer) const
       {
         Error return_value = Error::NO_ERRORS;
+        const bool single_pass = nullptr != buffer.get_data();
         for(uint32_t i = 0; (i < this->get_length()) && (Error::NO_ERRORS == return_value); ++i)
         {
-          const uint32_t size_x = this->get_const(i).serialized_size();
-          uint32_t tag = WireFormatter::MakeTag(field_number, 
-                                    WireFormatter::WireType::LENGTH_DELIMITED);
-          return_value = WireFormatter::SerializeVarint(tag, buffer);
-          if(Error::NO_ERRORS == return_value)
+          if(single_pass)
           {
-            return_value = WireFormatter::SerializeVarint(size_x, buffer);
-            if((Error::NO_ERRORS == return_value) && (0 < size_x)) 
+            // Write the length of each element after the element has been serialized.
+            const uint32_t start = buffer.get_size();
+            return_value = WireFormatter::SerializeTagReserveLength(tag, tag_size, buffer);
+            if(Error::NO_ERRORS == return_value)
             {
               return_value = this->get_const(i).serialize(buffer);
             }
+            if(Error::NO_ERRORS == return_value)
+            {
+              return_value = WireFormatter::SerializeReservedLength(start, tag_size, buffer, true);
+            }
+          }
+          else
+          {
+            const uint32_t size_x = this->get_const(i).calculate_serialized_size();
+            return_value = WireFormatter::SerializeTag(tag, tag_size, buffer);
+            if(Error::NO_ERRORS == return_value)
+            {
+              return_value = WireFormatter::SerializeVarint(size_x, buffer);
+              if((Error::NO_ERRORS == return_value) && (0 < size_x)) 
+              {
+                return_value = this->get_const(i).serialize(buffer);
+              }
+            }
           }
         }
         return return_value;
@@ -340,22 +435,43 @@ namespace EmbeddedProto
         uint32_t size = 0;
         Error return_value = WireFormatter::DeserializeVarint(buffer, size);
         ReadBufferSection bufferSection(buffer, size);
-        DATA_TYPE x;
-        
-        return_value = x.deserialize(bufferSection);
-        while(Error::NO_ERRORS == return_value)
+
+        // Fixed width elements are copied from the buffer at once when they all fit in the array.
+        DATA_TYPE* data = REPEATED_FIELD_IS_BULK_COPIED ? this->get_contiguous_data() : nullptr;
+        const uint32_t length = this->get_length();
+        const uint32_t n_bytes = bufferSection.get_size();
+        const uint32_t n_elements = n_bytes / static_cast<uint32_t>(sizeof(DATA_TYPE));
+        if((nullptr != data) && (0 == (n_bytes % sizeof(DATA_TYPE))) 
+           && (n_elements <= (this->get_max_length() - length)))
         {
-          return_value = this->add(x);
-          if(Error::NO_ERRORS == return_value)
+          auto* pVoid = static_cast<void*>(data + length);
+          return_value = bufferSection.pop_bytes(static_cast<uint8_t*>(pVoid), n_bytes) ? Error::NO_ERRORS 
+                                                                                   : Error::END_OF_BUFFER;
+          if((Error::NO_ERRORS == return_value) && (0 < n_elements))
           {
-            return_value = x.deserialize(bufferSection);
+            // Getting the last element extends the length of the array up to it.
+            this->get(length + n_elements - 1);
           }
         }
-
-        // We expect the buffersection to be empty, in that case everything is fine..
-        if(Error::END_OF_BUFFER == return_value)
+        else 
         {
-          return_value = Error::NO_ERRORS;
+          DATA_TYPE x;
+          
+          return_value = x.deserialize(bufferSection);
+          while(Error::NO_ERRORS == return_value)
+          {
+            return_value = this->add(x);
+            if(Error::NO_ERRORS == return_value)
+            {
+              return_value = x.deserialize(bufferSection);
+            }
+          }
+
+          // We expect the buffersection to be empty, in that case everything is fine..
+          if(Error::END_OF_BUFFER == return_value)
+          {
+            return_value = Error::NO_ERRORS;
+          }
         }
 
         return return_value;
@@ -38,6 +38,7 @@
 #include <cstring>
 #include <algorithm>
 #include <array>
+#include <utility>
 
 
 namespace EmbeddedProto
@@ -65,6 +66,13 @@ namespace EmbeddedProto
         // Use the initializer list.
       }
 
+      RepeatedFieldFixedSize(RepeatedFieldFixedSize<DATA_TYPE, MAX_LENGTH>&& rhs) noexcept :
+        current_length_(rhs.current_length_),
+        data_(std::move(rhs.data_))
+      {
+        // Use the initializer list.
+      }
+
       template<uint32_t MAX_LENGTH_RHS, typename std::enable_if<(MAX_LENGTH_RHS < MAX_LENGTH), int>::type = 0>
       explicit RepeatedFieldFixedSize(const RepeatedFieldFixedSize<DATA_TYPE, MAX_LENGTH_RHS>& rhs) :
         current_length_(rhs.get_length())
@@ -85,15 +93,22 @@ namespace EmbeddedProto
       RepeatedFieldFixedSize<DATA_TYPE, MAX_LENGTH>& operator=(const 
                                                 RepeatedFieldFixedSize<DATA_TYPE, MAX_LENGTH>& rhs)
       {
-        for(uint32_t i = 0; i < rhs.get_length(); ++i) 
-        {
-          data_[i] = rhs.get_const(i);
-        }
-        current_length_ = rhs.get_length();
+        std::copy(rhs.data_.begin(), rhs.data_.begin() + rhs.current_length_, data_.begin());
+        current_length_ = rhs.current_length_;
         
         return *this;
       }
 
+      //! Move the elements of one repeated field into the other, for example nested messages.
+      RepeatedFieldFixedSize<DATA_TYPE, MAX_LENGTH>& operator=(
+                                                RepeatedFieldFixedSize<DATA_TYPE, MAX_LENGTH>&& rhs) noexcept
+      {
+        std::move(rhs.data_.begin(), rhs.data_.begin() + rhs.current_length_, data_.begin());
+        current_length_ = rhs.current_length_;
+
+        return *this;
+      }
+
       //! Obtain the total number of DATA_TYPE items in the array.
       uint32_t get_length() const override { return current_length_; }
 
@@ -193,6 +208,14 @@ namespace EmbeddedProto
       //! Return a reference to the internal data storage array.
       const std::array<DATA_TYPE, MAX_LENGTH>& get_data_const() const { return data_; }
 
+    protected:
+
+      //! \see RepeatedField::get_contiguous_data()
+      DATA_TYPE* get_contiguous_data() override { return data_.data(); }
+
+      //! \see RepeatedField::get_contiguous_data()
+      const DATA_TYPE* get_contiguous_data() const override { return data_.data(); }
+
     private:
 
       //! Number of item in the data array.
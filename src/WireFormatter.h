@@ -37,6 +37,7 @@
 #include "Errors.h"
 
 #include <cstdint>
+#include <cstring>
 #include <math.h> 
 #include <type_traits>
 #include <limits>
@@ -46,6 +47,12 @@ namespace EmbeddedProto
 {
 
   //! This class combines functions to serialize and deserialize messages.
+  /*!
+      The functions are templates over the type of buffer, a WriteBufferInterface or ReadBufferInterface
+      or a class derived from them. When called with a buffer class which is final, like 
+      WriteBufferFixedSize, the compiler calls the functions of the buffer directly and is able to 
+      inline them. Otherwise the virtual functions of the interface are used.
+  */
   class WireFormatter 
   {
 
@@ -55,6 +62,9 @@ namespace EmbeddedProto
       //! Definition of a mask indicating the most significant bit used in varint encoding.
       static constexpr uint8_t VARINT_MSB_BYTE = 0x80;
 
+      //! Values below this limit are serialized as a varint of at most two bytes.
+      static constexpr uint16_t VARINT_TWO_BYTE_LIMIT = 0x4000;
+
       //! Convert the floating point number to the next highes integer.
       /*!
         The ceil function in std is not a constexpr. Some compilers doe not accept this.
@@ -69,6 +79,42 @@ namespace EmbeddedProto
               : static_cast<int32_t>(num) + ((num > 0) ? 1 : 0);
       }
 
+      //! Add the byte at INDEX of a varint in memory to the value, followed by the bytes after it.
+      /*!
+        The first bytes of the varint, up to START, have already been added to the value. The most 
+        significant bit of the last of them is still set. The recursion is resolved at compile time 
+        which results in an unrolled decoder with a single branch for each byte. Instead of masking 
+        each byte, the most significant bit of the previous byte, which is set when this byte is 
+        reached, is subtracted.
+
+        \param[in] bytes The memory holding at least N_BYTES - START bytes, starting with byte START.
+        \param[in,out] value The value decoded so far.
+        \return The number of bytes used from memory. When the last of these still has the most 
+                significant bit set the varint is too long.
+      */
+      template<class UINT_TYPE, uint8_t START, uint8_t INDEX, uint8_t N_BYTES>
+      struct VarintDecoder
+      {
+        static uint8_t decode(const uint8_t* bytes, UINT_TYPE& value)
+        {
+          const uint8_t byte = bytes[INDEX - START];
+          value += (static_cast<UINT_TYPE>(byte) << (INDEX * VARINT_SHIFT_N_BITS)) 
+                   - (static_cast<UINT_TYPE>(VARINT_MSB_BYTE) << ((INDEX - 1) * VARINT_SHIFT_N_BITS));
+          return (byte & VARINT_MSB_BYTE) ? VarintDecoder<UINT_TYPE, START, INDEX + 1, N_BYTES>::decode(bytes, value)
+                                          : INDEX + 1 - START;
+        }
+      };
+
+      //! All bytes a varint can have are decoded.
+      template<class UINT_TYPE, uint8_t START, uint8_t N_BYTES>
+      struct VarintDecoder<UINT_TYPE, START, N_BYTES, N_BYTES>
+      {
+        static uint8_t decode(const uint8_t*, UINT_TYPE&)
+        {
+          return N_BYTES - START;
+        }
+      };
+
     public:
       //! Definitions of the different encoding types used in protobuf.
       enum class WireType 
@@ -138,28 +184,35 @@ namespace EmbeddedProto
       **/
 
       //! Serialize an unsigned fixed length field without the tag.
-      template<class UINT_TYPE>
-      static Error SerializeFixedNoTag(const UINT_TYPE value, WriteBufferInterface& buffer)
+      template<class UINT_TYPE, class BUFFER_TYPE>
+      static Error SerializeFixedNoTag(const UINT_TYPE value, BUFFER_TYPE& buffer)
       {
         static_assert(std::is_same<UINT_TYPE, uint32_t>::value || 
                       std::is_same<UINT_TYPE, uint64_t>::value, "Wrong type passed to SerializeFixedNoTag.");
 
         // Push the data little endian to the buffer.
-        // TODO Define a little endian flag to support memcpy the data to the buffer.
-
         bool result = true;
 
-        // Loop over all bytes in the integer.
-        for(uint8_t i = 0; (i < std::numeric_limits<UINT_TYPE>::digits) && result; i += 8) {
-          // Shift the value using the current value of i.
-          result = buffer.push(static_cast<uint8_t>((value >> i) & 0x00FF));
+        if(IS_LITTLE_ENDIAN)
+        {
+          // The value is stored in memory as it is on the wire, push all bytes at once.
+          const auto* pVoid = static_cast<const void*>(&value);
+          result = buffer.push(static_cast<const uint8_t*>(pVoid), sizeof(UINT_TYPE));
+        }
+        else
+        {
+          // Loop over all bytes in the integer.
+          for(uint8_t i = 0; (i < std::numeric_limits<UINT_TYPE>::digits) && result; i += 8) {
+            // Shift the value using the current value of i.
+            result = buffer.push(static_cast<uint8_t>((value >> i) & 0x00FF));
+          }
         }
         return result ? Error::NO_ERRORS : Error::BUFFER_FULL;
       }
 
       //! Serialize a signed fixed length field without the tag.
-      template<class INT_TYPE>
-      static Error SerialzieSFixedNoTag(const INT_TYPE value, WriteBufferInterface& buffer)
+      template<class INT_TYPE, class BUFFER_TYPE>
+      static Error SerialzieSFixedNoTag(const INT_TYPE value, BUFFER_TYPE& buffer)
       {
         static_assert(std::is_same<INT_TYPE, int32_t>::value || 
                       std::is_same<INT_TYPE, int64_t>::value, "Wrong type passed to SerialzieSFixedNoTag.");
@@ -170,7 +223,8 @@ namespace EmbeddedProto
       }
 
       //! Serialize a 32bit real value without tag.
-      static Error SerialzieFloatNoTag(const float value, WriteBufferInterface& buffer)
+      template<class BUFFER_TYPE>
+      static Error SerialzieFloatNoTag(const float value, BUFFER_TYPE& buffer)
       {
         // Cast the type to void and to a 32 fixed number
         const auto* pVoid = static_cast<const void*>(&value);
@@ -179,7 +233,8 @@ namespace EmbeddedProto
       }
 
       //! Serialize a 64bit real value without tag.
-      static Error SerialzieDoubleNoTag(const double value, WriteBufferInterface& buffer)
+      template<class BUFFER_TYPE>
+      static Error SerialzieDoubleNoTag(const double value, BUFFER_TYPE& buffer)
       {
         // Cast the type to void and to a 64 fixed number
         const auto* pVoid = static_cast<const void*>(&value);
@@ -193,9 +248,9 @@ namespace EmbeddedProto
          @brief Serialize fields, including tags to the given buffer.
          @{
       **/
-      template<class INT_TYPE>
+      template<class INT_TYPE, class BUFFER_TYPE>
       static Error SerializeInt(const uint32_t field_number, const INT_TYPE value, 
-                                WriteBufferInterface& buffer)
+                                BUFFER_TYPE& buffer)
       {        
         using UINT_TYPE = typename std::make_unsigned<INT_TYPE>::type;
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::VARINT), buffer);
@@ -206,9 +261,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
-      template<class UINT_TYPE>
+      template<class UINT_TYPE, class BUFFER_TYPE>
       static Error SerializeUInt(const uint32_t field_number, const UINT_TYPE value, 
-                                WriteBufferInterface& buffer)
+                                BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::VARINT), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -218,9 +273,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
-      template<class INT_TYPE>
+      template<class INT_TYPE, class BUFFER_TYPE>
       static Error SerializeSInt(const uint32_t field_number, const INT_TYPE value, 
-                                 WriteBufferInterface& buffer)
+                                 BUFFER_TYPE& buffer)
       {
          Error return_value = SerializeVarint(MakeTag(field_number, WireType::VARINT), buffer);
          if(Error::NO_ERRORS == return_value)
@@ -230,8 +285,9 @@ namespace EmbeddedProto
         return return_value;
       }
       
+      template<class BUFFER_TYPE>
       static Error SerializeFixed(const uint32_t field_number, const uint32_t value, 
-                                  WriteBufferInterface& buffer)
+                                  BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::FIXED32), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -241,8 +297,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeFixed(const uint32_t field_number, const uint64_t value, 
-                                  WriteBufferInterface& buffer)
+                                  BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::FIXED64), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -252,8 +309,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeSFixed(const uint32_t field_number, const int32_t value, 
-                                   WriteBufferInterface& buffer)
+                                   BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::FIXED32), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -263,8 +321,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeSFixed(const uint32_t field_number, const int64_t value, 
-                                   WriteBufferInterface& buffer)
+                                   BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::FIXED64), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -274,8 +333,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeFloat(const uint32_t field_number, const float value, 
-                                  WriteBufferInterface& buffer)
+                                  BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::FIXED32), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -285,8 +345,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeDouble(const uint32_t field_number, const double value, 
-                                   WriteBufferInterface& buffer)
+                                   BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::FIXED64), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -296,8 +357,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeBool(const uint32_t field_number, const bool value, 
-                                 WriteBufferInterface& buffer)
+                                 BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::VARINT), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -308,8 +370,9 @@ namespace EmbeddedProto
         return return_value;
       }
 
+      template<class BUFFER_TYPE>
       static Error SerializeEnum(const uint32_t field_number, const uint32_t value, 
-                                 WriteBufferInterface& buffer)
+                                 BUFFER_TYPE& buffer)
       {
         Error return_value = SerializeVarint(MakeTag(field_number, WireType::VARINT), buffer);
         if(Error::NO_ERRORS == return_value)
@@ -333,7 +396,8 @@ namespace EmbeddedProto
           \param[out] id This parameter returns the next field id.
           \return A value from the EmbeddedProto::Error enum indicating if the process succeeded.
       */
-      static Error DeserializeTag(ReadBufferInterface& buffer, WireType& type, uint32_t& id) 
+      template<class BUFFER_TYPE>
+      static Error DeserializeTag(BUFFER_TYPE& buffer, WireType& type, uint32_t& id) 
       {
         uint32_t temp_value;
         // Read the next varint considered to be a tag.
@@ -341,23 +405,36 @@ namespace EmbeddedProto
         
         if(Error::NO_ERRORS == return_value) 
         {
-          // Next check the validity of the wire type.
-          if((temp_value &  0x07) <= static_cast<uint32_t>(WireType::FIXED32))
-          {
-            // If reading the tag succeeded and the wire type is a valid one.
-            type = static_cast<WireType>(temp_value &  0x07);
-            id = (temp_value >> 3);
-          }
-          else 
-          {
-            return_value = Error::INVALID_WIRETYPE;
-          }
+          return_value = DecodeTag(temp_value, type, id);
         }
         return return_value;
       }
 
-      template<class UINT_TYPE>
-      static Error DeserializeUInt(ReadBufferInterface& buffer, UINT_TYPE& value) 
+      //! Split a tag already read from the buffer into the wiretype and field id.
+      /*!
+          \param[in] tag The value of the tag as read from the buffer.
+          \param[out] type This parameter returns the wiretype in the tag.
+          \param[out] id This parameter returns the field id in the tag.
+          \return A value from the EmbeddedProto::Error enum indicating if the wiretype is valid.
+      */
+      static Error DecodeTag(const uint32_t tag, WireType& type, uint32_t& id)
+      {
+        Error return_value = Error::NO_ERRORS;
+        // Check the validity of the wire type.
+        if((tag &  0x07) <= static_cast<uint32_t>(WireType::FIXED32))
+        {
+          type = static_cast<WireType>(tag &  0x07);
+          id = (tag >> 3);
+        }
+        else 
+        {
+          return_value = Error::INVALID_WIRETYPE;
+        }
+        return return_value;
+      }
+
+      template<class UINT_TYPE, class BUFFER_TYPE>
+      static Error DeserializeUInt(BUFFER_TYPE& buffer, UINT_TYPE& value) 
       {
         static_assert(std::is_same<UINT_TYPE, uint32_t>::value || 
                       std::is_same<UINT_TYPE, uint64_t>::value, "Wrong type passed to DeserializeUInt.");
@@ -365,8 +442,8 @@ namespace EmbeddedProto
         return DeserializeVarint(buffer, value);
       }
 
-      template<class INT_TYPE>
-      static Error DeserializeInt(ReadBufferInterface& buffer, INT_TYPE& value) 
+      template<class INT_TYPE, class BUFFER_TYPE>
+      static Error DeserializeInt(BUFFER_TYPE& buffer, INT_TYPE& value) 
       {
         static_assert(std::is_same<INT_TYPE, int32_t>::value || 
                       std::is_same<INT_TYPE, int64_t>::value, "Wrong type passed to DeserializeInt.");
@@ -382,8 +459,8 @@ namespace EmbeddedProto
         return result;
       }
 
-      template<class INT_TYPE>
-      static Error DeserializeSInt(ReadBufferInterface& buffer, INT_TYPE& value) 
+      template<class INT_TYPE, class BUFFER_TYPE>
+      static Error DeserializeSInt(BUFFER_TYPE& buffer, INT_TYPE& value) 
       {
         static_assert(std::is_same<INT_TYPE, int32_t>::value || 
                       std::is_same<INT_TYPE, int64_t>::value, "Wrong type passed to DeserializeSInt.");
@@ -401,25 +478,33 @@ namespace EmbeddedProto
         return result;
       }
 
-      template<class TYPE>
-      static Error DeserializeFixed(ReadBufferInterface& buffer, TYPE& value) 
+      template<class TYPE, class BUFFER_TYPE>
+      static Error DeserializeFixed(BUFFER_TYPE& buffer, TYPE& value) 
       {
         static_assert(std::is_same<TYPE, uint32_t>::value || 
                       std::is_same<TYPE, uint64_t>::value, "Wrong type passed to DeserializeFixed.");
 
         // Deserialize the data little endian to the buffer.
-        // TODO Define a little endian flag to support memcpy the data from the buffer.
-
         TYPE temp_value = 0;
         bool result(true);
-        uint8_t byte = 0;
-        for(uint8_t i = 0; (i < std::numeric_limits<TYPE>::digits) && result; 
-            i += std::numeric_limits<uint8_t>::digits)  
+
+        if(IS_LITTLE_ENDIAN)
         {
-          result = buffer.pop(byte);
-          if(result)
+          // The bytes on the wire are the value as stored in memory, pop all of them at once.
+          auto* pVoid = static_cast<void*>(&temp_value);
+          result = buffer.pop_bytes(static_cast<uint8_t*>(pVoid), sizeof(TYPE));
+        }
+        else
+        {
+          uint8_t byte = 0;
+          for(uint8_t i = 0; (i < std::numeric_limits<TYPE>::digits) && result; 
+              i += std::numeric_limits<uint8_t>::digits)  
           {
-            temp_value |= (static_cast<TYPE>(byte) << i);
+            result = buffer.pop(byte);
+            if(result)
+            {
+              temp_value |= (static_cast<TYPE>(byte) << i);
+            }
           }
         }
 
@@ -436,8 +521,8 @@ namespace EmbeddedProto
         return return_value;
       }
 
-      template<class STYPE>
-      static Error DeserializeSFixed(ReadBufferInterface& buffer, STYPE& value) 
+      template<class STYPE, class BUFFER_TYPE>
+      static Error DeserializeSFixed(BUFFER_TYPE& buffer, STYPE& value) 
       {
         static_assert(std::is_same<STYPE, int32_t>::value || 
                       std::is_same<STYPE, int64_t>::value, "Wrong type passed to DeserializeSFixed.");
@@ -453,7 +538,8 @@ namespace EmbeddedProto
         return result;
       }
 
-      static Error DeserializeFloat(ReadBufferInterface& buffer, float& value) 
+      template<class BUFFER_TYPE>
+      static Error DeserializeFloat(BUFFER_TYPE& buffer, float& value) 
       {
         uint32_t temp_value = 0;
         Error result = DeserializeFixed(buffer, temp_value);
@@ -467,7 +553,8 @@ namespace EmbeddedProto
         return result;
       }
 
-      static Error DeserializeDouble(ReadBufferInterface& buffer, double& value) 
+      template<class BUFFER_TYPE>
+      static Error DeserializeDouble(BUFFER_TYPE& buffer, double& value) 
       {
         uint64_t temp_value = 0;
         Error result = DeserializeFixed(buffer, temp_value);
@@ -481,7 +568,8 @@ namespace EmbeddedProto
         return result;
       }
 
-      static Error DeserializeBool(ReadBufferInterface& buffer, bool& value) 
+      template<class BUFFER_TYPE>
+      static Error DeserializeBool(BUFFER_TYPE& buffer, bool& value) 
       {
         uint8_t byte;
         Error result = Error::NO_ERRORS;
@@ -496,8 +584,8 @@ namespace EmbeddedProto
         return result;
       }
 
-      template<class ENUM_TYPE>
-      static Error DeserializeEnum(ReadBufferInterface& buffer, ENUM_TYPE& value) 
+      template<class ENUM_TYPE, class BUFFER_TYPE>
+      static Error DeserializeEnum(BUFFER_TYPE& buffer, ENUM_TYPE& value) 
       {
         static_assert(std::is_enum<ENUM_TYPE>::value, "No enum given to DeserializeEnum parameter value.");
         uint64_t temp_value;
@@ -519,22 +607,159 @@ namespace EmbeddedProto
         \param[in] buffer A reference to a message buffer object in which to store the variable.
         \return A value from the Error enum, NO_ERROR in case everything is fine.
       */
-      template<class UINT_TYPE>
-      static Error SerializeVarint(UINT_TYPE value, WriteBufferInterface& buffer) 
+      template<class UINT_TYPE, class BUFFER_TYPE>
+      static Error SerializeVarint(UINT_TYPE value, BUFFER_TYPE& buffer) 
       {
         static_assert(std::is_same<UINT_TYPE, uint32_t>::value || 
                       std::is_same<UINT_TYPE, uint64_t>::value, 
                       "Wrong type passed to SerializeVarint.");
 
+        // Most tags, lengths and small values take one or two bytes. These are pushed directly.
         bool memory_free = true;
-        while((value >= VARINT_MSB_BYTE) && memory_free) 
+        if(VARINT_MSB_BYTE > value)
+        {
+          memory_free = buffer.push(static_cast<uint8_t>(value));
+        }
+        else if(VARINT_TWO_BYTE_LIMIT > value)
+        {
+          const bool first = buffer.push(static_cast<uint8_t>(value | VARINT_MSB_BYTE));
+          memory_free = buffer.push(static_cast<uint8_t>(value >> VARINT_SHIFT_N_BITS)) && first;
+        }
+        else
+        {
+          return SerializeMultiByteVarint(value, buffer);
+        }
+        return memory_free ? Error::NO_ERRORS : Error::BUFFER_FULL;
+      }
+
+      //! Calculate the number of bytes a value takes when serialized as a varint.
+      /*!
+        \param[in] value The unsigned integer, uint32_t or uint64_t.
+        \return The number of bytes, from one up to five for uint32_t or ten for uint64_t.
+      */
+      template<class UINT_TYPE>
+      static uint32_t VarintSize(UINT_TYPE value)
+      {
+        uint32_t n_bytes = 1;
+        while(value >= VARINT_MSB_BYTE)
         {
-          memory_free = buffer.push(static_cast<uint8_t>(value | VARINT_MSB_BYTE));
           value >>= VARINT_SHIFT_N_BITS;
+          ++n_bytes;
         }
-        memory_free = buffer.push(static_cast<uint8_t>(value));
+        return n_bytes;
+      }
 
-        const Error return_value = memory_free ? Error::NO_ERRORS : Error::BUFFER_FULL;
+      //! Encode a value as a varint in the given memory.
+      /*!
+        \param[in] value The unsigned integer, uint32_t or uint64_t.
+        \param[in] n_bytes The size of the varint as given by VarintSize().
+        \param[out] bytes The memory in which the varint is written, at least n_bytes long.
+      */
+      template<class UINT_TYPE>
+      static void EncodeVarint(UINT_TYPE value, const uint32_t n_bytes, uint8_t* bytes)
+      {
+        const uint32_t last = n_bytes - 1;
+        for(uint32_t i = 0; i < last; ++i)
+        {
+          bytes[i] = static_cast<uint8_t>(value | VARINT_MSB_BYTE);
+          value >>= VARINT_SHIFT_N_BITS;
+        }
+        bytes[last] = static_cast<uint8_t>(value);
+      }
+
+      //! The maximum number of bytes of a tag, being a varint of 32 bits.
+      static constexpr uint32_t MAX_TAG_SIZE = 5;
+
+      //! Encode the tag of a field as a varint in the given array.
+      /*!
+        \param[in] field_number The number of the field.
+        \param[in] type The wire type of the field.
+        \param[out] bytes The array in which the encoded tag is stored.
+        \return The number of bytes used in the array.
+      */
+      static uint32_t EncodeTag(const uint32_t field_number, const WireType type, 
+                                uint8_t (&bytes)[MAX_TAG_SIZE])
+      {
+        const uint32_t value = MakeTag(field_number, type);
+        const uint32_t n_bytes = VarintSize(value);
+        EncodeVarint(value, n_bytes, bytes);
+        return n_bytes;
+      }
+
+      //! Serialize a tag which has already been encoded as a varint.
+      /*!
+        The bytes are pushed at once instead of encoding the tag byte by byte.
+
+        \param[in] tag The encoded tag, for example TagBytes::DATA.
+        \param[in] tag_size The number of bytes in the tag.
+        \param[in] buffer A reference to a message buffer object in which to store the tag.
+        \return A value from the Error enum, NO_ERROR in case everything is fine.
+      */
+      template<class BUFFER_TYPE>
+      static Error SerializeTag(const uint8_t* tag, const uint32_t tag_size, BUFFER_TYPE& buffer)
+      {
+        return buffer.push(tag, tag_size) ? Error::NO_ERRORS : Error::BUFFER_FULL;
+      }
+
+      //! Serialize the tag of a length delimited field and reserve a single byte for its length.
+      /*!
+        This is used with buffers which give access to their data, see WriteBufferInterface::get_data(). 
+        After the data of the field has been serialized SerializeReservedLength() writes the length.
+
+        \param[in] tag The encoded tag, for example TagBytes::DATA.
+        \param[in] tag_size The number of bytes in the tag.
+        \param[in] buffer A reference to a message buffer object in which to store the tag.
+        \return A value from the Error enum, NO_ERROR in case everything is fine.
+      */
+      static Error SerializeTagReserveLength(const uint8_t* tag, const uint32_t tag_size, 
+                                             WriteBufferInterface& buffer)
+      {
+        Error return_value = SerializeTag(tag, tag_size, buffer);
+        if(Error::NO_ERRORS == return_value)
+        {
+          return_value = buffer.push(0) ? Error::NO_ERRORS : Error::BUFFER_FULL;
+        }
+        return return_value;
+      }
+
+      //! Write the length of a field in the byte reserved by SerializeTagReserveLength().
+      /*!
+        When the length takes more than a single byte the data of the field is moved to make room for 
+        it. When there is no data and the field is not optional the tag and the length are removed again.
+
+        \param[in] start The size of the buffer before the tag was serialized.
+        \param[in] tag_size The number of bytes in the tag.
+        \param[in] buffer A reference to the message buffer in which the field was serialized.
+        \param[in] optional Keep the tag and the length when there is no data.
+        \return A value from the Error enum, NO_ERROR in case everything is fine.
+      */
+      static Error SerializeReservedLength(const uint32_t start, const uint32_t tag_size, 
+                                           WriteBufferInterface& buffer, const bool optional)
+      {
+        Error return_value = Error::NO_ERRORS;
+        const uint32_t length_index = start + tag_size;
+        const uint32_t length = buffer.get_size() - length_index - 1;
+        if((0 == length) && !optional)
+        {
+          buffer.set_size(start);
+        }
+        else 
+        {
+          const uint32_t n_bytes = VarintSize(length);
+          if(buffer.set_size(length_index + n_bytes + length))
+          {
+            uint8_t* data = buffer.get_data() + length_index;
+            if(1 < n_bytes) 
+            {
+              memmove(data + n_bytes, data + 1, length);
+            }
+            EncodeVarint(length, n_bytes, data);
+          }
+          else 
+          {
+            return_value = Error::BUFFER_FULL;
+          }
+        }
         return return_value;
       }
 
@@ -544,13 +769,82 @@ namespace EmbeddedProto
         \param[out] value The variable in which the varint is returned.
         \return A value from the Error enum, NO_ERROR in case everything is fine.
       */
-      template<class UINT_TYPE>
-      static Error DeserializeVarint(ReadBufferInterface& buffer, UINT_TYPE& value) 
+      template<class UINT_TYPE, class BUFFER_TYPE>
+      static Error DeserializeVarint(BUFFER_TYPE& buffer, UINT_TYPE& value) 
       {
         static_assert(std::is_same<UINT_TYPE, uint32_t>::value || 
                       std::is_same<UINT_TYPE, uint64_t>::value, 
                       "Wrong type passed to DeserializeVarint.");
         
+        // Most tags, lengths and small values take one or two bytes. These are popped directly.
+        uint8_t byte = 0;
+        if(!buffer.pop(byte))
+        {
+          return Error::END_OF_BUFFER;
+        }
+        else if(!(byte & VARINT_MSB_BYTE))
+        {
+          value = byte;
+          return Error::NO_ERRORS;
+        }
+
+        UINT_TYPE temp_value = static_cast<UINT_TYPE>(byte & (~VARINT_MSB_BYTE));
+        if(!buffer.pop(byte))
+        {
+          return Error::END_OF_BUFFER;
+        }
+        temp_value |= static_cast<UINT_TYPE>(byte) << VARINT_SHIFT_N_BITS;
+        if(!(byte & VARINT_MSB_BYTE))
+        {
+          value = temp_value;
+          return Error::NO_ERRORS;
+        }
+
+        return DeserializeMultiByteVarint(buffer, temp_value, value);
+      }
+
+    private:
+
+      //! Serialize a varint of more than two bytes.
+      /*!
+        \see SerializeVarint()
+      */
+      template<class UINT_TYPE, class BUFFER_TYPE>
+      EMBEDDED_PROTO_NOINLINE static Error SerializeMultiByteVarint(UINT_TYPE value, BUFFER_TYPE& buffer) 
+      {
+        // When the buffer exposes its memory, and all bytes fit, the varint is written directly in it.
+        const uint32_t n_bytes = VarintSize(value);
+        const bytes_view bytes = buffer.get_writable_bytes();
+        if((nullptr != bytes.data) && (n_bytes <= bytes.size))
+        {
+          EncodeVarint(value, n_bytes, bytes.data);
+          return buffer.commit(n_bytes) ? Error::NO_ERRORS : Error::BUFFER_FULL;
+        }
+
+        // Otherwise push the bytes one by one.
+        bool memory_free = true;
+        while((value >= VARINT_MSB_BYTE) && memory_free) 
+        {
+          memory_free = buffer.push(static_cast<uint8_t>(value | VARINT_MSB_BYTE));
+          value >>= VARINT_SHIFT_N_BITS;
+        }
+        memory_free = buffer.push(static_cast<uint8_t>(value));
+
+        const Error return_value = memory_free ? Error::NO_ERRORS : Error::BUFFER_FULL;
+        return return_value;
+      }
+
+      //! Deserialize the remainder of a varint of which the first two bytes have the most significant bit set.
+      /*!
+        \param[in] buffer The data buffer from which bytes are popped.
+        \param[in] temp_value The first two bytes of the varint, already popped from the buffer. The most 
+                   significant bit of the second byte is still set.
+        \param[out] value The variable in which the varint is returned.
+        \return A value from the Error enum, NO_ERROR in case everything is fine.
+      */
+      template<class UINT_TYPE, class BUFFER_TYPE>
+      EMBEDDED_PROTO_NOINLINE static Error DeserializeMultiByteVarint(BUFFER_TYPE& buffer, UINT_TYPE temp_value, UINT_TYPE& value) 
+      {
         // Calculate how many bytes there are in a varint 128 base encoded number. This should 
         // yield 5 for a 32bit number and 10 for a 64bit number.
         constexpr auto N_DIGITS = std::numeric_limits<UINT_TYPE>::digits;
@@ -559,11 +853,28 @@ namespace EmbeddedProto
         constexpr auto DIV_CEIL = constexpr_ceil(DIV_RESULT);
         constexpr auto N_BYTES_IN_VARINT = static_cast<uint8_t>(DIV_CEIL);
         
-        UINT_TYPE temp_value = 0;
-        uint8_t byte = 0;
-        uint8_t i = 0;
-        bool result = false;
-        do 
+        uint8_t byte = VARINT_MSB_BYTE;
+        uint8_t i = 2;
+        bool result = true;
+
+        // When the buffer exposes its memory, and holds enough bytes for the longest varint, the 
+        // remaining bytes are decoded directly from it. This takes a single advance instead of a pop 
+        // for each byte.
+        const array_view<const uint8_t> bytes = buffer.get_readable_bytes();
+        if((N_BYTES_IN_VARINT - 2U) <= bytes.size)
+        {
+          const uint8_t n_bytes = VarintDecoder<UINT_TYPE, 2, 2, N_BYTES_IN_VARINT>::decode(bytes.data, temp_value);
+          buffer.advance(n_bytes);
+          byte = bytes.data[n_bytes - 1];
+          i = N_BYTES_IN_VARINT;
+        }
+        else
+        {
+          temp_value &= ~(static_cast<UINT_TYPE>(VARINT_MSB_BYTE) << VARINT_SHIFT_N_BITS);
+        }
+
+        // Otherwise pop the remaining bytes one by one.
+        while((byte & VARINT_MSB_BYTE) && (i < N_BYTES_IN_VARINT) && result)
         {
           result = buffer.pop(byte);
           if(result) 
@@ -571,7 +882,7 @@ namespace EmbeddedProto
             temp_value |= static_cast<UINT_TYPE>(byte & (~VARINT_MSB_BYTE)) << (i * VARINT_SHIFT_N_BITS);
           }
           ++i;
-        } while((byte & VARINT_MSB_BYTE) && (i < N_BYTES_IN_VARINT) && result);
+        }
 
         Error return_value = Error::NO_ERRORS;
         if(result)
@@ -595,8 +906,29 @@ namespace EmbeddedProto
         return return_value;
       }
 
+  };
+
+  //! The tag of a field encoded as a varint.
+  /*!
+    The tag of a field does not change. The generated code encodes them once as a parameter pack 
+    of bytes, for example TagBytes<0x81, 0x7D> for field number 2000 with a FIXED64 wire type. 
+    Serializing the tag is then a single push of these bytes into the buffer.
+  */
+  template<uint8_t... BYTES>
+  struct TagBytes
+  {
+    //! The number of bytes in the tag.
+    static constexpr uint32_t SIZE = sizeof...(BYTES);
 
+    //! The bytes of the encoded tag.
+    static constexpr uint8_t DATA[sizeof...(BYTES)] = {BYTES...};
   };
 
+  template<uint8_t... BYTES>
+  constexpr uint32_t TagBytes<BYTES...>::SIZE;
+
+  template<uint8_t... BYTES>
+  constexpr uint8_t TagBytes<BYTES...>::DATA[sizeof...(BYTES)];
+
 } // End of namespace EmbeddedProto.
 #endif
@@ -33,12 +33,18 @@
 
 #include "WriteBufferInterface.h"
 #include <array>
+#include <cstring>
 
 namespace EmbeddedProto 
 {
 
+  //! This template class implements the WriteBufferInterface.
+  /*!
+      The template sets the number of bytes which fit in the buffer. The class is final such that the
+      templated serialize functions of messages call its functions directly.
+  */
   template<uint32_t BUFFER_SIZE>
-  class WriteBufferFixedSize : public ::EmbeddedProto::WriteBufferInterface
+  class WriteBufferFixedSize final : public ::EmbeddedProto::WriteBufferInterface
   {  
     public:
       WriteBufferFixedSize() = default;
@@ -85,7 +91,7 @@ namespace EmbeddedProto
       //! \see ::EmbeddedProto::WriteBufferInterface::push()
       bool push(const uint8_t* bytes, const uint32_t length) override
       {
-        bool return_value = BUFFER_SIZE > (write_index_ + length);
+        bool return_value = BUFFER_SIZE >= (write_index_ + length);
         if(return_value)
         {
           memcpy(data_.data() + write_index_, bytes, length);
@@ -94,11 +100,39 @@ namespace EmbeddedProto
         return return_value;
       }
   
-      //! Return a pointer to the data array.
-      uint8_t* get_data()
+      //! \see ::EmbeddedProto::WriteBufferInterface::get_writable_bytes()
+      bytes_view get_writable_bytes() override
+      {
+        return {data_.data() + write_index_, BUFFER_SIZE - write_index_};
+      }
+
+      //! \see ::EmbeddedProto::WriteBufferInterface::commit()
+      bool commit(const uint32_t n_bytes) override
+      {
+        const bool return_value = BUFFER_SIZE >= (write_index_ + n_bytes);
+        if(return_value)
+        {
+          write_index_ += n_bytes;
+        }
+        return return_value;
+      }
+  
+      //! \see ::EmbeddedProto::WriteBufferInterface::get_data()
+      uint8_t* get_data() override
       {
         return data_.data();
       }
+
+      //! \see ::EmbeddedProto::WriteBufferInterface::set_size()
+      bool set_size(const uint32_t size) override
+      {
+        const bool return_value = BUFFER_SIZE >= size;
+        if(return_value)
+        {
+          write_index_ = size;
+        }
+        return return_value;
+      }
   
     private:
   
@@ -31,6 +31,8 @@
 #ifndef _WRITE_BUFFER_INTERFACE_H_
 #define _WRITE_BUFFER_INTERFACE_H_
 
+#include "Defines.h"
+
 #include <cstdint>
 
 
@@ -77,6 +79,56 @@ namespace EmbeddedProto
           \return True when there was space to add the bytes.
       */
       virtual bool push(const uint8_t* bytes, const uint32_t length) = 0;
+
+      //! Obtain direct access to the free space after the data in the buffer when it is contiguous.
+      /*!
+          Bytes written in this space are added to the buffer by calling commit().
+
+          The default implementation returns an empty view. Buffers storing their data in an array 
+          are advised to override this function together with commit().
+
+          \return A view on the bytes which can be written directly, empty when not supported.
+      */
+      virtual bytes_view get_writable_bytes()
+      {
+        return {nullptr, 0};
+      }
+
+      //! Add the given number of bytes, written using get_writable_bytes(), to the buffer.
+      /*!
+          \param[in] n_bytes The number of bytes written.
+          \return True when the bytes fitted in the writable space.
+      */
+      virtual bool commit(const uint32_t n_bytes)
+      {
+        return 0 == n_bytes;
+      }
+
+      //! Obtain direct access to the array in which all the data of the buffer is stored.
+      /*!
+          When supported length delimited fields are serialized in a single pass. The length is written 
+          in front of the data after the data has been serialized, instead of calculating the size of the 
+          data first. The default implementation returns a nullptr, buffers returning their array should 
+          also override set_size().
+
+          \return A pointer to the first byte in the buffer, nullptr when not supported.
+      */
+      virtual uint8_t* get_data()
+      {
+        return nullptr;
+      }
+
+      //! Change the number of bytes stored in the buffer, for example to remove the bytes serialized last.
+      /*!
+          \param[in] size The new number of bytes in the buffer.
+          \return True when the buffer supports this and the size is not larger than get_max_size().
+      */
+      virtual bool set_size(const uint32_t size)
+      {
+        // Ignore the unused parameter
+        (void)size;
+        return false;
+      }
       
   };
 
@@ -38,10 +38,26 @@
 namespace Mocks
 {
 
-  class WriteBufferMock : public EmbeddedProto::WriteBufferInterface
+  class WriteBufferMockBase : public EmbeddedProto::WriteBufferInterface
   {
     public:
 
+      WriteBufferMockBase()
+      {
+        // Tags are pushed as an array of bytes. When a test does not expect an array, the bytes are 
+        // pushed one by one such that the tests can check each byte.
+        ON_CALL(*this, push(::testing::_, ::testing::_)).WillByDefault(
+          ::testing::Invoke([this](const uint8_t* bytes, const uint32_t length) 
+          {
+            bool result = true;
+            for(uint32_t i = 0; (i < length) && result; ++i)
+            {
+              result = this->push(bytes[i]);
+            }
+            return result;
+          }));
+      }
+
       MOCK_METHOD0(clear, void());
 
       MOCK_CONST_METHOD0(get_size, uint32_t());
@@ -62,6 +78,9 @@ namespace Mocks
 
   };
 
+  // The default action forwarding arrays is not reported as an uninteresting call.
+  using WriteBufferMock = ::testing::NiceMock<WriteBufferMockBase>;
+
 } // End of namespace Mocks
 
 #endif // End of _WRITE_BUFFER_MOCK_H_
@@ -101,6 +101,57 @@ namespace test_EmbeddedAMS_ReadBufferFixedSize
     EXPECT_EQ(2, byte); // byte should not have changed.
   }
 
+  TEST(ReadBufferFixedSize, pop_bytes)
+  {
+    constexpr uint32_t BUFFER_SIZE = 5;
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> buffer;
+
+    constexpr std::array<uint8_t, BUFFER_SIZE> data = { 0, 1, 2, 3, 4 };
+
+    memcpy(buffer.get_data(), data.data(), BUFFER_SIZE);
+    buffer.set_bytes_written(BUFFER_SIZE);
+  
+    std::array<uint8_t, BUFFER_SIZE> bytes = { 255, 255, 255, 255, 255 };
+    EXPECT_TRUE(buffer.pop_bytes(bytes.data(), 3));
+    EXPECT_EQ(0, bytes[0]);
+    EXPECT_EQ(1, bytes[1]);
+    EXPECT_EQ(2, bytes[2]);
+    EXPECT_EQ(255, bytes[3]);
+
+    // Only two bytes are left, nothing should be obtained.
+    EXPECT_FALSE(buffer.pop_bytes(bytes.data(), 3));
+    EXPECT_EQ(0, bytes[0]);
+
+    EXPECT_TRUE(buffer.pop_bytes(bytes.data(), 2));
+    EXPECT_EQ(3, bytes[0]);
+    EXPECT_EQ(4, bytes[1]);
+
+    uint8_t byte = 255;
+    EXPECT_FALSE(buffer.pop(byte));
+  }
+
+  TEST(ReadBufferFixedSize, readable_bytes)
+  {
+    constexpr uint32_t BUFFER_SIZE = 3;
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> buffer;
+    EXPECT_EQ(0, buffer.get_readable_bytes().size);
+
+    constexpr std::array<uint8_t, BUFFER_SIZE> data = { 0, 1, 2 };
+    memcpy(buffer.get_data(), data.data(), BUFFER_SIZE);
+    buffer.set_bytes_written(BUFFER_SIZE);
+    EXPECT_TRUE(buffer.advance());
+
+    // The bytes after the read index are exposed, reading them does not alter the buffer.
+    EmbeddedProto::array_view<const uint8_t> bytes = buffer.get_readable_bytes();
+    ASSERT_EQ(2, bytes.size);
+    EXPECT_EQ(1, bytes.data[0]);
+    EXPECT_EQ(2, bytes.data[1]);
+
+    uint8_t byte = 0;
+    EXPECT_TRUE(buffer.peek(byte));
+    EXPECT_EQ(1, byte);
+  }
+
   TEST(ReadBufferFixedSize, peak)
   {
     constexpr uint32_t BUFFER_SIZE = 3;
@@ -31,6 +31,7 @@
 #include <gtest/gtest.h>
 
 #include <ReadBufferSection.h>
+#include <ReadBufferFixedSize.h>
 
 #include "mock/ReadBufferMock.h"
 
@@ -145,4 +146,51 @@ TEST(ReadBufferSection, pop)
   EXPECT_EQ(0, byte);
 }
 
+TEST(ReadBufferSection, pop_bytes) 
+{
+  Mocks::ReadBufferMock read_buffer_mock;
+  EXPECT_CALL(read_buffer_mock, get_size()).WillRepeatedly(Return(3));
+  EXPECT_CALL(read_buffer_mock, pop(_)).WillOnce(DoAll(SetArgReferee<0>(1), Return(true)))
+                                       .WillOnce(DoAll(SetArgReferee<0>(2), Return(true)));
+
+  EmbeddedProto::ReadBufferSection read_buffer_section(read_buffer_mock, 2);
+  
+  // The section is smaller than the number of bytes requested.
+  uint8_t bytes[3] = {0, 0, 0};
+  EXPECT_FALSE(read_buffer_section.pop_bytes(bytes, 3));
+  EXPECT_EQ(0, bytes[0]);
+  EXPECT_EQ(2, read_buffer_section.get_size());
+
+  EXPECT_TRUE(read_buffer_section.pop_bytes(bytes, 2));
+  EXPECT_EQ(1, bytes[0]);
+  EXPECT_EQ(2, bytes[1]);
+  EXPECT_EQ(0, read_buffer_section.get_size());
+}
+
+TEST(ReadBufferSection, readable_bytes) 
+{
+  // The mock does not expose its bytes.
+  Mocks::ReadBufferMock read_buffer_mock;
+  EXPECT_CALL(read_buffer_mock, get_size()).WillRepeatedly(Return(3));
+  EmbeddedProto::ReadBufferSection mock_section(read_buffer_mock, 2);
+  EXPECT_EQ(nullptr, mock_section.get_readable_bytes().data);
+  EXPECT_EQ(0, mock_section.get_readable_bytes().size);
+
+  EmbeddedProto::ReadBufferFixedSize<4> buffer;
+  const uint8_t data[] = {1, 2, 3, 4};
+  memcpy(buffer.get_data(), data, sizeof(data));
+  buffer.set_bytes_written(sizeof(data));
+
+  // Only the bytes in the section are exposed.
+  EmbeddedProto::ReadBufferSection read_buffer_section(buffer, 2);
+  EmbeddedProto::array_view<const uint8_t> bytes = read_buffer_section.get_readable_bytes();
+  EXPECT_EQ(buffer.get_data(), bytes.data);
+  EXPECT_EQ(2, bytes.size);
+
+  EXPECT_TRUE(read_buffer_section.advance());
+  bytes = read_buffer_section.get_readable_bytes();
+  EXPECT_EQ(buffer.get_data() + 1, bytes.data);
+  EXPECT_EQ(1, bytes.size);
+}
+
 } // End of namespace ReadBufferSection
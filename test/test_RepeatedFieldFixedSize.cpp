@@ -32,6 +32,8 @@
 
 #include <Fields.h>
 #include <RepeatedFieldFixedSize.h>
+#include <ReadBufferFixedSize.h>
+#include <WriteBufferFixedSize.h>
 
 namespace test_EmbeddedAMS_RepeatedFieldFixedSize
 {
@@ -178,5 +180,58 @@ TEST(RepeatedFieldFixedSize, clear)
   EXPECT_EQ(0U, x.get_length());
 }
 
+TEST(RepeatedFieldFixedSize, serialize_packed_float) 
+{
+  static constexpr uint32_t LENGTH = 3;
+  EmbeddedProto::RepeatedFieldFixedSize<::EmbeddedProto::floatfixed, LENGTH> x;
+  x.add(1.0F);
+  x.add(-2.0F);
+
+  EmbeddedProto::WriteBufferFixedSize<16> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, x.serialize_with_id(1, buffer, false));
+
+  // The floats are serialized little endian after the tag and length.
+  const uint8_t expected[] = {0x0A, 0x08, 0x00, 0x00, 0x80, 0x3F, 0x00, 0x00, 0x00, 0xC0};
+  ASSERT_EQ(sizeof(expected), buffer.get_size());
+  for(uint32_t i = 0; i < sizeof(expected); ++i) 
+  {
+    EXPECT_EQ(expected[i], buffer.get_data()[i]);
+  }
+
+  // There is no space for the second float.
+  EmbeddedProto::WriteBufferFixedSize<8> small_buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::BUFFER_FULL, x.serialize_with_id(1, small_buffer, false));
+}
+
+TEST(RepeatedFieldFixedSize, deserialize_packed_fixed64) 
+{
+  static constexpr uint32_t LENGTH = 3;
+  EmbeddedProto::RepeatedFieldFixedSize<::EmbeddedProto::fixed64, LENGTH> x;
+  x.add(1U);
+
+  // Two elements are added after the one already in the array.
+  const uint8_t data[] = {0x10, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+                                0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x80};
+  EmbeddedProto::ReadBufferFixedSize<32> buffer;
+  memcpy(buffer.get_data(), data, sizeof(data));
+  buffer.set_bytes_written(sizeof(data));
+
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, x.deserialize(buffer));
+  EXPECT_EQ(3U, x.get_length());
+  EXPECT_EQ(1U, x.get_const(0));
+  EXPECT_EQ(2U, x.get_const(1));
+  EXPECT_EQ(0x8000000000000100U, x.get_const(2));
+
+  // When the elements do not fit the array is filled up to its maximum length.
+  x.clear();
+  x.add(1U);
+  x.add(1U);
+  buffer.clear();
+  memcpy(buffer.get_data(), data, sizeof(data));
+  buffer.set_bytes_written(sizeof(data));
+  EXPECT_EQ(::EmbeddedProto::Error::ARRAY_FULL, x.deserialize(buffer));
+  EXPECT_EQ(3U, x.get_length());
+  EXPECT_EQ(2U, x.get_const(2));
+}
 
 } // End namespace test_EmbeddedAMS_RepeatedField
@@ -33,6 +33,7 @@
 #include <WireFormatter.h>
 #include <ReadBufferMock.h>
 #include <WriteBufferMock.h>
+#include <ReadBufferFixedSize.h>
 
 #include <cstdint>    
 #include <limits>
@@ -640,4 +641,30 @@ TEST(RepeatedFieldMessage, to_string)
 
 #endif // MSG_TO_STRING
 
+TEST(RepeatedFieldMessage, deserialize_consecutive_elements) 
+{
+  // The elements of a repeated message field each have their own tag.
+  const uint8_t data[] = { 0x08, 0x01,                         // a
+                           0x12, 0x02, 0x08, 0x01,             // b[0]
+                           0x12, 0x02, 0x10, 0x02,             // b[1]
+                           0x12, 0x04, 0x08, 0x03, 0x10, 0x04, // b[2]
+                           0x18, 0x05 };                       // c
+
+  ::EmbeddedProto::ReadBufferFixedSize<32> buffer;
+  for(const auto byte : data)
+  {
+    buffer.push(byte);
+  }
+
+  repeated_message<Y_SIZE> msg;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.deserialize(buffer));
+  EXPECT_EQ(1U, msg.get_a());
+  ASSERT_EQ(3U, msg.get_b().get_length());
+  EXPECT_EQ(1U, msg.get_b()[0].get_u());
+  EXPECT_EQ(2U, msg.get_b()[1].get_v());
+  EXPECT_EQ(3U, msg.get_b()[2].get_u());
+  EXPECT_EQ(4U, msg.get_b()[2].get_v());
+  EXPECT_EQ(5U, msg.get_c());
+}
+
 } // End of namespace test_EmbeddedAMS_RepeatedFieldMessage
@@ -33,6 +33,8 @@
 #include <WireFormatter.h>
 #include <ReadBufferMock.h>
 #include <WriteBufferMock.h>
+#include <ReadBufferFixedSize.h>
+#include <WriteBufferFixedSize.h>
 
 #include <cstdint>    
 #include <limits>
@@ -601,4 +603,91 @@ TEST(SimpleTypes, to_string)
 
 #endif // MSG_TO_STRING
 
+TEST(SimpleTypes, deserialize_expected_order) 
+{
+  // The fields in the order in which they are serialized, some fields are left out.
+  const uint8_t data[] = { 0x08, 0x01,                         // a_int32
+                           0x18, 0x03,                         // a_uint32
+                           0x38, 0x01,                         // a_bool
+                           0x65, 0x0C, 0x00, 0x00, 0x00,       // a_fixed32
+                           0x78, 0x01 };                       // a_nested_enum
+
+  ::EmbeddedProto::ReadBufferFixedSize<32> buffer;
+  for(const auto byte : data)
+  {
+    buffer.push(byte);
+  }
+
+  ::Test_Simple_Types msg;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.deserialize(buffer));
+  EXPECT_EQ(1, msg.get_a_int32());
+  EXPECT_EQ(3U, msg.get_a_uint32());
+  EXPECT_TRUE(msg.get_a_bool());
+  EXPECT_EQ(12U, msg.get_a_fixed32());
+  EXPECT_EQ(::Test_Simple_Types::Nested_Enum::NE_B, msg.get_a_nested_enum());
+}
+
+TEST(SimpleTypes, deserialize_other_order) 
+{
+  const uint8_t data[] = { 0x78, 0x01,                         // a_nested_enum
+                           0x08, 0x01,                         // a_int32
+                           0x90, 0x03, 0x05,                   // unknown field 50
+                           0x18, 0x03,                         // a_uint32
+                           0x08, 0x02,                         // a_int32 again, the last value is used.
+                           0x1D, 0x01, 0x00, 0x00, 0x00 };     // a_uint32 with the wrong wire type
+
+  ::EmbeddedProto::ReadBufferFixedSize<32> buffer;
+  for(const auto byte : data)
+  {
+    buffer.push(byte);
+  }
+
+  ::Test_Simple_Types msg;
+  EXPECT_EQ(::EmbeddedProto::Error::INVALID_WIRETYPE, msg.deserialize(buffer));
+  EXPECT_EQ(2, msg.get_a_int32());
+  EXPECT_EQ(3U, msg.get_a_uint32());
+  EXPECT_EQ(::Test_Simple_Types::Nested_Enum::NE_B, msg.get_a_nested_enum());
+}
+
+TEST(SimpleTypes, serialize_fixed_size_buffer) 
+{
+  ::Test_Simple_Types msg;
+  msg.set_a_int32(-1);
+  msg.set_a_uint64(std::numeric_limits<uint64_t>::max());
+  msg.set_a_sint32(-2);
+  msg.set_a_bool(true);
+  msg.set_a_fixed64(3);
+  msg.set_a_double(4.5);
+  msg.set_a_float(-6.25F);
+  msg.set_a_nested_enum(::Test_Simple_Types::Nested_Enum::NE_B);
+
+  // Serialize using the buffer type and using the buffer interface.
+  ::EmbeddedProto::WriteBufferFixedSize<128> buffer;
+  ::EmbeddedProto::WriteBufferFixedSize<128> interface_buffer;
+  ::EmbeddedProto::WriteBufferInterface& interface = interface_buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(interface));
+  ASSERT_EQ(interface_buffer.get_size(), buffer.get_size());
+  EXPECT_EQ(0, memcmp(interface_buffer.get_data(), buffer.get_data(), buffer.get_size()));
+
+  ::EmbeddedProto::ReadBufferFixedSize<128> read_buffer;
+  memcpy(read_buffer.get_data(), buffer.get_data(), buffer.get_size());
+  read_buffer.set_bytes_written(buffer.get_size());
+
+  ::Test_Simple_Types result;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, result.deserialize(read_buffer));
+  EXPECT_EQ(-1, result.get_a_int32());
+  EXPECT_EQ(std::numeric_limits<uint64_t>::max(), result.get_a_uint64());
+  EXPECT_EQ(-2, result.get_a_sint32());
+  EXPECT_TRUE(result.get_a_bool());
+  EXPECT_EQ(3U, result.get_a_fixed64());
+  EXPECT_EQ(4.5, result.get_a_double());
+  EXPECT_EQ(-6.25F, result.get_a_float());
+  EXPECT_EQ(::Test_Simple_Types::Nested_Enum::NE_B, result.get_a_nested_enum());
+
+  // There is not enough space in a small buffer.
+  ::EmbeddedProto::WriteBufferFixedSize<8> small_buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::BUFFER_FULL, msg.serialize(small_buffer));
+}
+
 } // End of namespace test_EmbeddedAMS_SimpleTypes
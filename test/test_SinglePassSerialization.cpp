@@ -0,0 +1,200 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+#include "gtest/gtest.h"
+
+#include <WriteBufferInterface.h>
+#include <WriteBufferFixedSize.h>
+#include <Errors.h>
+
+#include <cstdint>
+#include <cstring>
+
+// EAMS message definitions
+#include <nested_message.h>
+#include <repeated_fields.h>
+
+namespace test_EmbeddedAMS_SinglePassSerialization
+{
+
+constexpr uint32_t BUFFER_SIZE = 512;
+constexpr uint32_t SIZE_MSG_A = 100;
+constexpr uint32_t SIZE_MSG_D = 5;
+constexpr uint32_t Y_SIZE = 5;
+
+// A buffer which does not give access to its data. Messages serialized in it first calculate the size of nested 
+// messages and repeated fields, the output is used as the reference for the single pass serialization.
+class WriteBufferNoData : public ::EmbeddedProto::WriteBufferInterface
+{
+  public:
+    void clear() override { buffer_.clear(); }
+    uint32_t get_size() const override { return buffer_.get_size(); }
+    uint32_t get_max_size() const override { return buffer_.get_max_size(); }
+    uint32_t get_available_size() const override { return buffer_.get_available_size(); }
+    bool push(const uint8_t byte) override { return buffer_.push(byte); }
+    bool push(const uint8_t* bytes, const uint32_t length) override { return buffer_.push(bytes, length); }
+
+    const uint8_t* get_bytes() { return buffer_.get_data(); }
+
+  private:
+    ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer_;
+};
+
+// Serialize the message both ways after the given number of padding bytes and compare the results.
+template<class MSG>
+void expect_same_serialization(const MSG& msg, const uint32_t n_padding)
+{
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+  WriteBufferNoData reference;
+  for(uint32_t i = 0; i < n_padding; ++i)
+  {
+    buffer.push(0xAA);
+    reference.push(0xAA);
+  }
+
+  ::EmbeddedProto::WriteBufferInterface& interface_buffer = buffer;
+  const auto expected = msg.serialize(reference);
+  ASSERT_EQ(expected, msg.serialize(interface_buffer)) << "padding: " << n_padding;
+  if(::EmbeddedProto::Error::NO_ERRORS == expected)
+  {
+    ASSERT_EQ(reference.get_size(), buffer.get_size());
+    EXPECT_EQ(0, memcmp(reference.get_bytes(), buffer.get_data(), buffer.get_size()));
+  }
+}
+
+// Fill nested_a with enough data for its length and the lengths of the messages around it to take two bytes.
+void set_large_nested(::demo::space::message_c<SIZE_MSG_A, SIZE_MSG_D>& msg)
+{
+  for(uint32_t i = 0; i < SIZE_MSG_A; ++i)
+  {
+    msg.mutable_nested_b().mutable_nested_a().add_x(static_cast<int32_t>(1000 * i));
+  }
+  msg.mutable_nested_b().mutable_nested_a().set_y(1.0F);
+  msg.mutable_nested_b().mutable_nested_a().set_z(-1);
+  msg.mutable_nested_b().set_u(2.0);
+  msg.mutable_nested_b().set_v(3);
+}
+
+TEST(SinglePassSerialization, nested)
+{
+  ::demo::space::message_c<SIZE_MSG_A, SIZE_MSG_D> msg;
+  msg.mutable_nested_b().mutable_nested_a().add_x(1);
+  msg.mutable_nested_b().set_v(2);
+  msg.mutable_nested_d().add_d(3);
+  msg.mutable_nested_g().set_g(4);
+  expect_same_serialization(msg, 0);
+
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+  ::EmbeddedProto::WriteBufferInterface& interface_buffer = buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(interface_buffer));
+  const uint8_t expected[] = {0x0A, 0x07, 0x12, 0x03, 0x0A, 0x01, 0x01, 0x18, 0x02, 
+                              0x12, 0x03, 0x0A, 0x01, 0x03, 
+                              0x1A, 0x02, 0x08, 0x04};
+  ASSERT_EQ(sizeof(expected), buffer.get_size());
+  EXPECT_EQ(0, memcmp(expected, buffer.get_data(), sizeof(expected)));
+}
+
+TEST(SinglePassSerialization, nested_long_lengths)
+{
+  // The lengths of nested_a, its packed field x and nested_b do not fit in the reserved byte.
+  ::demo::space::message_c<SIZE_MSG_A, SIZE_MSG_D> msg;
+  set_large_nested(msg);
+  expect_same_serialization(msg, 0);
+  EXPECT_LT(128U, msg.get_nested_b().serialized_size());
+}
+
+TEST(SinglePassSerialization, empty_nested)
+{
+  // Empty nested messages are not serialized, the tag and reserved byte are removed again.
+  ::demo::space::message_c<SIZE_MSG_A, SIZE_MSG_D> msg;
+  msg.mutable_nested_g().set_g(1);
+  expect_same_serialization(msg, 0);
+
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+  ::EmbeddedProto::WriteBufferInterface& interface_buffer = buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(interface_buffer));
+  const uint8_t expected[] = {0x1A, 0x02, 0x08, 0x01};
+  ASSERT_EQ(sizeof(expected), buffer.get_size());
+  EXPECT_EQ(0, memcmp(expected, buffer.get_data(), sizeof(expected)));
+}
+
+TEST(SinglePassSerialization, repeated_messages)
+{
+  // Elements of a repeated message are serialized even when empty.
+  repeated_message<Y_SIZE> msg;
+  msg.set_a(1);
+  msg.mutable_b().add(repeated_nested_message());
+  repeated_nested_message element;
+  element.set_u(2);
+  element.set_v(300);
+  msg.mutable_b().add(element);
+  msg.set_c(3);
+  expect_same_serialization(msg, 0);
+}
+
+TEST(SinglePassSerialization, buffer_full)
+{
+  // Fill the buffer up to the point where nothing fits, the errors should be the same as when calculating the size 
+  // first. This includes empty nested messages at the end of a full buffer, which are not serialized.
+  ::demo::space::message_c<SIZE_MSG_A, SIZE_MSG_D> msg;
+  set_large_nested(msg);
+  for(uint32_t i = 0; i <= BUFFER_SIZE; ++i)
+  {
+    expect_same_serialization(msg, i);
+  }
+
+  repeated_message<Y_SIZE> msg_repeated;
+  for(uint32_t i = 0; i < Y_SIZE; ++i)
+  {
+    repeated_nested_message element;
+    element.set_u(i);
+    msg_repeated.mutable_b().add(element);
+  }
+  for(uint32_t i = 0; i <= BUFFER_SIZE; ++i)
+  {
+    expect_same_serialization(msg_repeated, i);
+  }
+}
+
+TEST(SinglePassSerialization, buffer_full_nothing_written)
+{
+  // A nested message which does not fit is removed from the buffer.
+  ::demo::space::message_b<SIZE_MSG_A> msg;
+  for(uint32_t i = 0; i < SIZE_MSG_A; ++i)
+  {
+    msg.mutable_nested_a().add_x(static_cast<int32_t>(i));
+  }
+
+  ::EmbeddedProto::WriteBufferFixedSize<64> buffer;
+  ::EmbeddedProto::WriteBufferInterface& interface_buffer = buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::BUFFER_FULL, msg.serialize(interface_buffer));
+  EXPECT_EQ(0U, buffer.get_size());
+}
+
+} // End of namespace test_EmbeddedAMS_SinglePassSerialization
@@ -0,0 +1,253 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+
+
+#include <gtest/gtest.h>
+
+#include <WireFormatter.h>
+#include <WriteBufferFixedSize.h>
+#include <ReadBufferFixedSize.h>
+#include <ReadBufferSection.h>
+
+#include <cstring>
+#include <random>
+#include <limits>
+
+namespace test_EmbeddedAMS_WireFormatter
+{
+
+// The number of random values and byte sequences tested for each case.
+constexpr uint32_t N_ITERATIONS = 100000;
+
+// The size of the buffers, larger than the longest varint.
+constexpr uint32_t BUFFER_SIZE = 12;
+
+// The varint serialization pushing one byte at the time, used as the reference.
+template<class UINT_TYPE>
+EmbeddedProto::Error reference_serialize(UINT_TYPE value, EmbeddedProto::WriteBufferInterface& buffer)
+{
+  bool memory_free = true;
+  while((value >= 0x80) && memory_free) 
+  {
+    memory_free = buffer.push(static_cast<uint8_t>(value | 0x80));
+    value >>= 7;
+  }
+  memory_free = buffer.push(static_cast<uint8_t>(value));
+  return memory_free ? EmbeddedProto::Error::NO_ERRORS : EmbeddedProto::Error::BUFFER_FULL;
+}
+
+// The varint deserialization popping one byte at the time, used as the reference.
+template<class UINT_TYPE>
+EmbeddedProto::Error reference_deserialize(EmbeddedProto::ReadBufferInterface& buffer, UINT_TYPE& value)
+{
+  constexpr uint8_t N_BYTES_IN_VARINT = (std::numeric_limits<UINT_TYPE>::digits + 6) / 7;
+  UINT_TYPE temp_value = 0;
+  uint8_t byte = 0;
+  uint8_t i = 0;
+  bool result = false;
+  do 
+  {
+    result = buffer.pop(byte);
+    if(result) 
+    {
+      temp_value |= static_cast<UINT_TYPE>(byte & 0x7F) << (i * 7);
+    }
+    ++i;
+  } while((byte & 0x80) && (i < N_BYTES_IN_VARINT) && result);
+
+  EmbeddedProto::Error return_value = EmbeddedProto::Error::NO_ERRORS;
+  if(!result)
+  {
+    return_value = EmbeddedProto::Error::END_OF_BUFFER;
+  }
+  else if(byte & 0x80)
+  {
+    return_value = EmbeddedProto::Error::OVERLONG_VARINT;
+  }
+  else
+  {
+    value = temp_value;
+  }
+  return return_value;
+}
+
+// A random value with a random number of significant bits, such that all varint lengths are tested.
+template<class UINT_TYPE>
+UINT_TYPE random_value(std::mt19937_64& generator)
+{
+  constexpr int N_DIGITS = std::numeric_limits<UINT_TYPE>::digits;
+  const int n_bits = std::uniform_int_distribution<int>(0, N_DIGITS)(generator);
+  const uint64_t mask = (N_DIGITS == n_bits) ? std::numeric_limits<UINT_TYPE>::max() : ((uint64_t(1) << n_bits) - 1);
+  return static_cast<UINT_TYPE>(generator() & mask);
+}
+
+template<class UINT_TYPE>
+void fuzz_serialize(const uint32_t seed)
+{
+  std::mt19937_64 generator(seed);
+  for(uint32_t n = 0; n < N_ITERATIONS; ++n)
+  {
+    const UINT_TYPE value = random_value<UINT_TYPE>(generator);
+
+    // Start at a random position such that the varint does not always fit.
+    const uint32_t offset = std::uniform_int_distribution<uint32_t>(0, BUFFER_SIZE)(generator);
+    EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> expected;
+    EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+    EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> interface_buffer;
+    for(uint32_t i = 0; i < offset; ++i)
+    {
+      expected.push(0xFF);
+      buffer.push(0xFF);
+      interface_buffer.push(0xFF);
+    }
+
+    const auto expected_result = reference_serialize(value, expected);
+    EXPECT_EQ(expected_result, EmbeddedProto::WireFormatter::SerializeVarint(value, buffer));
+    EmbeddedProto::WriteBufferInterface& interface = interface_buffer;
+    EXPECT_EQ(expected_result, EmbeddedProto::WireFormatter::SerializeVarint(value, interface));
+
+    ASSERT_EQ(expected.get_size(), buffer.get_size()) << "value: " << value << " offset: " << offset;
+    ASSERT_EQ(expected.get_size(), interface_buffer.get_size());
+    EXPECT_EQ(0, memcmp(expected.get_data(), buffer.get_data(), expected.get_size()));
+    EXPECT_EQ(0, memcmp(expected.get_data(), interface_buffer.get_data(), expected.get_size()));
+
+    if(EmbeddedProto::Error::NO_ERRORS == expected_result)
+    {
+      EXPECT_EQ(offset + EmbeddedProto::WireFormatter::VarintSize(value), buffer.get_size());
+    }
+  }
+}
+
+template<class UINT_TYPE>
+void fuzz_deserialize(const uint32_t seed)
+{
+  std::mt19937_64 generator(seed);
+  for(uint32_t n = 0; n < N_ITERATIONS; ++n)
+  {
+    // Random bytes with most of the time the most significant bit set, to obtain long, unterminated 
+    // and overlong varints.
+    uint8_t data[BUFFER_SIZE];
+    const uint32_t n_bytes = std::uniform_int_distribution<uint32_t>(0, BUFFER_SIZE)(generator);
+    for(uint32_t i = 0; i < n_bytes; ++i)
+    {
+      data[i] = static_cast<uint8_t>(generator());
+      if(std::uniform_int_distribution<uint32_t>(0, 9)(generator) < 8)
+      {
+        data[i] |= 0x80;
+      }
+    }
+
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> expected;
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> buffer;
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> interface_buffer;
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> parent_buffer;
+    for(uint32_t i = 0; i < n_bytes; ++i)
+    {
+      expected.push(data[i]);
+      buffer.push(data[i]);
+      interface_buffer.push(data[i]);
+      parent_buffer.push(data[i]);
+    }
+
+    UINT_TYPE expected_value = 1;
+    const auto expected_result = reference_deserialize(expected, expected_value);
+
+    UINT_TYPE value = 1;
+    EXPECT_EQ(expected_result, EmbeddedProto::WireFormatter::DeserializeVarint(buffer, value));
+    EXPECT_EQ(expected_value, value);
+    EXPECT_EQ(expected.get_readable_bytes().size, buffer.get_readable_bytes().size);
+
+    value = 1;
+    EmbeddedProto::ReadBufferInterface& interface = interface_buffer;
+    EXPECT_EQ(expected_result, EmbeddedProto::WireFormatter::DeserializeVarint(interface, value));
+    EXPECT_EQ(expected_value, value);
+    EXPECT_EQ(expected.get_readable_bytes().size, interface_buffer.get_readable_bytes().size);
+
+    // A section of the buffer limits the bytes available.
+    const uint32_t section_size = std::uniform_int_distribution<uint32_t>(0, n_bytes)(generator);
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> expected_parent;
+    for(uint32_t i = 0; i < n_bytes; ++i)
+    {
+      expected_parent.push(data[i]);
+    }
+    EmbeddedProto::ReadBufferSection expected_section(expected_parent, section_size);
+    EmbeddedProto::ReadBufferSection section(parent_buffer, section_size);
+
+    expected_value = 1;
+    value = 1;
+    EXPECT_EQ(reference_deserialize(expected_section, expected_value), 
+              EmbeddedProto::WireFormatter::DeserializeVarint(section, value));
+    EXPECT_EQ(expected_value, value);
+    EXPECT_EQ(expected_section.get_size(), section.get_size());
+    EXPECT_EQ(expected_parent.get_readable_bytes().size, parent_buffer.get_readable_bytes().size);
+  }
+}
+
+TEST(WireFormatter, fuzz_serialize_varint_32)
+{
+  fuzz_serialize<uint32_t>(1);
+}
+
+TEST(WireFormatter, fuzz_serialize_varint_64)
+{
+  fuzz_serialize<uint64_t>(2);
+}
+
+TEST(WireFormatter, fuzz_deserialize_varint_32)
+{
+  fuzz_deserialize<uint32_t>(3);
+}
+
+TEST(WireFormatter, fuzz_deserialize_varint_64)
+{
+  fuzz_deserialize<uint64_t>(4);
+}
+
+TEST(WireFormatter, round_trip_varint)
+{
+  std::mt19937_64 generator(5);
+  for(uint32_t n = 0; n < N_ITERATIONS; ++n)
+  {
+    const uint64_t value = random_value<uint64_t>(generator);
+    EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> write_buffer;
+    ASSERT_EQ(EmbeddedProto::Error::NO_ERRORS, EmbeddedProto::WireFormatter::SerializeVarint(value, write_buffer));
+
+    EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> read_buffer;
+    memcpy(read_buffer.get_data(), write_buffer.get_data(), write_buffer.get_size());
+    read_buffer.set_bytes_written(write_buffer.get_size());
+
+    uint64_t result = 0;
+    ASSERT_EQ(EmbeddedProto::Error::NO_ERRORS, EmbeddedProto::WireFormatter::DeserializeVarint(read_buffer, result));
+    EXPECT_EQ(value, result);
+    EXPECT_EQ(0, read_buffer.get_readable_bytes().size);
+  }
+}
+
+} // End of namespace test_EmbeddedAMS_WireFormatter
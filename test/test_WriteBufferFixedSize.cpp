@@ -85,6 +85,30 @@ namespace test_EmbeddedAMS_WriteBufferFixedSize
     EXPECT_EQ(1, buffer.get_available_size());
   }
 
+  TEST(WriteBufferFixedSize, writable_bytes) 
+  {
+    constexpr uint32_t BUFFER_SIZE = 3;
+    EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+
+    EXPECT_TRUE(buffer.push(0));
+    EmbeddedProto::bytes_view bytes = buffer.get_writable_bytes();
+    ASSERT_EQ(2, bytes.size);
+    EXPECT_EQ(buffer.get_data() + 1, bytes.data);
+
+    bytes.data[0] = 1;
+    bytes.data[1] = 2;
+    EXPECT_FALSE(buffer.commit(3));
+    EXPECT_EQ(1, buffer.get_size());
+    EXPECT_TRUE(buffer.commit(2));
+    EXPECT_EQ(3, buffer.get_size());
+    EXPECT_EQ(0, buffer.get_writable_bytes().size);
+
+    for(uint32_t i = 0; i < BUFFER_SIZE; ++i) 
+    {
+      EXPECT_EQ(i, *(buffer.get_data() + i));
+    }
+  }
+
   TEST(WriteBufferFixedSize, clear) 
   {
     constexpr uint32_t BUFFER_SIZE = 3;
@@ -0,0 +1,241 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+#include "gtest/gtest.h"
+
+#include <WriteBufferFixedSize.h>
+#include <ReadBufferFixedSize.h>
+
+#include <cstdint>
+#include <cstring>
+
+// EAMS message definitions, generated with the cache_serialized_size option.
+#include <cache_serialized_size.h>
+
+namespace test_EmbeddedAMS_CacheSerializedSize
+{
+
+constexpr uint32_t BUFFER_SIZE = 256;
+constexpr uint32_t FREE_VALUES_SIZE = 4;
+
+// Check the size returned by the message, which might be stored, with the number of bytes it is serialized into.
+template<class MSG>
+void expect_size(const MSG& msg)
+{
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_EQ(buffer.get_size(), msg.serialized_size());
+}
+
+// A buffer which does not give access to its data. The length of nested messages is then written before they are 
+// serialized.
+class WriteBufferNoData : public ::EmbeddedProto::WriteBufferInterface
+{
+  public:
+    void clear() override { buffer_.clear(); }
+    uint32_t get_size() const override { return buffer_.get_size(); }
+    uint32_t get_max_size() const override { return buffer_.get_max_size(); }
+    uint32_t get_available_size() const override { return buffer_.get_available_size(); }
+    bool push(const uint8_t byte) override { return buffer_.push(byte); }
+    bool push(const uint8_t* bytes, const uint32_t length) override { return buffer_.push(bytes, length); }
+
+    const uint8_t* get_bytes() { return buffer_.get_data(); }
+
+  private:
+    ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer_;
+};
+
+TEST(CacheSerializedSize, setters)
+{
+  CacheSize::Config msg;
+  expect_size(msg);
+  msg.set_id(1U);
+  expect_size(msg);
+  msg.set_id(300U);
+  expect_size(msg);
+  msg.mutable_id() = 70000U;
+  expect_size(msg);
+  msg.set_mode(CacheSize::Mode::ON);
+  expect_size(msg);
+  msg.mutable_name() = "name";
+  expect_size(msg);
+  const uint8_t key[] = {1, 2, 3};
+  msg.mutable_key().set(key, sizeof(key));
+  expect_size(msg);
+  msg.set_opt(0);
+  expect_size(msg);
+  msg.clear_opt();
+  expect_size(msg);
+  msg.clear_id();
+  msg.clear_mode();
+  expect_size(msg);
+  msg.clear_name();
+  expect_size(msg);
+}
+
+TEST(CacheSerializedSize, nested)
+{
+  CacheSize::Config msg;
+  msg.mutable_inner().set_a(1);
+  expect_size(msg);
+  msg.mutable_inner().mutable_label() = "label";
+  expect_size(msg);
+  CacheSize::Inner inner;
+  inner.set_a(-1);
+  expect_size(inner);
+  msg.set_inner(inner);
+  expect_size(msg);
+  msg.clear_inner();
+  expect_size(msg);
+}
+
+TEST(CacheSerializedSize, repeated)
+{
+  CacheSize::Config msg;
+  msg.add_values(1);
+  expect_size(msg);
+  msg.add_values(1000);
+  expect_size(msg);
+  msg.set_values(0, 100000);
+  expect_size(msg);
+  msg.mutable_values(1) = -1;
+  expect_size(msg);
+  msg.mutable_values().add(2);
+  expect_size(msg);
+
+  CacheSize::Inner inner;
+  inner.set_a(5);
+  msg.add_inners(inner);
+  expect_size(msg);
+  msg.mutable_inners(0).set_a(500);
+  expect_size(msg);
+  msg.clear_values();
+  msg.clear_inners();
+  expect_size(msg);
+}
+
+TEST(CacheSerializedSize, oneof)
+{
+  CacheSize::Config msg;
+  msg.set_number(1);
+  expect_size(msg);
+  msg.mutable_nested().set_a(1000);
+  expect_size(msg);
+  msg.set_number(2);
+  expect_size(msg);
+  msg.clear_number();
+  expect_size(msg);
+}
+
+TEST(CacheSerializedSize, assign_clear_deserialize)
+{
+  CacheSize::Config msg;
+  CacheSize::Config other;
+  other.set_id(12345U);
+  other.mutable_name() = "other";
+  other.set_number(5);
+  expect_size(msg);
+
+  msg = other;
+  expect_size(msg);
+  EXPECT_EQ(other.serialized_size(), msg.serialized_size());
+
+  msg.clear();
+  expect_size(msg);
+  EXPECT_EQ(0U, msg.serialized_size());
+
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> write_buffer;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, other.serialize(write_buffer));
+  ::EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> read_buffer;
+  memcpy(read_buffer.get_data(), write_buffer.get_data(), write_buffer.get_size());
+  read_buffer.set_bytes_written(write_buffer.get_size());
+  ::EmbeddedProto::ReadBufferInterface& read_interface = read_buffer;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.deserialize(read_interface));
+  expect_size(msg);
+  EXPECT_EQ(write_buffer.get_size(), msg.serialized_size());
+}
+
+TEST(CacheSerializedSize, template_parameters)
+{
+  CacheSize::Free<FREE_VALUES_SIZE> msg;
+  msg.set_id(1U);
+  expect_size(msg);
+  msg.add_values(1000U);
+  expect_size(msg);
+  msg.mutable_config().set_id(2U);
+  expect_size(msg);
+  msg.mutable_config().mutable_inner().set_a(3);
+  expect_size(msg);
+  msg.clear();
+  expect_size(msg);
+}
+
+TEST(CacheSerializedSize, stored_until_changed)
+{
+  // The size is stored until a function of the message changes it. Changes made through a reference obtained before
+  // the size was requested are not seen by serialized_size(), call the mutable function again instead.
+  CacheSize::Config msg;
+  auto& inner = msg.mutable_inner();
+  inner.set_a(1);
+  const uint32_t size = msg.serialized_size();
+  inner.set_a(1000);
+  EXPECT_EQ(size, msg.serialized_size());
+
+  // The message itself is serialized with the change.
+  ::EmbeddedProto::WriteBufferFixedSize<BUFFER_SIZE> buffer;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_LT(size, buffer.get_size());
+
+  msg.mutable_inner();
+  expect_size(msg);
+  EXPECT_LT(size, msg.serialized_size());
+}
+
+TEST(CacheSerializedSize, length_not_stored)
+{
+  // The length in front of a nested message is calculated again when serializing, also in a buffer which does not 
+  // give access to its data and requires the length to be known before the nested message is serialized.
+  CacheSize::Free<FREE_VALUES_SIZE> msg;
+  auto& inner = msg.mutable_config().mutable_inner();
+  inner.set_a(1);
+  msg.serialized_size();
+  inner.set_a(1000);
+
+  WriteBufferNoData buffer;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+
+  ::EmbeddedProto::ReadBufferFixedSize<BUFFER_SIZE> read_buffer;
+  memcpy(read_buffer.get_data(), buffer.get_bytes(), buffer.get_size());
+  read_buffer.set_bytes_written(buffer.get_size());
+  CacheSize::Free<FREE_VALUES_SIZE> result;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, result.deserialize(read_buffer));
+  EXPECT_EQ(1000, result.get_config().get_inner().get_a());
+}
+
+} // End of namespace test_EmbeddedAMS_CacheSerializedSize
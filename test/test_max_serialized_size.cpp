@@ -0,0 +1,226 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+
+#include "gtest/gtest.h"
+
+#include <WriteBufferFixedSize.h>
+#include <MessageSizeCalculator.h>
+#include <WriteBufferMock.h>
+
+#include <limits>
+
+// EAMS message definitions
+#include <max_serialized_size.h>
+
+using ::testing::_;
+using ::testing::InSequence;
+using ::testing::Return;
+
+namespace test_EmbeddedAMS_MaxSerializedSize
+{
+
+// Set all fields to the value taking the most bytes when serialized.
+void set_worst_case(MaxSize::Position& msg)
+{
+  msg.set_x(1.0);
+  msg.set_y(1.0F);
+  msg.set_id(1U);
+  msg.set_time(-1);
+  msg.set_valid(true);
+  msg.set_checksum(0U);
+  // Field 2000 requires a two byte tag.
+  msg.set_estimate(1.0);
+}
+
+void set_worst_case(MaxSize::Limits& msg)
+{
+  msg.set_a(-1);
+  msg.set_b(-1);
+  msg.set_c(std::numeric_limits<uint32_t>::max());
+  msg.set_d(std::numeric_limits<uint64_t>::max());
+  msg.set_e(std::numeric_limits<int32_t>::min());
+  msg.set_f(std::numeric_limits<int64_t>::min());
+  msg.set_level(static_cast<MaxSize::Level>(std::numeric_limits<uint32_t>::max()));
+  msg.mutable_name() = "0123456789";
+
+  uint8_t data[200] = {0};
+  msg.mutable_data().set(data, 200);
+
+  for(uint32_t i = 0; i < 15; ++i)
+  {
+    msg.add_values(std::numeric_limits<int64_t>::min());
+  }
+
+  MaxSize::Position position;
+  set_worst_case(position);
+  msg.add_positions(position);
+  msg.add_positions(position);
+  set_worst_case(msg.mutable_last());
+
+  ::EmbeddedProto::FieldString<5> label;
+  label = "abcde";
+  for(uint32_t i = 0; i < 3; ++i)
+  {
+    msg.add_labels(label);
+  }
+
+  msg.set_counter(std::numeric_limits<uint64_t>::max());
+}
+
+// Local copies of the constants, in C++11 passing the static members by reference requires a definition outside the
+// class.
+constexpr uint32_t POSITION_MAX_SIZE = MaxSize::Position::MAX_SERIALIZED_SIZE;
+constexpr uint32_t LIMITS_MAX_SIZE = MaxSize::Limits::MAX_SERIALIZED_SIZE;
+
+TEST(MaxSerializedSize, values) 
+{
+  EXPECT_EQ(49, POSITION_MAX_SIZE);
+  EXPECT_EQ(613, LIMITS_MAX_SIZE);
+}
+
+TEST(MaxSerializedSize, fixed_size_worst_case) 
+{
+  MaxSize::Position msg;
+  set_worst_case(msg);
+
+  ::EmbeddedProto::WriteBufferFixedSize<MaxSize::Position::MAX_SERIALIZED_SIZE> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_EQ(POSITION_MAX_SIZE, buffer.get_size());
+  EXPECT_EQ(POSITION_MAX_SIZE, msg.serialized_size());
+}
+
+TEST(MaxSerializedSize, worst_case) 
+{
+  MaxSize::Limits msg;
+  set_worst_case(msg);
+
+  ::EmbeddedProto::WriteBufferFixedSize<MaxSize::Limits::MAX_SERIALIZED_SIZE> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_EQ(LIMITS_MAX_SIZE, buffer.get_size());
+  EXPECT_EQ(LIMITS_MAX_SIZE, msg.serialized_size());
+}
+
+TEST(MaxSerializedSize, fixed_size_serialized_size) 
+{
+  MaxSize::Position msg;
+  EXPECT_EQ(0, msg.serialized_size());
+
+  msg.set_x(1.0);
+  EXPECT_EQ(9, msg.serialized_size());
+
+  // Optional fields are serialized when set, even with the default value.
+  msg.set_checksum(0U);
+  EXPECT_EQ(18, msg.serialized_size());
+
+  msg.set_sensor(0);
+  EXPECT_EQ(23, msg.serialized_size());
+
+  msg.set_estimate(0.0);
+  EXPECT_EQ(28, msg.serialized_size());
+
+  msg.set_valid(true);
+  EXPECT_EQ(30, msg.serialized_size());
+
+  // Compare with the size obtained by serializing the message.
+  ::EmbeddedProto::MessageSizeCalculator calcBuffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(calcBuffer));
+  EXPECT_EQ(calcBuffer.get_size(), msg.serialized_size());
+
+  msg.clear();
+  EXPECT_EQ(0, msg.serialized_size());
+}
+
+TEST(MaxSerializedSize, nested_fixed_size) 
+{
+  MaxSize::Limits msg;
+  msg.mutable_last().set_id(1U);
+
+  // The tag and length of the nested message plus its content.
+  EXPECT_EQ(7, msg.serialized_size());
+
+  ::EmbeddedProto::WriteBufferFixedSize<MaxSize::Limits::MAX_SERIALIZED_SIZE> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_EQ(7, buffer.get_size());
+}
+
+TEST(TagBytes, encode_tag) 
+{
+  uint8_t tag[::EmbeddedProto::WireFormatter::MAX_TAG_SIZE];
+  EXPECT_EQ(2, ::EmbeddedProto::WireFormatter::EncodeTag(2000, 
+                  ::EmbeddedProto::WireFormatter::WireType::FIXED64, tag));
+  EXPECT_EQ(0x81, tag[0]);
+  EXPECT_EQ(0x7D, tag[1]);
+
+  using TAG = ::EmbeddedProto::TagBytes<0x81, 0x7D>;
+  EXPECT_EQ(2, TAG::SIZE);
+  EXPECT_EQ(0, memcmp(tag, TAG::DATA, TAG::SIZE));
+}
+
+TEST(TagBytes, serialize_tag_as_array) 
+{
+  InSequence s;
+
+  MaxSize::Position msg;
+  Mocks::WriteBufferMock buffer;
+  msg.set_estimate(1.0);
+
+  // Both bytes of the tag of field 2000 are pushed at once.
+  EXPECT_CALL(buffer, push(_, 2)).WillOnce(::testing::Invoke([](const uint8_t* bytes, const uint32_t length) 
+  {
+    (void)length;
+    EXPECT_EQ(0x81, bytes[0]);
+    EXPECT_EQ(0x7D, bytes[1]);
+    return true;
+  }));
+
+  // The double value, on little endian targets all bytes are pushed at once.
+  if(::EmbeddedProto::IS_LITTLE_ENDIAN)
+  {
+    EXPECT_CALL(buffer, push(_, 8)).WillOnce(Return(true));
+  }
+  else
+  {
+    EXPECT_CALL(buffer, push(_)).Times(8).WillRepeatedly(Return(true));
+  }
+
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+}
+
+TEST(TagBytes, serialize_buffer_full) 
+{
+  MaxSize::Limits msg;
+  msg.add_values(1);
+
+  // Not enough space for the three byte tag of field 3000.
+  ::EmbeddedProto::WriteBufferFixedSize<1> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::BUFFER_FULL, msg.serialize(buffer));
+}
+
+} // End of namespace test_EmbeddedAMS_MaxSerializedSize
@@ -0,0 +1,178 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+#include "gtest/gtest.h"
+
+#include "gtest/gtest.h"
+
+#include <Fields.h>
+
+#include <cstdint>
+#include <type_traits>
+#include <utility>
+
+// EAMS message definitions
+#include <optional_fields.h>
+#include <repeated_fields.h>
+#include <oneof_fields.h>
+
+namespace test_EmbeddedAMS_MoveSemantics
+{
+
+static constexpr uint32_t Y_SIZE = 3;
+
+// Numbers and enums are copied as a block of memory.
+static_assert(std::is_trivially_copyable<::EmbeddedProto::int32>::value, "int32 field should be trivially copyable.");
+static_assert(std::is_trivially_copyable<::EmbeddedProto::doublefixed>::value, 
+              "double field should be trivially copyable.");
+static_assert(std::is_trivially_copyable<::EmbeddedProto::enumeration<states>>::value, 
+              "enum field should be trivially copyable.");
+
+static_assert(std::is_nothrow_move_constructible<position>::value, "Messages should be nothrow movable.");
+static_assert(std::is_nothrow_move_assignable<position>::value, "Messages should be nothrow movable.");
+static_assert(std::is_nothrow_move_constructible<repeated_message<Y_SIZE>>::value, 
+              "Messages should be nothrow movable.");
+static_assert(std::is_nothrow_move_assignable<message_oneof>::value, "Messages should be nothrow movable.");
+
+TEST(MoveSemantics, trivially_copyable_fields) 
+{
+  position msgA;
+  msgA.set_xpos(1.0);
+  msgA.set_ypos(2.0);
+  msgA.set_zpos(3.0);
+
+  position msgB(msgA);
+  EXPECT_EQ(1.0, msgB.get_xpos());
+  EXPECT_EQ(2.0, msgB.get_ypos());
+  EXPECT_EQ(3.0, msgB.get_zpos());
+
+  position msgC(std::move(msgB));
+  EXPECT_EQ(1.0, msgC.get_xpos());
+  EXPECT_EQ(2.0, msgC.get_ypos());
+  EXPECT_EQ(3.0, msgC.get_zpos());
+
+  position msgD;
+  msgD.set_xpos(4.0);
+  msgD = std::move(msgC);
+  EXPECT_EQ(1.0, msgD.get_xpos());
+  EXPECT_EQ(2.0, msgD.get_ypos());
+  EXPECT_EQ(3.0, msgD.get_zpos());
+}
+
+TEST(MoveSemantics, optional_fields) 
+{
+  ::optional_fields<5,10> msgA;
+  msgA.set_a(1);
+  msgA.set_b(2);
+  msgA.mutable_pos().set_xpos(1.0);
+  msgA.mutable_str().set("ABC", 3);
+
+  ::optional_fields<5,10> msgB(std::move(msgA));
+  EXPECT_EQ(1, msgB.get_a());
+  EXPECT_TRUE(msgB.has_b());
+  EXPECT_EQ(2, msgB.get_b());
+  EXPECT_FALSE(msgB.has_y());
+  EXPECT_TRUE(msgB.has_pos());
+  EXPECT_EQ(1.0, msgB.get_pos().get_xpos());
+  EXPECT_FALSE(msgB.has_state());
+  EXPECT_FALSE(msgB.has_bytes_array());
+  EXPECT_TRUE(msgB.has_str());
+  EXPECT_STREQ("ABC", msgB.get_str().get_const());
+
+  // Moving replaces the fields which were set in the destination.
+  ::optional_fields<5,10> msgC;
+  msgC.set_y(3.0F);
+  msgC.set_state(states::B);
+  msgC = std::move(msgB);
+  EXPECT_TRUE(msgC.has_b());
+  EXPECT_FALSE(msgC.has_y());
+  EXPECT_TRUE(msgC.has_pos());
+  EXPECT_FALSE(msgC.has_state());
+  EXPECT_TRUE(msgC.has_str());
+  EXPECT_STREQ("ABC", msgC.get_str().get_const());
+}
+
+TEST(MoveSemantics, repeated_messages) 
+{
+  repeated_message<Y_SIZE> msgA;
+  msgA.set_a(1);
+  repeated_nested_message nested;
+  nested.set_u(2);
+  nested.set_v(3);
+  msgA.add_b(nested);
+  nested.set_u(4);
+  msgA.add_b(nested);
+  msgA.set_c(5);
+
+  repeated_message<Y_SIZE> msgB(std::move(msgA));
+  EXPECT_EQ(1, msgB.get_a());
+  ASSERT_EQ(2, msgB.get_b().get_length());
+  EXPECT_EQ(2, msgB.b(0).get_u());
+  EXPECT_EQ(3, msgB.b(0).get_v());
+  EXPECT_EQ(4, msgB.b(1).get_u());
+  EXPECT_EQ(5, msgB.get_c());
+
+  // Elements beyond the length of the moved field are no longer used.
+  repeated_message<Y_SIZE> msgC;
+  msgC.add_b(nested);
+  msgC.add_b(nested);
+  msgC.add_b(nested);
+  repeated_message<Y_SIZE> msgD;
+  msgD.add_b(nested);
+  msgC = std::move(msgD);
+  EXPECT_EQ(1, msgC.get_b().get_length());
+  EXPECT_EQ(4, msgC.b(0).get_u());
+}
+
+TEST(MoveSemantics, oneof_message) 
+{
+  message_oneof msgA;
+  msgA.set_a(1);
+  msgA.mutable_msg_ABC().set_varA(2);
+  msgA.mutable_msg_ABC().set_varB(22);
+
+  message_oneof msgB(std::move(msgA));
+  EXPECT_EQ(1, msgB.get_a());
+  EXPECT_EQ(message_oneof::FieldNumber::MSG_ABC, msgB.get_which_message());
+  EXPECT_EQ(2, msgB.msg_ABC().varA());
+  EXPECT_EQ(22, msgB.msg_ABC().varB());
+
+  // Switch the oneof to the other message.
+  message_oneof msgC;
+  msgC.mutable_msg_DEF().set_varD(3);
+  msgC = std::move(msgB);
+  EXPECT_EQ(message_oneof::FieldNumber::MSG_ABC, msgC.get_which_message());
+  EXPECT_EQ(2, msgC.msg_ABC().varA());
+
+  message_oneof msgD;
+  msgC = std::move(msgD);
+  EXPECT_EQ(message_oneof::FieldNumber::NOT_SET, msgC.get_which_message());
+}
+
+} // End of namespace test_EmbeddedAMS_MoveSemantics
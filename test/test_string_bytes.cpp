@@ -32,6 +32,7 @@
 #include "gmock/gmock.h"
 
 #include <WireFormatter.h>
+#include <ReadBufferFixedSize.h>
 #include <ReadBufferMock.h>
 #include <WriteBufferMock.h>
 
@@ -49,6 +50,7 @@ using ::testing::Return;
 using ::testing::SetArgReferee;
 using ::testing::ElementsAre;
 using ::testing::DoAll;
+using ::testing::Pointee;
 
 namespace test_EmbeddedAMS_string_bytes
 {
@@ -208,11 +210,9 @@ TEST(FieldString, serialize)
 
   EXPECT_CALL(buffer, get_available_size()).Times(1).WillOnce(Return(17));
 
-  std::array<uint8_t, 2> expected = {0x0a, 0x07};
-  for(auto e : expected) 
-  {
-    EXPECT_CALL(buffer, push(e)).Times(1).WillOnce(Return(true));
-  }
+  // The tag is pushed as an array, followed by the length.
+  EXPECT_CALL(buffer, push(Pointee(0x0a), 1)).Times(1).WillOnce(Return(true));
+  EXPECT_CALL(buffer, push(0x07)).Times(1).WillOnce(Return(true));
   EXPECT_CALL(buffer, push(_, 7)).Times(1).WillOnce(Return(true));
 
 
@@ -310,6 +310,28 @@ TEST(FieldString, deserialize_end_of_buffer)
   EXPECT_STREQ(msg.txt(), "Foo b");
 }
 
+TEST(FieldString, deserialize_readable_bytes) 
+{
+  text<10> msg;
+  ::EmbeddedProto::ReadBufferFixedSize<16> buffer;
+
+  // The characters are copied directly from the memory of the buffer.
+  const uint8_t data[] = {0x0a, 0x07, 0x46, 0x6f, 0x6f, 0x20, 0x62, 0x61, 0x72};
+  memcpy(buffer.get_data(), data, sizeof(data));
+  buffer.set_bytes_written(sizeof(data));
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.deserialize(buffer));
+  EXPECT_EQ(7, msg.get_txt().get_length());
+  EXPECT_STREQ(msg.txt(), "Foo bar");
+
+  // The buffer ends before all characters are read.
+  buffer.clear();
+  memcpy(buffer.get_data(), data, sizeof(data));
+  buffer.set_bytes_written(sizeof(data) - 2);
+  EXPECT_EQ(::EmbeddedProto::Error::END_OF_BUFFER, msg.deserialize(buffer));
+  EXPECT_EQ(5, msg.get_txt().get_length());
+  EXPECT_STREQ(msg.txt(), "Foo b");
+}
+
 
 TEST(FieldString, oneof_serialize)
 {
@@ -322,12 +344,9 @@ TEST(FieldString, oneof_serialize)
 
   EXPECT_CALL(buffer, get_available_size()).Times(1).WillRepeatedly(Return(99));
 
-  // The tag and number of characters.
-  std::array<uint8_t, 2> expected = {0x0a, 0x07};
-  for(auto e : expected) 
-  {
-    EXPECT_CALL(buffer, push(e)).Times(1).WillOnce(Return(true));
-  }
+  // The tag, pushed as an array, and number of characters.
+  EXPECT_CALL(buffer, push(Pointee(0x0a), 1)).Times(1).WillOnce(Return(true));
+  EXPECT_CALL(buffer, push(0x07)).Times(1).WillOnce(Return(true));
 
   // The actual data but it does not matter what as long as there are seven characters.
   EXPECT_CALL(buffer, push(_, 7)).Times(1).WillOnce(Return(true));
@@ -484,11 +503,9 @@ TEST(FieldBytes, serialize)
 
   EXPECT_CALL(buffer, get_available_size()).Times(1).WillOnce(Return(17));
 
-  std::array<uint8_t, 2> expected = {0x0a, 0x04};
-  for(auto e : expected) 
-  {
-    EXPECT_CALL(buffer, push(e)).Times(1).WillOnce(Return(true));
-  }
+  // The tag is pushed as an array, followed by the length.
+  EXPECT_CALL(buffer, push(Pointee(0x0a), 1)).Times(1).WillOnce(Return(true));
+  EXPECT_CALL(buffer, push(0x04)).Times(1).WillOnce(Return(true));
   EXPECT_CALL(buffer, push(_, 4)).Times(1).WillOnce(Return(true));
 
   EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
@@ -597,11 +614,9 @@ TEST(FieldBytes, oneof_serialize)
   EXPECT_CALL(buffer, get_available_size()).Times(1).WillRepeatedly(Return(17));
 
   // The tag and size
-  std::array<uint8_t, 2> expected = {0x12, 0x04};
-  for(auto e : expected) 
-  {
-    EXPECT_CALL(buffer, push(e)).Times(1).WillOnce(Return(true));
-  }
+  // The tag is pushed as an array, followed by the length.
+  EXPECT_CALL(buffer, push(Pointee(0x12), 1)).Times(1).WillOnce(Return(true));
+  EXPECT_CALL(buffer, push(0x04)).Times(1).WillOnce(Return(true));
 
   // The actual data but it does not matter what as long as there are four bytes.
   EXPECT_CALL(buffer, push(_, 4)).Times(1).WillOnce(Return(true));
@@ -718,8 +733,8 @@ TEST(RepeatedStringBytes, serialize)
   EXPECT_CALL(buffer, get_available_size()).Times(1).WillOnce(Return(24));
 
   // The first string.
-  // Id and size of array of txt.
-  EXPECT_CALL(buffer, push(0x0a)).Times(1).WillOnce(Return(true));
+  // Id and size of array of txt, the id is pushed as an array.
+  EXPECT_CALL(buffer, push(Pointee(0x0a), 1)).Times(1).WillOnce(Return(true));
   EXPECT_CALL(buffer, push(0x09)).Times(1).WillOnce(Return(true));
 
   // The string is pushed as an array, we do not know the pointer value so use _, but we do know 
@@ -728,11 +743,11 @@ TEST(RepeatedStringBytes, serialize)
   
 
   // The empty string
-  EXPECT_CALL(buffer, push(0x0a)).Times(1).WillOnce(Return(true));
+  EXPECT_CALL(buffer, push(Pointee(0x0a), 1)).Times(1).WillOnce(Return(true));
   EXPECT_CALL(buffer, push(0x00)).Times(1).WillOnce(Return(true));
   
   // The last string 
-  EXPECT_CALL(buffer, push(0x0a)).Times(1).WillOnce(Return(true));
+  EXPECT_CALL(buffer, push(Pointee(0x0a), 1)).Times(1).WillOnce(Return(true));
   EXPECT_CALL(buffer, push(0x09)).Times(1).WillOnce(Return(true));
 
   EXPECT_CALL(buffer, push(_, 9)).Times(1).WillOnce(Return(true));
@@ -0,0 +1,251 @@
+/*
+ *  Copyright (C) 2020-2024 Embedded AMS B.V. - All Rights Reserved
+ *
+ *  This file is part of Embedded Proto.
+ *
+ *  Embedded Proto is open source software: you can redistribute it and/or 
+ *  modify it under the terms of the GNU General Public License as published 
+ *  by the Free Software Foundation, version 3 of the license.
+ *
+ *  Embedded Proto  is distributed in the hope that it will be useful,
+ *  but WITHOUT ANY WARRANTY; without even the implied warranty of
+ *  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+ *  GNU General Public License for more details.
+ *
+ *  You should have received a copy of the GNU General Public License
+ *  along with Embedded Proto. If not, see <https://www.gnu.org/licenses/>.
+ *
+ *  For commercial and closed source application please visit:
+ *  <https://EmbeddedProto.com/license/>.
+ *
+ *  Embedded AMS B.V.
+ *  Info:
+ *    info at EmbeddedProto dot com
+ *
+ *  Postal address:
+ *    Atoomweg 2
+ *    1627 LE, Hoorn
+ *    the Netherlands
+ */
+
+#include "gtest/gtest.h"
+
+#include <WriteBufferFixedSize.h>
+#include <ReadBufferFixedSize.h>
+
+#include <cstdint>
+#include <cstring>
+
+// EAMS message definitions, generated with the table_driven option.
+#include <table_driven.h>
+
+namespace test_EmbeddedAMS_TableDriven
+{
+
+// The serialized data of the message set in set_some_fields().
+const uint8_t SOME_FIELDS[] = { 0x08, 0x01,                   // a_int32
+                                0x40, 0x01,                   // state
+                                0x65, 0x02, 0x00, 0x00, 0x00, // a_fixed32
+                                0x7A, 0x02, 0x61, 0x62,       // name
+                                0x8A, 0x01, 0x02, 0x08, 0x03, // inner
+                                0x92, 0x01, 0x02, 0x01, 0x02, // values
+                                0xA0, 0x01, 0x00,             // opt_int32
+                                0x80, 0x7D, 0x05 };           // far
+
+void set_some_fields(TableDriven::Record& msg)
+{
+  msg.set_a_int32(1);
+  msg.set_state(TableDriven::State::RUNNING);
+  msg.set_a_fixed32(2U);
+  msg.mutable_name() = "ab";
+  msg.mutable_inner().set_a(3);
+  msg.add_values(1);
+  msg.add_values(2);
+  // Optional fields are serialized when set, even with the default value.
+  msg.set_opt_int32(0);
+  msg.set_far(5U);
+}
+
+template<uint32_t N>
+void fill(::EmbeddedProto::ReadBufferFixedSize<N>& buffer, const uint8_t* data, const uint32_t length)
+{
+  for(uint32_t i = 0; i < length; ++i)
+  {
+    buffer.push(data[i]);
+  }
+}
+
+TEST(TableDriven, serialize) 
+{
+  TableDriven::Record msg;
+  set_some_fields(msg);
+
+  ::EmbeddedProto::WriteBufferFixedSize<64> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  ASSERT_EQ(sizeof(SOME_FIELDS), buffer.get_size());
+  EXPECT_EQ(0, memcmp(SOME_FIELDS, buffer.get_data(), sizeof(SOME_FIELDS)));
+  EXPECT_EQ(sizeof(SOME_FIELDS), msg.serialized_size());
+}
+
+TEST(TableDriven, serialize_empty) 
+{
+  TableDriven::Record msg;
+
+  ::EmbeddedProto::WriteBufferFixedSize<64> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(buffer));
+  EXPECT_EQ(0, buffer.get_size());
+}
+
+TEST(TableDriven, serialize_buffer_full) 
+{
+  TableDriven::Record msg;
+  set_some_fields(msg);
+
+  ::EmbeddedProto::WriteBufferFixedSize<8> buffer;
+  EXPECT_EQ(::EmbeddedProto::Error::BUFFER_FULL, msg.serialize(buffer));
+}
+
+TEST(TableDriven, deserialize) 
+{
+  ::EmbeddedProto::ReadBufferFixedSize<64> buffer;
+  fill(buffer, SOME_FIELDS, sizeof(SOME_FIELDS));
+
+  TableDriven::Record msg;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.deserialize(buffer));
+
+  EXPECT_EQ(1, msg.get_a_int32());
+  EXPECT_EQ(TableDriven::State::RUNNING, msg.get_state());
+  EXPECT_EQ(2U, msg.get_a_fixed32());
+  EXPECT_EQ(2U, msg.get_name().get_length());
+  EXPECT_STREQ("ab", msg.get_name().get_const());
+  EXPECT_EQ(3, msg.get_inner().get_a());
+  ASSERT_EQ(2U, msg.get_values().get_length());
+  EXPECT_EQ(1, msg.get_values()[0]);
+  EXPECT_EQ(2, msg.get_values()[1]);
+  EXPECT_TRUE(msg.has_opt_int32());
+  EXPECT_EQ(0, msg.get_opt_int32());
+  EXPECT_FALSE(msg.has_opt_state());
+  EXPECT_FALSE(msg.has_opt_inner());
+  EXPECT_EQ(5U, msg.get_far());
+}
+
+TEST(TableDriven, deserialize_out_of_order) 
+{
+  const uint8_t data[] = { 0x80, 0x7D, 0x05, // far
+                           0xA0, 0x06, 0x07, // unknown field 100
+                           0x40, 0x02,       // state
+                           0x08, 0x01,       // a_int32
+                           0xA8, 0x01, 0x01, // opt_state
+                           0x40, 0x01 };     // state again, the last value is used.
+
+  ::EmbeddedProto::ReadBufferFixedSize<32> buffer;
+  fill(buffer, data, sizeof(data));
+
+  TableDriven::Record msg;
+  EXPECT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.deserialize(buffer));
+
+  EXPECT_EQ(5U, msg.get_far());
+  EXPECT_EQ(1, msg.get_a_int32());
+  EXPECT_EQ(TableDriven::State::RUNNING, msg.get_state());
+  EXPECT_TRUE(msg.has_opt_state());
+  EXPECT_EQ(TableDriven::State::RUNNING, msg.get_opt_state());
+}
+
+TEST(TableDriven, deserialize_invalid_wire_type) 
+{
+  // a_int32 with the fixed32 wire type.
+  const uint8_t data_int[] = { 0x0D, 0x01, 0x00, 0x00, 0x00 };
+  ::EmbeddedProto::ReadBufferFixedSize<8> buffer_int;
+  fill(buffer_int, data_int, sizeof(data_int));
+  TableDriven::Record msg;
+  EXPECT_EQ(::EmbeddedProto::Error::INVALID_WIRETYPE, msg.deserialize(buffer_int));
+
+  // state as a length delimited field.
+  const uint8_t data_enum[] = { 0x42, 0x01, 0x01 };
+  ::EmbeddedProto::ReadBufferFixedSize<8> buffer_enum;
+  fill(buffer_enum, data_enum, sizeof(data_enum));
+  msg.clear();
+  EXPECT_EQ(::EmbeddedProto::Error::INVALID_WIRETYPE, msg.deserialize(buffer_enum));
+}
+
+TEST(TableDriven, deserialize_invalid_field_id) 
+{
+  const uint8_t data[] = { 0x00, 0x01 };
+  ::EmbeddedProto::ReadBufferFixedSize<8> buffer;
+  fill(buffer, data, sizeof(data));
+
+  TableDriven::Record msg;
+  EXPECT_EQ(::EmbeddedProto::Error::INVALID_FIELD_ID, msg.deserialize(buffer));
+}
+
+TEST(TableDriven, round_trip) 
+{
+  TableDriven::Record msg;
+  msg.set_a_int32(-1);
+  msg.set_a_int64(-2);
+  msg.set_a_uint32(3U);
+  msg.set_a_uint64(4U);
+  msg.set_a_sint32(-5);
+  msg.set_a_sint64(-6);
+  msg.set_a_bool(true);
+  msg.set_state(TableDriven::State::STOPPED);
+  msg.set_a_fixed64(9U);
+  msg.set_a_sfixed64(-10);
+  msg.set_a_double(11.0);
+  msg.set_a_fixed32(12U);
+  msg.set_a_sfixed32(-13);
+  msg.set_a_float(14.0F);
+  msg.mutable_name() = "name";
+  const uint8_t bytes[] = { 1, 2, 3 };
+  msg.mutable_data().set(bytes, 3);
+  msg.mutable_inner().set_b(17.0F);
+  msg.add_values(18);
+  TableDriven::Inner inner;
+  inner.set_a(19);
+  msg.add_inners(inner);
+  msg.add_inners(inner);
+  msg.set_opt_state(TableDriven::State::IDLE);
+  msg.mutable_opt_inner().set_a(22);
+  msg.set_far(2000U);
+
+  ::EmbeddedProto::WriteBufferFixedSize<128> write_buffer;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, msg.serialize(write_buffer));
+
+  ::EmbeddedProto::ReadBufferFixedSize<128> read_buffer;
+  fill(read_buffer, write_buffer.get_data(), write_buffer.get_size());
+
+  TableDriven::Record result;
+  ASSERT_EQ(::EmbeddedProto::Error::NO_ERRORS, result.deserialize(read_buffer));
+
+  EXPECT_EQ(-1, result.get_a_int32());
+  EXPECT_EQ(-2, result.get_a_int64());
+  EXPECT_EQ(3U, result.get_a_uint32());
+  EXPECT_EQ(4U, result.get_a_uint64());
+  EXPECT_EQ(-5, result.get_a_sint32());
+  EXPECT_EQ(-6, result.get_a_sint64());
+  EXPECT_TRUE(result.get_a_bool());
+  EXPECT_EQ(TableDriven::State::STOPPED, result.get_state());
+  EXPECT_EQ(9U, result.get_a_fixed64());
+  EXPECT_EQ(-10, result.get_a_sfixed64());
+  EXPECT_EQ(11.0, result.get_a_double());
+  EXPECT_EQ(12U, result.get_a_fixed32());
+  EXPECT_EQ(-13, result.get_a_sfixed32());
+  EXPECT_EQ(14.0F, result.get_a_float());
+  EXPECT_STREQ("name", result.get_name().get_const());
+  ASSERT_EQ(3U, result.get_data().get_length());
+  EXPECT_EQ(0, memcmp(bytes, result.get_data().get_const(), 3));
+  EXPECT_EQ(17.0F, result.get_inner().get_b());
+  ASSERT_EQ(1U, result.get_values().get_length());
+  EXPECT_EQ(18, result.get_values()[0]);
+  ASSERT_EQ(2U, result.get_inners().get_length());
+  EXPECT_EQ(19, result.get_inners()[0].get_a());
+  EXPECT_EQ(19, result.get_inners()[1].get_a());
+  EXPECT_FALSE(result.has_opt_int32());
+  EXPECT_TRUE(result.has_opt_state());
+  EXPECT_EQ(TableDriven::State::IDLE, result.get_opt_state());
+  EXPECT_TRUE(result.has_opt_inner());
+  EXPECT_EQ(22, result.get_opt_inner().get_a());
+  EXPECT_EQ(2000U, result.get_far());
+}
+
+} // End of namespace test_EmbeddedAMS_TableDriven